@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Measure the build and lookup times of the fuzzy index of known words
+
+Run from the repository root:
+
+    $ python benchmarks/fuzzy.py [NUMBER_OF_NAMES]
+
+The index is filled with random German-like names (20000 by default), then
+misspelled names are looked up, in the same process and, like a new `duden`
+run, with a newly opened index.
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from duden.index import LemmaIndex  # noqa: E402
+
+ONSETS = [
+    "",
+    *"b d f g h k l m n p r s t w br fl gr kl pf sch schw st str tr z".split(),
+]
+NUCLEI = ["a", "e", "i", "o", "u", "ä", "ö", "ü", "au", "ei", "eu", "ie"]
+CODAS = ["", "", "", "ch", "ck", "f", "g", "l", "m", "n", "nd", "ng", "r", "s", "t"]
+
+
+class Word:  # pylint: disable=too-few-public-methods
+    """Minimal word indexed by `LemmaIndex.add_word`"""
+
+    def __init__(self, name, frequency):
+        self.urlname = self.name = name
+        self.frequency = frequency
+
+
+def random_names(number, rng):
+    """Return list of distinct random names"""
+    names = set()
+    while len(names) < number:
+        syllables = [
+            rng.choice(ONSETS) + rng.choice(NUCLEI) + rng.choice(CODAS)
+            for _ in range(rng.randint(1, 4))
+        ]
+        names.add("".join(syllables).capitalize())
+    return sorted(names)
+
+
+def misspell(name, rng):
+    """Return the name with one random letter swapped, dropped or doubled"""
+    position = rng.randrange(len(name) - 1)
+    edit = rng.choice(["swap", "drop", "double"])
+    if edit == "swap":
+        return (
+            name[:position] + name[position + 1] + name[position] + name[position + 2 :]
+        )
+    if edit == "drop":
+        return name[:position] + name[position + 1 :]
+    return name[:position] + name[position] + name[position:]
+
+
+def measure(label, func, number=200):
+    """Print average time of `func` in milliseconds"""
+    seconds = timeit.timeit(func, number=number) / number
+    print(f"{label:45} {seconds * 1000:8.3f} ms")
+
+
+def main():
+    """Run the benchmark"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(0)
+    names = random_names(number, rng)
+    queries = [misspell(rng.choice(names), rng) for _ in range(200)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "index.sqlite"
+        index = LemmaIndex(path)
+        start = time.perf_counter()
+        for name in names:
+            index.add_word(Word(name, rng.randint(0, 5)))
+        build = time.perf_counter() - start
+        print(f"{number} names")
+        print(f"{'build: add_word of all names':45} {build:8.2f} s")
+        print(f"{'build: per name':45} {build / number * 1000:8.3f} ms")
+        print(f"{'index.sqlite size':45} {path.stat().st_size / 2**20:8.1f} MiB")
+
+        queries_iter = iter(queries * 1000)
+        measure("lookup: fuzzy, open index", lambda: index.fuzzy(next(queries_iter)))
+        index.close()
+
+        start = time.perf_counter()
+        for query in queries[:20]:
+            new_index = LemmaIndex(path)
+            new_index.fuzzy(query)
+            new_index.close()
+        cold = (time.perf_counter() - start) / 20
+        print(f"{'lookup: first fuzzy of a new process':45} {cold * 1000:8.3f} ms")
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{'max RSS of the benchmark':45} {rss:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare parse times of the html parsers on the synthetic test pages
+
+Run from the repository root:
+
+    $ python benchmarks/parsers.py
+
+The "noisy" word page is the synthetic test page padded with navigation-like
+markup, closer to the size of real duden.de pages.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from duden import request  # noqa: E402
+
+HTML_DATA_DIR = "tests/test_data/html"
+NOISE = "<div class='ad'>" + "<p><a href='/x'>link</a> text <span>x</span></p>" * 400
+
+
+def read(path):
+    """Return contents of the test data file"""
+    with open(os.path.join(HTML_DATA_DIR, path), encoding="utf8") as file:
+        return file.read()
+
+
+def measure(label, func, number=200):
+    """Print average time of `func` in milliseconds"""
+    func()
+    seconds = timeit.timeit(func, number=number) / number
+    print(f"{label:45} {seconds * 1000:8.2f} ms")
+
+
+def main():
+    """Run the benchmark"""
+    request.grammar = lambda urlpart: None  # do not load inflections
+    word_page = read("Hase.html")
+    noisy_page = word_page.replace("<footer", NOISE + "</div><footer")
+    grammar_page = read("grammar/Hase.html")
+
+    for parser in request.PARSERS:
+        try:
+            request.set_parser(parser)
+            request.make_soup("<html></html>")
+        except ImportError:
+            print(f"{parser}: not installed")
+            continue
+        measure(
+            f"{parser}: word page export",
+            lambda: request.parse_word_page(word_page).export(),
+        )
+        measure(
+            f"{parser}: noisy word page export",
+            lambda: request.parse_word_page(noisy_page).export(),
+        )
+        measure(
+            f"{parser}: noisy word page export, partial",
+            lambda: request.parse_word_page(noisy_page, partial=True).export(),
+        )
+        measure(
+            f"{parser}: grammar page",
+            lambda: request.parse_grammar_page(grammar_page).data,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare the output formats of --export on the exported test data words
+
+Run from the repository root:
+
+    $ python benchmarks/serialization.py
+
+Every emitter serializes all exported words (with their inflection tables)
+of tests/test_data at once.
+"""
+
+import glob
+import json
+import os
+import sys
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from duden.display import serialize  # noqa: E402
+
+TEST_DATA_PATTERN = "tests/test_data/*.yaml"
+
+
+def load_words():
+    """Return the exported attributes of the test data words"""
+    words = []
+    for path in sorted(glob.glob(TEST_DATA_PATTERN)):
+        with open(path, encoding="utf8") as file:
+            words.append(yaml.safe_load(file))
+    return words
+
+
+def measure(label, func, number=20):
+    """Print average time of `func` in milliseconds"""
+    func()
+    seconds = timeit.timeit(func, number=number) / number
+    print(f"{label:45} {seconds * 1000:8.2f} ms")
+
+
+def dump_all(words, **kwargs):
+    """Dump the words with yaml.dump"""
+    for word in words:
+        yaml.dump(word, sort_keys=False, allow_unicode=True, **kwargs)
+
+
+def serialize_all(words, output_format):
+    """Serialize the words like --export does"""
+    for word in words:
+        serialize(word, output_format)
+
+
+def main():
+    """Run the benchmark"""
+    words = load_words()
+    size = sum(len(json.dumps(word, ensure_ascii=False)) for word in words)
+    print(f"{len(words)} words, {size / 1024:.0f} KiB of json")
+
+    measure("yaml: pure-Python Dumper", lambda: dump_all(words, Dumper=yaml.Dumper))
+    if hasattr(yaml, "CDumper"):
+        measure("yaml: LibYAML CDumper", lambda: dump_all(words, Dumper=yaml.CDumper))
+    else:
+        print("yaml: LibYAML not available")
+
+    for output_format in ["yaml", "json", "jsonl", "msgpack"]:
+        try:
+            serialize({}, output_format)
+        except ImportError:
+            print(f"{output_format}: not installed")
+            continue
+        measure(
+            f"--export --format {output_format}",
+            lambda output_format=output_format: serialize_all(words, output_format),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,129 @@
 The duden package can parse the https://www.duden.de/ word information.
 
 The `get` function is used to return parsed word, when provided with the word's
-exact url name. The `search` function is used to search for words, either
-returning exact matches (homonyms), or if fuzzy search is enabled, similar
-words.
+exact url name. The `get_many` function loads many words concurrently. The
+`search` function is used to search for words, either returning exact matches
+(homonyms), or if fuzzy search is enabled, similar words.
+
+The `lemmatize` function returns the words an inflected form belongs to, using
+the grammar pages loaded before.
 
 The basic class representing the parsed word is `DudenWord`.
+
+The functions, the grammatical category enums and the submodules are imported
+on first access, so that importing `duden` (e.g. by the CLI) does not load the
+html parser and the http library before they are needed.
 """
+import gettext
+import importlib
+import os
+from typing import TYPE_CHECKING
+
+gettext.install("duden", os.path.join(os.path.dirname(__file__), "locale"))
+
+if TYPE_CHECKING:  # the lazily imported names, for static analysis
+    # pylint: disable=cyclic-import
+    from . import (
+        aio,
+        cache,
+        cli,
+        client,
+        common,
+        database,
+        display,
+        index,
+        inflection,
+        lxmltree,
+        page,
+        request,
+        server,
+        word,
+    )
+    from .inflection import (
+        Case,
+        Degree,
+        Gender,
+        ImperativePerson,
+        InfinitiveForm,
+        Mood,
+        Number,
+        Person,
+        Tense,
+    )
+    from .request import (
+        get,
+        get_many,
+        get_word_of_the_day,
+        iter_many,
+        lemmatize,
+        lemmatize_many,
+        search,
+        search_iter,
+    )
+
 __all__ = [
     "get",
+    "get_many",
+    "iter_many",
     "search",
+    "search_iter",
     "get_word_of_the_day",
+    "lemmatize",
+    "lemmatize_many",
 ]
 
-# grammatical categories enums
-from .inflection import (
-    Case,
-    Degree,
-    Gender,
-    ImperativePerson,
-    InfinitiveForm,
-    Mood,
-    Number,
-    Person,
-    Tense,
-)
-from .request import get, get_word_of_the_day, search
+# public names mapped to the submodules defining them
+_LAZY_ATTRIBUTES = {
+    # grammatical categories enums
+    "Case": "inflection",
+    "Degree": "inflection",
+    "Gender": "inflection",
+    "ImperativePerson": "inflection",
+    "InfinitiveForm": "inflection",
+    "Mood": "inflection",
+    "Number": "inflection",
+    "Person": "inflection",
+    "Tense": "inflection",
+    # functions
+    "get": "request",
+    "get_many": "request",
+    "get_word_of_the_day": "request",
+    "iter_many": "request",
+    "lemmatize": "request",
+    "lemmatize_many": "request",
+    "search": "request",
+    "search_iter": "request",
+}
+
+# submodules available as attributes, e.g. `duden.cache` after `import duden`
+_SUBMODULES = [
+    "aio",
+    "cache",
+    "cli",
+    "client",
+    "common",
+    "database",
+    "display",
+    "index",
+    "inflection",
+    "lxmltree",
+    "page",
+    "request",
+    "server",
+    "word",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module("." + _LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_SUBMODULES))
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio variant of the network functions from `duden.request`
+
+Requires the optional `aiohttp` dependency. The responses are stored in the
+same cache as the blocking functions use, and are parsed by the same
+`DudenWord` and `Inflector` classes. The cache access, the parsing and the
+lemma index updates are blocking, so they are run in the default executor of
+the event loop.
+
+Example:
+
+    > async with duden.aio.AsyncClient(max_concurrency=4) as client:
+    >     words = await client.search("einfach")
+    >     await client.inflection(words[0])
+
+The module-level functions share one concurrency limit per event loop, but
+every call opens its own HTTP session. Many lookups should use one
+`AsyncClient`, which reuses the connections.
+"""
+
+import asyncio
+import functools
+import weakref
+
+import aiohttp
+
+from . import request
+from .cache import get_cache
+
+# semaphores of the module-level functions, per event loop
+_semaphores = weakref.WeakKeyDictionary()
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run the blocking function in the default executor of the event loop and
+    return its result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+class AsyncClient:
+    """
+    Asynchronous duden client sharing one aiohttp session
+
+    At most `max_concurrency` requests are performed at the same time.
+    """
+
+    def __init__(
+        self,
+        session=None,
+        max_concurrency=request.DEFAULT_MAX_WORKERS,
+        timeout=request.DEFAULT_TIMEOUT,
+        semaphore=None,
+    ):
+        """
+        Args:
+            session (aiohttp.ClientSession): session to use; if not provided, a
+                session is created and closed together with the client
+            max_concurrency (int): maximal number of concurrent requests
+            timeout (float): request timeout in seconds
+            semaphore (asyncio.Semaphore): semaphore shared with other
+                clients, limiting their concurrent requests together instead
+                of `max_concurrency`
+        """
+        self._session = session
+        self._owns_session = session is None
+        self._max_concurrency = max_concurrency
+        self._semaphore = semaphore
+        self._timeout = timeout
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying session, if it was created by this client"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self):
+        """The aiohttp session, created on first use"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=request.POOL_MAXSIZE),
+            )
+            self._owns_session = True
+        return self._session
+
+    @property
+    def semaphore(self):
+        """
+        Semaphore limiting the concurrent requests, created on first use, so
+        that it belongs to the running event loop
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    async def fetch(self, url, headers=None):
+        """
+        Perform GET request to `url`
+
+        Returns:
+            tuple: response status code, text and headers; text is None on 404
+                and 304 responses
+        """
+        async with self.semaphore:
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status in (304, 404):
+                        return response.status, None, response.headers
+                    response.raise_for_status()
+                    return response.status, await response.text(), response.headers
+            except aiohttp.ClientConnectionError as exc:
+                raise RuntimeError(
+                    _(
+                        "Connection could not be established. "
+                        "Check your internet connection."
+                    )
+                ) from exc
+
+    async def cached_fetch(self, prefix, cache_key, url, cache=True):
+        """
+        Async counterpart of `request.cached_response` decorated functions
+        """
+        backend = get_cache()
+        entry = (
+            await run_blocking(backend.get_entry, prefix, cache_key) if cache else None
+        )
+        if entry is not None and not backend.is_expired(entry):
+            return entry.content
+
+        try:
+            status, result, headers = await self.fetch(
+                url, headers=request.conditional_headers(entry)
+            )
+        except (RuntimeError, aiohttp.ClientError):
+            if entry is not None:
+                return entry.content
+            raise
+
+        if entry is not None and status == 304:
+            await run_blocking(backend.mark_fresh, prefix, cache_key)
+            return entry.content
+
+        if cache and result is not None:
+            await run_blocking(request.write_cache, prefix, cache_key, result, headers)
+        return result
+
+    async def get(self, word, cache=True):
+        """
+        Load the word 'word' and return the DudenWord instance
+        """
+        if cache:
+            parsed = request.memory_cached("", word)
+            if parsed is not None:
+                return parsed
+
+        url = request.URL_FORM.format(word=word)
+        html_content = await self.cached_fetch("", word, url, cache=cache)
+        if html_content is None:
+            return None
+
+        return await run_blocking(
+            request.word_from_page, word, html_content, cache=cache
+        )
+
+    async def search(
+        self, word, exact=True, return_words=True, cache=True, offline_first=False
+    ):  # pylint: disable=too-many-arguments
+        """
+        Search for a word 'word' in duden
+
+        The result pages are fetched concurrently. The local lemma index is
+        used as in `duden.request.search_urlnames`, see there for the meaning
+        of `offline_first`.
+        """
+        urlnames = await run_blocking(
+            request.search_index,
+            word,
+            exact=exact,
+            cache=cache,
+            offline_first=offline_first,
+        )
+        if urlnames is None:
+            url = request.SEARCH_URL_FORM.format(word=word)
+            response_text = await self.cached_fetch("search-", word, url, cache=cache)
+            urlnames = await run_blocking(
+                request.search_results, word, response_text, exact=exact, cache=cache
+            )
+
+        if not return_words:
+            return urlnames
+        return list(
+            await asyncio.gather(*(self.get(name, cache=cache) for name in urlnames))
+        )
+
+    async def grammar(self, urlpart, cache=True):
+        """
+        Return Inflector for the given url suffix of word's grammar page, or
+        None if the page does not exist
+        """
+        if cache:
+            parsed = request.memory_cached("grammar-", urlpart)
+            if parsed is not None:
+                return parsed
+
+        url = request.GRAMMAR_BASE.format(urlpart=urlpart)
+        response_text = await self.cached_fetch("grammar-", urlpart, url, cache=cache)
+        if response_text is None:
+            return None
+        return await run_blocking(
+            request.grammar_from_page, urlpart, response_text, cache=cache
+        )
+
+    async def inflection(self, word, cache=True):
+        """
+        Load the inflection of a DudenWord without blocking
+
+        The result is also stored in the word, so that `word.inflection` does
+        not perform a blocking request afterwards. None is returned for words
+        without a grammar page.
+        """
+        # pylint: disable=protected-access
+        if word._inflection is None and word.grammar_link:
+            word._inflection = await self.grammar(word.grammar_link, cache=cache)
+        return word._inflection
+
+    async def get_word_of_the_day(self):
+        """
+        Scrapes the word of the day and returns DudenWord instance of it.
+        """
+        _, html_content, _ = await self.fetch(request.HOME_URL)
+        word = await run_blocking(request.parse_word_of_the_day, html_content)
+        return await self.get(word)
+
+
+def default_client():
+    """
+    Return new AsyncClient for a module-level function call
+
+    The clients of the calls in the same event loop share one semaphore, so
+    that e.g. `asyncio.gather` of many `get` calls performs at most
+    `duden.request.DEFAULT_MAX_WORKERS` requests at once.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(request.DEFAULT_MAX_WORKERS)
+        _semaphores[loop] = semaphore
+    return AsyncClient(semaphore=semaphore)
+
+
+async def get(word, cache=True):
+    """
+    Load the word 'word' and return the DudenWord instance
+    """
+    async with default_client() as client:
+        return await client.get(word, cache=cache)
+
+
+async def search(word, exact=True, return_words=True, cache=True, offline_first=False):
+    """
+    Search for a word 'word' in duden
+    """
+    async with default_client() as client:
+        return await client.search(
+            word,
+            exact=exact,
+            return_words=return_words,
+            cache=cache,
+            offline_first=offline_first,
+        )
+
+
+async def grammar(urlpart, cache=True):
+    """
+    Return word inflections when given url suffix for word's grammar page
+    """
+    async with default_client() as client:
+        return await client.grammar(urlpart, cache=cache)
+
+
+async def get_word_of_the_day():
+    """
+    Scrapes the word of the day and returns DudenWord instance of it.
+    """
+    async with default_client() as client:
+        return await client.get_word_of_the_day()
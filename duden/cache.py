@@ -0,0 +1,794 @@
+# -*- coding: utf-8 -*-
+"""
+Storage backends for cached duden.de responses
+
+Two backends are available:
+
+* `FileCache` stores every response in a separate gzip file (the default)
+* `SQLiteCache` stores all responses in a single SQLite database
+
+The backend used by `duden.request` is returned by `get_cache`. It can be
+replaced using `set_cache`, or selected by setting the `DUDEN_CACHE`
+environment variable to `file` or `sqlite`.
+
+Both backends can be limited in total size and number of entries; when the
+limits are exceeded, the least recently used (or the oldest) entries are
+evicted. The limits are read from these environment variables:
+
+* `DUDEN_CACHE_MAX_SIZE`: maximal total size, e.g. `500M` or `2G`
+* `DUDEN_CACHE_MAX_ENTRIES`: maximal number of cached pages
+* `DUDEN_CACHE_EVICTION`: `lru` (default) or `age`
+
+Parsed `DudenWord` and `Inflector` objects can additionally be kept in the
+in-memory `parsed_cache`, whose capacity is set by the
+`DUDEN_MEMORY_CACHE_SIZE` environment variable (disabled by default).
+
+Cached pages expire after `DUDEN_CACHE_MAX_AGE` days (30 by default). Expired
+pages are revalidated using their ETag and Last-Modified validators, so that
+unchanged pages are not downloaded again.
+
+Every backend has a `LemmaIndex` of the cached words (see `duden.index`),
+stored in the `index.sqlite` database next to the cached pages.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import re
+import string
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict, namedtuple
+from functools import cached_property
+from pathlib import Path
+
+from xdg.BaseDirectory import xdg_cache_home
+
+from .database import SQLiteDatabase, add_missing_columns
+from .index import INDEX_FILENAME, LemmaIndex
+
+CACHE_ENV_VARIABLE = "DUDEN_CACHE"
+MAX_SIZE_ENV_VARIABLE = "DUDEN_CACHE_MAX_SIZE"
+MAX_ENTRIES_ENV_VARIABLE = "DUDEN_CACHE_MAX_ENTRIES"
+EVICTION_ENV_VARIABLE = "DUDEN_CACHE_EVICTION"
+MAX_AGE_ENV_VARIABLE = "DUDEN_CACHE_MAX_AGE"
+MEMORY_CACHE_SIZE_ENV_VARIABLE = "DUDEN_MEMORY_CACHE_SIZE"
+
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # seconds after which cached pages are revalidated
+
+SQLITE_FILENAME = "cache.sqlite"
+STATS_FILENAME = "stats.json"
+
+# human readable names of cache key prefixes
+PREFIX_NAMES = {
+    "": "word",
+    "search-": "search",
+    "grammar-": "grammar",
+}
+
+EVICTION_POLICIES = ["lru", "age"]
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    prefix TEXT NOT NULL,
+    key TEXT NOT NULL,
+    content BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (prefix, key)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    prefix TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# columns added to the entries table after its first version
+SQLITE_ENTRY_COLUMNS = {
+    "size": "INTEGER NOT NULL DEFAULT 0",
+    "accessed_at": "REAL NOT NULL DEFAULT 0",
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "max_age": "REAL",
+}
+
+# first line of cache files storing the entry metadata
+FILE_HEADER_MARK = "#duden-cache "
+
+_cache = None  # pylint: disable=invalid-name
+
+EntryInfo = namedtuple(
+    "EntryInfo", ["prefix", "key", "size", "fetched_at", "accessed_at"]
+)
+
+CacheEntry = namedtuple(
+    "CacheEntry", ["content", "fetched_at", "etag", "last_modified", "max_age"]
+)
+CacheEntry.__doc__ = """
+Cached page with its HTTP validators
+
+Attributes:
+    content: page text
+    fetched_at: unix time when the page was downloaded or last revalidated
+    etag: value of the ETag response header, or None
+    last_modified: value of the Last-Modified response header, or None
+    max_age: seconds after which the page must be revalidated, None to use
+        the backend default
+"""
+
+
+def default_cache_dir():
+    """Return the directory where duden stores cached data"""
+    return Path(xdg_cache_home) / "duden"
+
+
+def sanitize_word(word):
+    """
+    Sanitize unicode word for use as filename
+
+    Ascii letters and underscore are kept unchanged.
+    Other characters are replaced with "-u{charccode}-" string.
+    """
+    allowed_chars = string.ascii_letters + "_"
+
+    def sanitize_char(char):
+        if char in allowed_chars:
+            return char
+        return "-u" + str(ord(char)) + "-"
+
+    return "".join(sanitize_char(char) for char in word)
+
+
+SANITIZED_RE = re.compile(r"^(?:[A-Za-z_]|-u\d+-)*$")
+
+
+def unsanitize_word(sanitized):
+    """
+    Revert `sanitize_word`
+
+    Returns None if the string is not a result of `sanitize_word`.
+    """
+    if not SANITIZED_RE.match(sanitized):
+        return None
+    return re.sub(r"-u(\d+)-", lambda match: chr(int(match.group(1))), sanitized)
+
+
+def parse_size(size):
+    """
+    Parse size like "1024", "500K", "20M" or "2G" to number of bytes
+    """
+    units = {"K": 2**10, "M": 2**20, "G": 2**30}
+    size = size.strip().upper().rstrip("B")
+    if size and size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def format_size(size):
+    """
+    Format number of bytes in human readable form
+    """
+    if size < 1024:
+        return "{} B".format(size)
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= 1024
+        if size < 1024 or unit == "GiB":
+            break
+    return "{:.1f} {}".format(size, unit)  # pylint: disable=undefined-loop-variable
+
+
+class CacheBackend:  # pylint: disable=too-many-instance-attributes
+    """
+    Base class of cache backends
+
+    Implements hit/miss counting and size limits. Subclasses store the data
+    and implement the underscored methods.
+    """
+
+    # check the limits on the first write of every process (a CLI run writes
+    # only a few entries) and then after this many writes
+    PRUNE_INTERVAL = 100
+    FLUSH_INTERVAL = 100  # persist hit/miss counters after this many reads
+
+    def __init__(
+        self, max_size=None, max_entries=None, eviction="lru", max_age=DEFAULT_MAX_AGE
+    ):
+        """
+        Args:
+            max_size (int): maximal total size of cached data in bytes
+            max_entries (int): maximal number of cached entries
+            eviction (str): which entries are evicted first when the limits
+                are exceeded: "lru" for least recently used, "age" for least
+                recently fetched
+            max_age (float): seconds after which entries must be revalidated,
+                None to never revalidate
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                _("Unknown eviction policy: {}. Choose one of: {}").format(
+                    eviction, ", ".join(EVICTION_POLICIES)
+                )
+            )
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.max_age = max_age
+        self.revalidate = False  # treat all entries as expired
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+        self._reads = 0
+        self._writes = 0
+
+    @cached_property
+    def index(self):
+        """LemmaIndex of the words in this cache"""
+        return LemmaIndex(self._index_path())
+
+    def get(self, prefix, key):
+        """Return cached text, or None if it is not cached"""
+        entry = self.get_entry(prefix, key)
+        return entry and entry.content
+
+    def get_entry(self, prefix, key):
+        """Return CacheEntry, or None if it is not cached"""
+        entry = self._get(prefix, key)
+        with self._lock:
+            counter = self.misses if entry is None else self.hits
+            counter[prefix] += 1
+            self._reads += 1
+            flush = self._reads % self.FLUSH_INTERVAL == 0
+        if flush:
+            self.flush_stats()
+        return entry
+
+    def fetched_at(self, prefix, key):
+        """
+        Return unix time when the entry was fetched or revalidated, or None if
+        it is not cached; not counted in the hit/miss statistics
+        """
+        entry = self._get(prefix, key)
+        return entry and entry.fetched_at
+
+    def is_expired(self, entry):
+        """Whether the entry must be revalidated before use"""
+        if self.revalidate:
+            return True
+        max_age = entry.max_age if entry.max_age is not None else self.max_age
+        return max_age is not None and time.time() - entry.fetched_at > max_age
+
+    def set(  # pylint: disable=too-many-arguments
+        self, prefix, key, content, etag=None, last_modified=None, max_age=None
+    ):
+        """Store text in cache, together with its validators"""
+        entry = CacheEntry(content, time.time(), etag, last_modified, max_age)
+        self._set(prefix, key, entry)
+        with self._lock:
+            self._writes += 1
+            check_limits = (self._writes - 1) % self.PRUNE_INTERVAL == 0
+        if check_limits and (self.max_size or self.max_entries):
+            self.prune()
+
+    def entries(self):
+        """Return list of EntryInfo tuples describing all cached entries"""
+        raise NotImplementedError
+
+    def delete(self, prefix, key):
+        """Remove single entry from the cache"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all cached entries and statistics"""
+        raise NotImplementedError
+
+    def flush_stats(self):
+        """Add the hit/miss counts of this process to the persistent ones"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            self.hits, self.misses = Counter(), Counter()
+        if hits or misses:
+            self._store_counters(hits, misses)
+
+    def mark_fresh(self, prefix, key):
+        """Reset the fetch time of a revalidated entry"""
+        raise NotImplementedError
+
+    def prune(self, max_size=None, max_entries=None, max_age=None, eviction=None):
+        """
+        Evict entries until the cache fits into given limits
+
+        Args:
+            max_size (int): maximal total size in bytes, defaults to `self.max_size`
+            max_entries (int): maximal entry count, defaults to `self.max_entries`
+            max_age (float): remove entries fetched more than this many seconds ago
+            eviction (str): "lru" or "age", defaults to `self.eviction`
+
+        Returns:
+            int: number of removed entries
+        """
+        max_size = max_size if max_size is not None else self.max_size
+        max_entries = max_entries if max_entries is not None else self.max_entries
+        eviction = eviction or self.eviction
+
+        sort_key = "accessed_at" if eviction == "lru" else "fetched_at"
+        entries = sorted(self.entries(), key=lambda entry: getattr(entry, sort_key))
+        total_size = sum(entry.size for entry in entries)
+        remaining = len(entries)
+        expired_before = time.time() - max_age if max_age is not None else None
+
+        removed = 0
+        for entry in entries:
+            over_size = max_size is not None and total_size > max_size
+            over_count = max_entries is not None and remaining > max_entries
+            expired = expired_before is not None and entry.fetched_at < expired_before
+            if not (over_size or over_count or expired):
+                if expired_before is None:
+                    break
+                continue
+            self.delete(entry.prefix, entry.key)
+            total_size -= entry.size
+            remaining -= 1
+            removed += 1
+        return removed
+
+    def verify(self, fix=False):
+        """
+        Check that every entry can be read and decompressed
+
+        Args:
+            fix (bool): remove the broken entries
+
+        Returns:
+            list: (prefix, key) tuples of the broken entries
+        """
+        broken = []
+        for entry in self.entries():
+            try:
+                self._load(entry.prefix, entry.key)
+            except (OSError, EOFError, ValueError, zlib.error):
+                broken.append((entry.prefix, entry.key))
+                if fix:
+                    self.delete(entry.prefix, entry.key)
+        return broken
+
+    def stats(self):
+        """
+        Return cache statistics
+
+        Returns:
+            dict: with keys "entries" and "size" (per prefix dicts), "hits"
+            and "misses" (per prefix Counters), and "disk_size" (bytes)
+        """
+        self.flush_stats()
+        entries, sizes = Counter(), Counter()
+        for entry in self.entries():
+            entries[entry.prefix] += 1
+            sizes[entry.prefix] += entry.size
+        hits, misses = self._load_counters()
+        return {
+            "entries": entries,
+            "size": sizes,
+            "hits": hits,
+            "misses": misses,
+            "disk_size": self._disk_size(),
+        }
+
+    def _get(self, prefix, key):
+        raise NotImplementedError
+
+    def _set(self, prefix, key, entry):
+        raise NotImplementedError
+
+    def _load(self, prefix, key):
+        """Read CacheEntry, raising an exception if the entry is broken"""
+        raise NotImplementedError
+
+    def _load_counters(self):
+        raise NotImplementedError
+
+    def _store_counters(self, hits, misses):
+        raise NotImplementedError
+
+    def _disk_size(self):
+        raise NotImplementedError
+
+    def _index_path(self):
+        raise NotImplementedError
+
+
+class FileCache(CacheBackend):
+    """
+    Cache storing each response in a gzip file named after its prefix and key
+
+    The file modification time is the time the response was fetched, the
+    access time is updated on every cache hit. The validators are stored in
+    the first line of the file.
+    """
+
+    def __init__(self, directory=None, **limits):
+        super().__init__(**limits)
+        self.directory = Path(directory) if directory else default_cache_dir()
+
+    def path(self, prefix, key):
+        """Return path of the file storing the given entry"""
+        return self.directory / (prefix + sanitize_word(key) + ".gz")
+
+    def _get(self, prefix, key):
+        try:
+            entry = self._load(prefix, key)
+        except (FileNotFoundError, IOError, EOFError, ValueError):
+            return None
+        self._touch(prefix, key)
+        return entry
+
+    def _load(self, prefix, key):
+        path = self.path(prefix, key)
+        with gzip.open(str(path), "rt", encoding="utf8") as file:
+            content = file.read()
+        fetched_at = path.stat().st_mtime
+
+        if not content.startswith(FILE_HEADER_MARK):
+            # file written by an older version, without validators
+            return CacheEntry(content, fetched_at, None, None, None)
+        header, content = content.split("\n", 1)
+        meta = json.loads(header[len(FILE_HEADER_MARK) :])
+        return CacheEntry(
+            content, fetched_at, meta["etag"], meta["last_modified"], meta["max_age"]
+        )
+
+    def _touch(self, prefix, key):
+        """Update the access time of the entry, keeping the modification time"""
+        path = self.path(prefix, key)
+        try:
+            os.utime(str(path), (time.time(), path.stat().st_mtime))
+        except OSError:
+            pass
+
+    def _set(self, prefix, key, entry):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(prefix, key)
+        # write to a temporary file first, so that readers never see partial files
+        tmp_path = path.with_name(
+            "{}.{}-{}.tmp".format(path.name, os.getpid(), threading.get_ident())
+        )
+        meta = {
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "max_age": entry.max_age,
+        }
+        with gzip.open(str(tmp_path), "wt", encoding="utf8") as file:
+            file.write(FILE_HEADER_MARK + json.dumps(meta) + "\n")
+            file.write(entry.content)
+        os.replace(str(tmp_path), str(path))
+
+    def mark_fresh(self, prefix, key):
+        try:
+            os.utime(str(self.path(prefix, key)))
+        except OSError:
+            pass
+
+    def entries(self):
+        try:
+            dir_entries = list(os.scandir(str(self.directory)))
+        except FileNotFoundError:
+            return []
+
+        result = []
+        for dir_entry in dir_entries:
+            parsed = self._parse_filename(dir_entry.name)
+            if parsed is None:
+                continue
+            try:
+                stat = dir_entry.stat()
+            except FileNotFoundError:
+                continue
+            result.append(
+                EntryInfo(*parsed, stat.st_size, stat.st_mtime, stat.st_atime)
+            )
+        return result
+
+    @staticmethod
+    def _parse_filename(filename):
+        """Return (prefix, key) tuple of a cache file name, or None"""
+        if not filename.endswith(".gz"):
+            return None
+        stem = filename[: -len(".gz")]
+        for prefix in PREFIX_NAMES:
+            if prefix and stem.startswith(prefix):
+                key = unsanitize_word(stem[len(prefix) :])
+                if key is not None:
+                    return prefix, key
+        key = unsanitize_word(stem)
+        return ("", key) if key is not None else None
+
+    def delete(self, prefix, key):
+        try:
+            self.path(prefix, key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in self.entries():
+            self.delete(entry.prefix, entry.key)
+        try:
+            (self.directory / STATS_FILENAME).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _load_counters(self):
+        try:
+            with open(str(self.directory / STATS_FILENAME), encoding="utf8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return Counter(), Counter()
+        return Counter(data.get("hits", {})), Counter(data.get("misses", {}))
+
+    def _store_counters(self, hits, misses):
+        stored_hits, stored_misses = self._load_counters()
+        data = {
+            "hits": dict(stored_hits + hits),
+            "misses": dict(stored_misses + misses),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / STATS_FILENAME
+        tmp_path = path.with_name("{}.{}.tmp".format(path.name, os.getpid()))
+        with open(str(tmp_path), "w", encoding="utf8") as file:
+            json.dump(data, file)
+        os.replace(str(tmp_path), str(path))
+
+    def _disk_size(self):
+        return sum(entry.size for entry in self.entries())
+
+    def _index_path(self):
+        return self.directory / INDEX_FILENAME
+
+
+class SQLiteCache(CacheBackend, SQLiteDatabase):
+    """
+    Cache storing all responses as compressed blobs in one SQLite database
+
+    The database runs in the WAL mode, so it can be used by many concurrent
+    readers and writers, from multiple threads as well as processes. Every
+    thread uses its own connection.
+
+    Access times used for LRU eviction are collected in memory and written
+    together with the hit/miss counters, so that cache hits do not write to
+    the database.
+    """
+
+    def __init__(self, path=None, **limits):
+        CacheBackend.__init__(self, **limits)
+        SQLiteDatabase.__init__(self, path or default_cache_dir() / SQLITE_FILENAME)
+        self._accessed = {}
+
+    def _create_schema(self, connection):
+        connection.executescript(SQLITE_SCHEMA)
+        add_missing_columns(connection, "entries", SQLITE_ENTRY_COLUMNS)
+
+    def _get(self, prefix, key):
+        entry = self._load(prefix, key)
+        if entry is not None:
+            with self._lock:
+                self._accessed[(prefix, key)] = time.time()
+        return entry
+
+    def _load(self, prefix, key):
+        row = self.connection.execute(
+            "SELECT content, fetched_at, etag, last_modified, max_age FROM entries "
+            "WHERE prefix = ? AND key = ?",
+            (prefix, key),
+        ).fetchone()
+        if row is None:
+            return None
+        content, *meta = row
+        return CacheEntry(zlib.decompress(content).decode("utf8"), *meta)
+
+    def _set(self, prefix, key, entry):
+        blob = zlib.compress(entry.content.encode("utf8"))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (prefix, key, content, fetched_at, size, "
+            "accessed_at, etag, last_modified, max_age) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                prefix,
+                key,
+                blob,
+                entry.fetched_at,
+                len(blob),
+                entry.fetched_at,
+                entry.etag,
+                entry.last_modified,
+                entry.max_age,
+            ),
+        )
+
+    def mark_fresh(self, prefix, key):
+        self.connection.execute(
+            "UPDATE entries SET fetched_at = ? WHERE prefix = ? AND key = ?",
+            (time.time(), prefix, key),
+        )
+
+    def entries(self):
+        return [
+            EntryInfo(*row)
+            for row in self.connection.execute(
+                "SELECT prefix, key, size, fetched_at, accessed_at FROM entries"
+            )
+        ]
+
+    def delete(self, prefix, key):
+        self.connection.execute(
+            "DELETE FROM entries WHERE prefix = ? AND key = ?", (prefix, key)
+        )
+
+    def clear(self):
+        self.connection.execute("DELETE FROM entries")
+        self.connection.execute("DELETE FROM counters")
+        self.connection.execute("VACUUM")
+
+    def flush_stats(self):
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            self.connection.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE prefix = ? AND key = ?",
+                [(when, prefix, key) for (prefix, key), when in accessed.items()],
+            )
+        super().flush_stats()
+
+    def _load_counters(self):
+        hits, misses = Counter(), Counter()
+        for prefix, prefix_hits, prefix_misses in self.connection.execute(
+            "SELECT prefix, hits, misses FROM counters"
+        ):
+            hits[prefix] = prefix_hits
+            misses[prefix] = prefix_misses
+        return hits, misses
+
+    def _store_counters(self, hits, misses):
+        self.connection.executemany(
+            "INSERT INTO counters (prefix, hits, misses) VALUES (?, ?, ?) "
+            "ON CONFLICT (prefix) DO UPDATE SET "
+            "hits = hits + excluded.hits, misses = misses + excluded.misses",
+            [
+                (prefix, hits[prefix], misses[prefix])
+                for prefix in set(hits) | set(misses)
+            ],
+        )
+
+    def _disk_size(self):
+        size = 0
+        for suffix in ["", "-wal"]:
+            try:
+                size += os.path.getsize(str(self.path) + suffix)
+            except OSError:
+                pass
+        return size
+
+    def _index_path(self):
+        return self.path.with_name(INDEX_FILENAME)
+
+
+class LRUCache:
+    """
+    Thread-safe bounded in-memory mapping evicting the least recently used items
+
+    Used to keep already parsed objects. Capacity 0 disables the cache. Items
+    older than the `max_age` passed to `get` are treated as missing.
+    """
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return "{}(capacity={}, size={}, hits={}, misses={})".format(
+            self.__class__.__name__, self.capacity, len(self), self.hits, self.misses
+        )
+
+    def get(self, key, max_age=None):
+        """
+        Return cached item, or None if it is not cached or was stored more
+        than `max_age` seconds ago
+        """
+        with self._lock:
+            try:
+                value, stored_at = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if max_age is not None and time.time() - stored_at > max_age:
+                del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store item, evicting the least recently used ones if necessary"""
+        if not self.capacity:
+            return
+        with self._lock:
+            self._items[key] = (value, time.time())
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def resize(self, capacity):
+        """Change the capacity, evicting items if necessary"""
+        with self._lock:
+            self.capacity = capacity
+            while len(self._items) > capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Remove all items and reset the counters"""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# parsed DudenWord and Inflector objects keyed by (cache prefix, key)
+parsed_cache = LRUCache(int(os.environ.get(MEMORY_CACHE_SIZE_ENV_VARIABLE) or 0))
+
+BACKENDS = {
+    "file": FileCache,
+    "sqlite": SQLiteCache,
+}
+
+
+def limits_from_env():
+    """Return cache limits configured by environment variables"""
+    limits = {}
+    if os.environ.get(MAX_SIZE_ENV_VARIABLE):
+        limits["max_size"] = parse_size(os.environ[MAX_SIZE_ENV_VARIABLE])
+    if os.environ.get(MAX_ENTRIES_ENV_VARIABLE):
+        limits["max_entries"] = int(os.environ[MAX_ENTRIES_ENV_VARIABLE])
+    if os.environ.get(EVICTION_ENV_VARIABLE):
+        limits["eviction"] = os.environ[EVICTION_ENV_VARIABLE]
+    if os.environ.get(MAX_AGE_ENV_VARIABLE):
+        limits["max_age"] = float(os.environ[MAX_AGE_ENV_VARIABLE]) * 24 * 3600
+    return limits
+
+
+def get_cache():
+    """
+    Return the cache backend used by duden
+
+    On first use, the backend is chosen by the `DUDEN_CACHE` environment
+    variable (`file` or `sqlite`); `file` is used by default.
+    """
+    global _cache  # pylint: disable=global-statement
+    if _cache is None:
+        backend_name = os.environ.get(CACHE_ENV_VARIABLE, "file")
+        try:
+            backend = BACKENDS[backend_name]
+        except KeyError:
+            raise ValueError(
+                _("Unknown cache backend: {}. Choose one of: {}").format(
+                    backend_name, ", ".join(BACKENDS)
+                )
+            ) from None
+        _cache = backend(**limits_from_env())
+        atexit.register(_cache.flush_stats)
+    return _cache
+
+
+def set_cache(cache):
+    """
+    Replace the cache backend used by duden
+
+    Passing None resets the backend, it is chosen again on the next use.
+    """
+    global _cache  # pylint: disable=global-statement
+    _cache = cache
@@ -1,23 +1,19 @@
 # -*- coding: utf-8 -*-
 """
 CLI related functions
+
+To keep the startup fast, the modules needed only to look up and display
+words (the html parser, the http library, yaml and crayons), the cache and
+the server client are imported in the functions using them.
 """
 
 import argparse
+import contextlib
+import importlib.util
 import sys
 
-import yaml
-from crayons import blue, red, white  # pylint: disable=no-name-in-module
-
-from .__version__ import __version__
-from .display import (
-    describe_word,
-    display_compounds,
-    display_inflections,
-    print_string_or_list,
-    print_tree_of_strings,
-)
-from .request import get, search
+# output formats of the --fields, --export, --inflect and --batch arguments
+OUTPUT_FORMATS = ["json", "jsonl", "tsv", "yaml", "msgpack"]
 
 
 def display_word(word, args):
@@ -25,7 +21,20 @@ def display_word(word, args):
     Display word attribute or general description, based on commandline arguments
     """
     # pylint: disable=too-many-branches, too-many-statements
-    if args.title:
+    # pylint: disable=import-outside-toplevel
+    from .display import (
+        describe_word,
+        display_compounds,
+        display_inflections,
+        print_serialized,
+        print_string_or_list,
+        print_tree_of_strings,
+        word_fields,
+    )
+
+    if args.fields:
+        print_serialized(word_fields(word, args.fields), args.format or "json")
+    elif args.title:
         print(word.title)
     elif args.name:
         print(word.name)
@@ -72,10 +81,12 @@ def display_word(word, args):
                 print(spelling)
     elif args.inflect:
         if word.inflection:
-            display_inflections(word)
+            if args.format:
+                print_serialized(word.inflection.data, args.format)
+            else:
+                display_inflections(word)
     elif args.export:
-        yaml_string = yaml.dump(word.export(), sort_keys=False, allow_unicode=True)
-        print(yaml_string, end="")
+        print_serialized(word.export(), args.format or "yaml")
     elif args.words_before:
         print_string_or_list(word.words_before)
     elif args.words_after:
@@ -85,12 +96,12 @@ def display_word(word, args):
         describe_word(word)
 
 
-def parse_args():
+def parse_args(argv=None):
     """
     Parse CLI arguments
     """
     parser = argparse.ArgumentParser()
-    parser.add_argument("word")
+    parser.add_argument("word", nargs="?")
     parser.add_argument(
         "--title", action="store_true", help=_("display word and article")
     )
@@ -145,6 +156,29 @@ def parse_args():
     parser.add_argument(
         "--words-after", action="store_true", help=_("list 5 words after this one")
     )
+    parser.add_argument(
+        "--fields",
+        help=_(
+            "display the comma separated attributes (e.g. title,article,frequency) "
+            "from one lookup"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help=_(
+            "output format of --fields (default: json), --export, --inflect "
+            "(default: yaml) and --batch (default: jsonl)"
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help=_(
+            "look up the words listed one per line in the file (- for stdin) "
+            "and print them as json lines"
+        ),
+    )
 
     parser.add_argument(
         "-r",
@@ -158,12 +192,22 @@ def parse_args():
     parser.add_argument(
         "--fuzzy", action="store_true", help=_("enable fuzzy word matching")
     )
+    parser.add_argument(
+        "--offline-first",
+        action="store_true",
+        help=_("look the word up among the known words before searching duden.de"),
+    )
     parser.add_argument(
         "--no-cache",
         action="store_false",
         dest="cache",
         help=_("do not cache retrieved words"),
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=_("revalidate cached pages with the server"),
+    )
 
     parser.add_argument(
         "-V", "--version", action="store_true", help=_("print program version")
@@ -176,29 +220,282 @@ def parse_args():
         action="store_true",
         help=_("display alternative spellings"),
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.grammar:
         parser.error("The -g/--grammar was replaced with -i/--inflect .")
+    if (args.word is None) == (args.batch is None):
+        parser.error(_("Give either the word or the --batch argument."))
+    if args.batch is not None and args.format not in (None, "jsonl", "msgpack"):
+        parser.error(_("The --batch results are printed as json lines or msgpack."))
+    if args.format == "msgpack" and importlib.util.find_spec("msgpack") is None:
+        parser.error(
+            _("The msgpack format requires the msgpack package: {}").format(
+                "pip install duden[msgpack]"
+            )
+        )
+    if args.fields is not None:
+        args.fields = parse_fields(parser, args.fields)
+    elif args.format and not (args.export or args.inflect or args.batch):
+        args.fields = parse_fields(parser, None)
     return args
 
 
+def parse_fields(parser, fields):
+    """
+    Return the list of attributes named by the --fields argument
+
+    Field names may use dashes instead of underscores. Without --fields, all
+    exported attributes except the inflection are selected.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .word import EXPORT_ATTRIBUTES, FIELD_ATTRIBUTES
+
+    if fields is None:
+        return EXPORT_ATTRIBUTES
+    names = [name.strip().replace("-", "_") for name in fields.split(",")]
+    names = [name for name in names if name]
+    unknown = [name for name in names if name not in FIELD_ATTRIBUTES]
+    if unknown or not names:
+        parser.error(
+            _("Unknown field: {}. Choose from: {}").format(
+                ", ".join(unknown), ",".join(FIELD_ATTRIBUTES)
+            )
+        )
+    return names
+
+
+def parse_cache_args(argv):
+    """
+    Parse CLI arguments of the `duden cache` subcommand
+    """
+    # pylint: disable=import-outside-toplevel
+    from .cache import EVICTION_POLICIES, parse_size
+
+    parser = argparse.ArgumentParser(
+        prog="duden cache", description=_("manage the cache of downloaded pages")
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help=_("display cache statistics"))
+
+    prune_parser = subparsers.add_parser(
+        "prune", help=_("evict entries exceeding the cache limits")
+    )
+    prune_parser.add_argument(
+        "--max-size", type=parse_size, help=_("maximal cache size, e.g. 500M or 2G")
+    )
+    prune_parser.add_argument(
+        "--max-entries", type=int, help=_("maximal number of cached pages")
+    )
+    prune_parser.add_argument(
+        "--max-age", type=float, help=_("remove pages older than given number of days")
+    )
+    prune_parser.add_argument(
+        "--eviction",
+        choices=EVICTION_POLICIES,
+        help=_("evict least recently used (lru) or oldest (age) pages first"),
+    )
+
+    subparsers.add_parser("clear", help=_("remove all cached pages"))
+    subparsers.add_parser(
+        "index", help=_("rebuild the index of known words from the cached pages")
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify", help=_("check that all cached pages are readable")
+    )
+    verify_parser.add_argument(
+        "--fix", action="store_true", help=_("remove the broken pages")
+    )
+    return parser.parse_args(argv)
+
+
+def parse_serve_args(argv):
+    """
+    Parse CLI arguments of the `duden serve` subcommand
+    """
+    parser = argparse.ArgumentParser(
+        prog="duden serve",
+        description=_("run a resident server answering duden calls over a Unix socket"),
+    )
+    parser.add_argument(
+        "--socket", help=_("socket path, by default $XDG_RUNTIME_DIR/duden.sock")
+    )
+    parser.add_argument(
+        "--memory-cache-size",
+        type=int,
+        help=_("number of parsed words and inflections kept in memory"),
+    )
+    return parser.parse_args(argv)
+
+
+def display_cache_stats(stats):
+    """
+    Print cache statistics returned by the cache backend `stats` method
+    """
+    # pylint: disable=import-outside-toplevel
+    from crayons import white  # pylint: disable=no-name-in-module
+
+    from .cache import PREFIX_NAMES, format_size
+    from .display import display_table
+
+    table = [[_("Type"), _("Entries"), _("Size"), _("Hits"), _("Misses")]]
+    for prefix, name in PREFIX_NAMES.items():
+        table.append(
+            [
+                name,
+                str(stats["entries"][prefix]),
+                format_size(stats["size"][prefix]),
+                str(stats["hits"][prefix]),
+                str(stats["misses"][prefix]),
+            ]
+        )
+    table.append(
+        [
+            _("total"),
+            str(sum(stats["entries"].values())),
+            format_size(sum(stats["size"].values())),
+            str(sum(stats["hits"].values())),
+            str(sum(stats["misses"].values())),
+        ]
+    )
+    display_table(table, cell_spacing="  ")
+    print(white(_("Disk usage:"), bold=True), format_size(stats["disk_size"]))
+
+
+def cache_main(argv):
+    """
+    Run the `duden cache` subcommand and return the exit code
+    """
+    # pylint: disable=import-outside-toplevel
+    from crayons import red  # pylint: disable=no-name-in-module
+
+    from .cache import PREFIX_NAMES, get_cache, parsed_cache
+
+    args = parse_cache_args(argv)
+    cache = get_cache()
+
+    if args.command == "stats":
+        display_cache_stats(cache.stats())
+    elif args.command == "prune":
+        max_age = args.max_age * 24 * 3600 if args.max_age is not None else None
+        removed = cache.prune(
+            max_size=args.max_size,
+            max_entries=args.max_entries,
+            max_age=max_age,
+            eviction=args.eviction,
+        )
+        print(_("Removed {} cached pages.").format(removed))
+    elif args.command == "clear":
+        cache.clear()
+        cache.index.clear()
+        parsed_cache.clear()  # kept warm by the server
+        print(_("Cache cleared."))
+    elif args.command == "verify":
+        broken = cache.verify(fix=args.fix)
+        for prefix, key in broken:
+            print(red(_("Broken {} page: {}").format(PREFIX_NAMES[prefix], key)))
+        if broken and not args.fix:
+            return 1
+        print(_("Checked cache, {} broken pages.").format(len(broken)))
+    elif args.command == "index":
+        cache.index.rebuild(cache)
+        counts = cache.index.counts()
+        print(
+            _(
+                "Indexed {} words with {} names, {} inflected forms and {} searches."
+            ).format(
+                counts["lemmas"], counts["names"], counts["forms"], counts["queries"]
+            )
+        )
+    return 0
+
+
 def main():
     """
     Take the first CLI argument and describe the corresponding word
+
+    If the `duden serve` server is running, the call is forwarded to it.
     """
+    argv = sys.argv[1:]
+
+    # pylint: disable=import-outside-toplevel
 
     # handle the --version switch
-    if "--version" in sys.argv or "-V" in sys.argv:
+    if "--version" in argv or "-V" in argv:
+        from .__version__ import __version__
+
         print("duden " + __version__)
         sys.exit(0)
 
-    # parse normal arguments
-    args = parse_args()
+    # handle the server subcommand
+    if argv[:1] == ["serve"]:
+        from crayons import red  # pylint: disable=no-name-in-module
+
+        from .server import serve
+
+        args = parse_serve_args(argv[1:])
+        try:
+            serve(args.socket, memory_cache_size=args.memory_cache_size)
+        except (RuntimeError, ValueError, OSError) as exception:
+            print(red(exception))
+            sys.exit(1)
+        sys.exit(0)
+
+    if is_forwarded(argv):
+        from .client import run_cli
+
+        exit_code = run_cli(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    run(argv)
+
+
+def is_forwarded(argv):
+    """
+    Whether the call with arguments `argv` is forwarded to the running server
+
+    Batches are read and printed locally, so that the words are streamed, and
+    so is the binary msgpack. The arguments are parsed to tell, so that
+    abbreviated options like `--bat` are recognized too; argument errors and
+    --help are handled locally.
+    """
+    if argv[:1] == ["cache"]:
+        return True
+    args = parse_args(argv)
+    return args.batch is None and args.format != "msgpack"
+
+
+def run(argv):
+    """
+    Run the CLI with arguments `argv` (without the program name)
+    """
+    # pylint: disable=import-outside-toplevel
+
+    # handle the cache management subcommand
+    if argv[:1] == ["cache"]:
+        sys.exit(cache_main(argv[1:]))
+
+    # parse normal arguments; --help and argument errors exit before the
+    # modules looking up and displaying words are imported
+    args = parse_args(argv)
+
+    from crayons import blue, red, white  # pylint: disable=no-name-in-module
+
+    from .request import get, search
+
+    if args.batch is not None:
+        sys.exit(run_batch(args))
 
     # search all words matching the string
     words = search(
-        args.word, return_words=False, exact=not args.fuzzy, cache=args.cache
+        args.word,
+        return_words=False,
+        exact=not args.fuzzy,
+        cache=args.cache,
+        offline_first=args.offline_first,
+        refresh=args.refresh,
     )
 
     # exit if the word wasn't found
@@ -229,7 +526,16 @@ def main():
 
     # fetch and parse the word
     try:
-        word = get(word_url_suffix, cache=args.cache)
+        word = get(
+            word_url_suffix,
+            cache=args.cache,
+            refresh=args.refresh,
+            with_inflection=bool(
+                args.inflect
+                or args.export
+                or (args.fields and "inflection" in args.fields)
+            ),
+        )
     except Exception as exception:  # pylint: disable=broad-except
         print(red(exception))
         sys.exit(1)
@@ -237,5 +543,105 @@ def main():
     display_word(word, args)
 
 
+def open_batch(path):
+    """
+    Open the --batch file; the standard input is returned for "-" and is not
+    closed
+    """
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, encoding="utf8")  # pylint: disable=consider-using-with
+
+
+def batch_records(query, args):
+    """
+    Look up one word of a batch and return the records of the found words
+
+    Every record holds the query and the exported attributes of the word (or
+    the attributes selected by --fields). A word which is not found or fails
+    is reported by a record with an "error" key instead.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .display import word_fields
+    from .request import get, search
+
+    with_inflection = not args.fields or "inflection" in args.fields
+    try:
+        urlnames = search(
+            query,
+            return_words=False,
+            exact=not args.fuzzy,
+            cache=args.cache,
+            offline_first=args.offline_first,
+            refresh=args.refresh,
+        )
+        if args.result is not None:
+            urlnames = urlnames[args.result - 1 : args.result]
+        records = []
+        for urlname in urlnames:
+            word = get(
+                urlname,
+                cache=args.cache,
+                refresh=args.refresh,
+                with_inflection=with_inflection,
+            )
+            if word is None:
+                continue
+            record = word_fields(word, args.fields) if args.fields else word.export()
+            records.append({"query": query, **record})
+    except Exception as exception:  # pylint: disable=broad-except
+        return [{"query": query, "error": str(exception) or repr(exception)}]
+    if not records:
+        return [{"query": query, "error": _("Word '{}' not found").format(query)}]
+    return records
+
+
+def run_batch(args):
+    """
+    Look up the words of the --batch file concurrently and print every found
+    word as a json line (or a msgpack object) as soon as it is loaded
+
+    The file is read lazily, so that the memory use does not depend on its
+    length. The progress is updated on the standard error, if it is a
+    terminal, and the number of words is printed there at the end.
+
+    Returns:
+        int: exit code, 1 if any of the words was not found or failed
+    """
+    # pylint: disable=import-outside-toplevel
+    from .display import print_serialized
+    from .request import map_concurrently
+
+    progress = sys.stderr.isatty()
+    done = failed = 0
+    try:
+        with open_batch(args.batch) as file:
+            queries = (line.strip() for line in file)
+            for records in map_concurrently(
+                lambda query: batch_records(query, args),
+                (query for query in queries if query),
+                ordered=False,
+            ):
+                for record in records:
+                    print_serialized(record, args.format or "jsonl")
+                done += 1
+                failed += any("error" in record for record in records)
+                if progress:
+                    print(
+                        "\r" + _("{} words, {} failed").format(done, failed),
+                        end="",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+    except OSError as exception:
+        print(exception, file=sys.stderr)
+        return 1
+    print(
+        ("\r" if progress else "") + _("{} words, {} failed").format(done, failed),
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     main()
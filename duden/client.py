@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Client of the resident duden server started by `duden serve`
+
+The server (see `duden.server`) keeps the caches of parsed words warm and
+answers requests over a Unix socket. Every request is one line holding a
+JSON object with the operation name in the "op" key, and every response is
+one line holding a JSON object with either the "result" or the "error" key.
+
+This module only uses the standard library, so that forwarding a CLI call to
+the server does not import the parsing machinery.
+
+Example:
+
+    > duden.client.call("search", word="Hase")
+    ['Hase']
+    > duden.client.call("get", word="Hase")["title"]
+    'Hase, der'
+"""
+
+import json
+import os
+import socket
+import sys
+
+from xdg.BaseDirectory import xdg_cache_home
+
+from .__version__ import __version__
+
+SOCKET_ENV_VARIABLE = "DUDEN_SOCKET"
+SOCKET_FILENAME = "duden.sock"
+
+CONNECT_TIMEOUT = 0.5  # seconds to wait for the server to accept the connection
+
+# environment variables changing the behaviour or the output of the CLI, next
+# to all DUDEN_* variables except DUDEN_SOCKET
+CLI_ENVIRONMENT = ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG", "XDG_CACHE_HOME")
+
+
+class ServerError(RuntimeError):
+    """Error reported by the duden server"""
+
+
+def socket_path():
+    """
+    Return path of the server socket, or None if the server is disabled
+
+    The path is set by the `DUDEN_SOCKET` environment variable; an empty
+    value disables the server. By default, the socket is created in
+    `$XDG_RUNTIME_DIR`, or in the cache directory if it is not set.
+    """
+    path = os.environ.get(SOCKET_ENV_VARIABLE)
+    if path is not None:
+        return path or None
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, SOCKET_FILENAME)
+    return os.path.join(xdg_cache_home, "duden", SOCKET_FILENAME)
+
+
+def cli_environment():
+    """
+    Return dict of the environment variables the CLI depends on, and the
+    duden version under the "__version__" key
+
+    A CLI call is only forwarded to a server running with the same values,
+    e.g. the same cache configuration and language, and the same version, so
+    that a server started before an upgrade does not answer with the old code.
+    """
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if name in CLI_ENVIRONMENT
+        or (name.startswith("DUDEN_") and name != SOCKET_ENV_VARIABLE)
+    }
+    env["__version__"] = __version__
+    return env
+
+
+def connect(path=None):
+    """
+    Connect to the server and return the socket, or None if no server is
+    listening
+    """
+    path = path or socket_path()
+    if not path or not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError:  # stale socket file or too busy server
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def is_running(path=None):
+    """Whether a server is listening on the socket"""
+    sock = connect(path)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def call(op, path=None, **params):
+    """
+    Perform one operation on the server and return its result
+
+    Raises:
+        ConnectionError: if no server is running or the connection broke
+        ServerError: if the operation failed on the server
+    """
+    sock = connect(path)
+    if sock is None:
+        raise ConnectionError(_("The duden server is not running"))
+    with sock, sock.makefile("rwb") as stream:
+        message = dict(params, op=op)
+        stream.write(json.dumps(message).encode("utf8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError(_("The duden server closed the connection"))
+    response = json.loads(line)
+    if "error" in response:
+        raise ServerError(response["error"])
+    return response["result"]
+
+
+def run_cli(argv, path=None):
+    """
+    Run the duden CLI with the arguments `argv` on the server and print its
+    output
+
+    The call is not forwarded if the environment or the version of the server
+    differs (see `cli_environment`).
+
+    Returns:
+        int: exit code of the CLI, or None if no server is running or the
+        call has to be run locally
+    """
+    try:
+        result = call(
+            "cli",
+            path=path,
+            argv=argv,
+            color=sys.stdout.isatty(),
+            env=cli_environment(),
+        )
+    except ConnectionError:
+        return None
+    if result is None:
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["exit_code"]
@@ -4,7 +4,7 @@ Contains functions not directly related to word parsing, but used by the it.
 """
 
 
-def recursively_extract(node, exfun, maxdepth=2):
+def recursively_extract(node, exfun, maxdepth=2, excluded=()):
     """
     Transform a html ul/ol tree into a python list tree.
 
@@ -16,6 +16,7 @@ def recursively_extract(node, exfun, maxdepth=2):
         node: BeautifulSoup HTML node to traverse
         exfun: function to apply to every string node found
         maxdepth: maximal depth of lists to go in the node
+        excluded: descendant nodes whose lists are ignored
 
     Returns:
         A tree-like python object composed of lists.
@@ -37,12 +38,16 @@ def recursively_extract(node, exfun, maxdepth=2):
     """
     if node.name in ["ol", "ul"]:
         lilist = node
+    elif excluded:
+        lilist = find_outside(node, excluded, "ol") or find_outside(
+            node, excluded, "ul"
+        )
     else:
         lilist = node.ol or node.ul
     if lilist and maxdepth:
         # apply 'recursively_extract' to every 'li' node found under this node
         return [
-            recursively_extract(li, exfun, maxdepth=maxdepth - 1)
+            recursively_extract(li, exfun, maxdepth=maxdepth - 1, excluded=excluded)
             for li in lilist.find_all("li", recursive=False)
         ]
     # if this node doesn't contain 'ol' or 'ul' node, return the transformed
@@ -50,8 +55,98 @@ def recursively_extract(node, exfun, maxdepth=2):
     return exfun(node)
 
 
+def find_all_outside(node, excluded, *args, **kwargs):
+    """
+    Like `node.find_all(*args, **kwargs)`, but skip the `excluded` nodes and
+    their descendants
+
+    Used to read a html tree as if the excluded nodes were removed, without
+    copying and modifying the tree.
+    """
+    excluded_ids = {id(excluded_node) for excluded_node in excluded if excluded_node}
+    return [
+        tag
+        for tag in node.find_all(*args, **kwargs)
+        if id(tag) not in excluded_ids
+        and not any(id(parent) in excluded_ids for parent in tag.parents)
+    ]
+
+
+def find_outside(node, excluded, *args, **kwargs):
+    """
+    Like `node.find(*args, **kwargs)`, but skip the `excluded` nodes and
+    their descendants
+    """
+    found = find_all_outside(node, excluded, *args, **kwargs)
+    return found[0] if found else None
+
+
+def text_without(node, excluded):
+    """
+    Return `node.text` leaving out the text of the `excluded` descendant nodes
+
+    Examples:
+
+    >>> node = BeautifulSoup("<p>Hase<sup>1</sup>n</p>", "lxml").p
+    >>> text_without(node, [node.sup])
+    'Hasen'
+    """
+    # other tree implementations, like duden.lxmltree.LxmlNode; looked up on
+    # the class, as bs4 tags answer any attribute with a child tag search
+    if getattr(type(node), "text_without", None) is not None:
+        return node.text_without(excluded)
+    skipped = set()
+    for excluded_node in excluded:
+        if excluded_node:
+            skipped.update(id(descendant) for descendant in excluded_node.descendants)
+    if not skipped:
+        return node.text
+    return "".join(string for string in node.strings if id(string) not in skipped)
+
+
 def clear_text(text):
     """
     Remove soft hyphens anywhere, and heading and trailing spaces.
     """
     return text.replace("\xad", "").strip()
+
+
+class NodeIndex:
+    """
+    Index of html tags by name, id and class, built in a single traversal
+
+    Answers the same queries as `node.find` and `node.find_all` restricted to
+    tag name, id and single class, without walking the whole tree again.
+
+    Example:
+
+    >>> index = NodeIndex(BeautifulSoup('<p id="a" class="x y">A</p>', "lxml"))
+    >>> index.find("p", class_="y")
+    <p class="x y" id="a">A</p>
+    """
+
+    def __init__(self, node):
+        self.by_name = {}
+        self.by_id = {}
+        self.by_class = {}
+        for tag in node.find_all(True):
+            name = tag.name
+            self.by_name.setdefault(name, []).append(tag)
+            tag_id = tag.get("id")
+            if tag_id is not None:
+                self.by_id.setdefault((name, tag_id), tag)
+            for class_name in tag.get("class", ()):
+                self.by_class.setdefault((name, class_name), []).append(tag)
+
+    def find(self, name, id=None, class_=None):  # pylint: disable=redefined-builtin
+        """Return the first tag with given name and id or class, or None"""
+        if id is not None:
+            return self.by_id.get((name, id))
+        tags = self.find_all(name, class_=class_)
+        return tags[0] if tags else None
+
+    def find_all(self, name, class_=None):
+        """Return list of all tags with given name and optionally class"""
+        if class_ is not None:
+            return self.by_class.get((name, class_), [])
+        return self.by_name.get(name, [])
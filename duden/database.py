@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite databases used from many threads and processes
+
+Shared by the SQLite cache backend (`duden.cache.SQLiteCache`) and the local
+index of known words (`duden.index.LemmaIndex`).
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+BUSY_TIMEOUT = 30  # seconds to wait for a lock held by another writer
+
+
+def connect_sqlite(path, timeout=BUSY_TIMEOUT):
+    """
+    Open SQLite database in the WAL mode, creating its directory if needed
+
+    The connection is in the autocommit mode; transactions are started
+    explicitly.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(path), timeout=timeout, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def add_missing_columns(connection, table, columns):
+    """
+    Add the columns missing in a table created by an older version
+
+    Args:
+        columns (dict): column name -> column definition
+    """
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    for column, definition in columns.items():
+        if column not in existing:
+            connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+class SQLiteDatabase:
+    """
+    Base class of the SQLite databases
+
+    The database runs in the WAL mode, so it can be used by many concurrent
+    readers and writers, from multiple threads as well as processes. Every
+    thread uses its own connection. Subclasses create their tables in
+    `_create_schema`, which is called once, on the first connection.
+    """
+
+    BUSY_TIMEOUT = BUSY_TIMEOUT
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def connection(self):
+        """Return database connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_sqlite(self.path, self.BUSY_TIMEOUT)
+            self._local.connection = connection
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(connection)
+                    self._schema_ready = True
+        return connection
+
+    def _create_schema(self, connection):
+        """Create the tables, using the given connection"""
+        raise NotImplementedError
+
+    def close(self):
+        """Close the database connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
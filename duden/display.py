@@ -2,9 +2,11 @@
 """
 Console printing functions
 """
+
+import json
+import sys
 from string import ascii_lowercase
 
-import yaml
 from crayons import blue, white, yellow  # pylint: disable=no-name-in-module
 
 
@@ -12,10 +14,20 @@ def display_inflections(word):
     """
     Display word's inflection table
     """
-    inf_str = yaml.dump(
-        word.inflection.data, indent=2, allow_unicode=True, sort_keys=False
-    )
-    print(inf_str)
+    print(dump_yaml(word.inflection.data))
+
+
+def dump_yaml(data):
+    """
+    Return the data in the yaml layout of --export and the test data
+
+    The C-accelerated LibYAML dumper is used if PyYAML was built with it; its
+    output is the same as the one of the pure-Python dumper.
+    """
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    dumper = getattr(yaml, "CDumper", yaml.Dumper)
+    return yaml.dump(data, Dumper=dumper, sort_keys=False, allow_unicode=True)
 
 
 def display_table(table, cell_spacing=" "):
@@ -151,3 +163,73 @@ def describe_word(word):
         print(white(_("Typical compounds:"), bold=True))
         for part_of_speech, words in word.compounds.items():
             print(blue(" - {}:".format(part_of_speech.capitalize())), ", ".join(words))
+
+
+def word_fields(word, fields):
+    """
+    Return dict of the word's attributes named by fields
+
+    The inflection is returned as the inflection data.
+    """
+    record = {}
+    for field in fields:
+        value = getattr(word, field, None)
+        if field == "inflection":
+            value = value and value.data
+        record[field] = value
+    return record
+
+
+def tsv_value(value):
+    """
+    Return the attribute value as one tab separated value
+
+    Missing values are empty, lists and dicts are encoded as JSON, and the
+    backslashes, tabs and line breaks in strings are escaped.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def serialize(data, output_format="json"):
+    """
+    Return the data as indented json, one json line, one line of tab separated
+    values, yaml, or msgpack bytes
+
+    The msgpack format requires the optional msgpack package.
+    """
+    if output_format == "json":
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    if output_format == "jsonl":
+        return json.dumps(data, ensure_ascii=False)
+    if output_format == "tsv":
+        return "\t".join(tsv_value(value) for value in data.values())
+    if output_format == "yaml":
+        return dump_yaml(data)
+    if output_format == "msgpack":
+        import msgpack  # pylint: disable=import-outside-toplevel,import-error
+
+        return msgpack.packb(data)
+    raise ValueError(_("Unknown output format: {}").format(output_format))
+
+
+def print_serialized(data, output_format="json"):
+    """
+    Print the serialized data, ending with a line break unless it is binary
+    """
+    output = serialize(data, output_format)
+    if isinstance(output, bytes):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+        sys.stdout.buffer.flush()
+    else:
+        print(output, end="" if output.endswith("\n") else "\n", flush=True)
@@ -0,0 +1,631 @@
+# -*- coding: utf-8 -*-
+"""
+Local index of the words known from the cache
+
+The index maps word names, alternative spellings and search queries to the
+url names of the words, so that known words are found without requesting
+the duden.de search page. It also maps the inflected forms from the cached
+grammar pages back to their words (see `LemmaIndex.lemmatize`), and finds
+misspelled words by name (see `LemmaIndex.fuzzy`). It is stored
+in the `index.sqlite` database next to the cache (see
+`duden.cache.CacheBackend.index`) and updated whenever a word or a grammar
+page is parsed, or a word searched, with the cache enabled.
+
+An index which got out of sync with the cache can be rebuilt from the cached
+pages with `LemmaIndex.rebuild`, or from the command line:
+
+    $ duden cache index
+"""
+
+import json
+import re
+import sqlite3
+import time
+from collections import namedtuple
+
+from .common import clear_text
+from .database import SQLiteDatabase, add_missing_columns
+
+INDEX_FILENAME = "index.sqlite"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lemmas (
+    urlname TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    title TEXT,
+    frequency INTEGER,
+    grammar_link TEXT
+);
+CREATE TABLE IF NOT EXISTS names (
+    name TEXT NOT NULL,
+    urlname TEXT NOT NULL,
+    PRIMARY KEY (name, urlname)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS queries (
+    query TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    urlname TEXT NOT NULL,
+    fetched_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (query, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS forms (
+    key TEXT NOT NULL,
+    form TEXT NOT NULL,
+    grammar_link TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    categories TEXT NOT NULL,
+    PRIMARY KEY (key, grammar_link, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fuzzy_variants (
+    variant TEXT NOT NULL,
+    name TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (variant, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS names_urlname ON names (urlname);
+CREATE INDEX IF NOT EXISTS lemmas_grammar_link ON lemmas (grammar_link);
+CREATE INDEX IF NOT EXISTS forms_grammar_link ON forms (grammar_link);
+"""
+
+# columns added to the tables of older indexes; the searches stored before
+# the fetch time was recorded are expired
+INDEX_ADDED_COLUMNS = {
+    "queries": {"fetched_at": "REAL NOT NULL DEFAULT 0"},
+}
+
+# words which are dropped from multi-word inflected forms, e.g. "den Hasen"
+# or "bin gelaufen", as they are not forms of the inflected word itself
+FORM_STOPWORDS = {
+    # articles, "am schönsten", "zu laufen"
+    *("der", "die", "das", "des", "dem", "den", "am", "zu"),
+    # auxiliary verbs of the compound tenses: indicative, Konjunktiv I and
+    # Konjunktiv II of sein, haben and werden
+    *("sein", "bin", "bist", "ist", "sind", "seid", "sei", "seiest", "seist"),
+    *("seien", "seiet", "war", "warst", "waren", "wart", "wäre", "wärest"),
+    *("wärst", "wären", "wäret", "wärt", "haben", "habe", "hast", "hat", "habt"),
+    *("habest", "habet", "hatte", "hattest", "hatten", "hattet", "hätte"),
+    *("hättest", "hätten", "hättet", "werden", "werde", "wirst", "wird"),
+    *("werdet", "werdest", "würde", "würdest", "würden", "würdet"),
+}
+
+# alternative forms are separated by commas or slashes, e.g. "lauf, laufe!"
+FORM_ALTERNATIVES_RE = re.compile(r"\s*[,/;]\s*")
+
+# optional words in parentheses, e.g. the reflexive pronouns of
+# "laufe (mich/mir)", which are dropped
+FORM_OPTIONAL_WORDS_RE = re.compile(r"(?:^|(?<=\s))\([^()]*\)")
+
+# optional letters in parentheses, e.g. "wär(e)st" for "wärst" and "wärest"
+FORM_OPTIONAL_LETTERS_RE = re.compile(r"\((\w*)\)")
+
+SQLITE_MAX_PARAMETERS = 500  # parameters of one lemmatize query
+
+FUZZY_MAX_DISTANCE = 2  # maximum and default edit distance of fuzzy matches
+
+# fuzzy variants are the deletions of the first characters of a name only,
+# which keeps the variants table small for long words
+FUZZY_PREFIX_LENGTH = 7
+
+Lemma = namedtuple("Lemma", ["urlname", "categories", "form"])
+Lemma.__doc__ = """
+Word an inflected form belongs to
+
+Attributes:
+    urlname: url name of the word
+    categories: section and grammatical categories of the form, as in
+        `Inflector.forms`, e.g. ("Deklination", "Plural", "Dativ")
+    form: the inflected form as written on the grammar page, e.g. "den Hasen"
+"""
+
+
+def form_words(form):
+    """
+    Return the strings an inflected form is found by
+
+    These are the alternatives of the form and their single words, without
+    articles and auxiliary verbs, e.g. "den Hasen" and "Hasen" for "den Hasen",
+    or "lauf" and "laufe" for "lauf, laufe!". Optional words in parentheses
+    are dropped and optional letters expanded, e.g. "wärst gelaufen",
+    "wärest gelaufen", "hättest gelaufen" and "gelaufen" for
+    "wär(e)st gelaufen / hättest (dich/dir) gelaufen".
+    """
+    words = set()
+    form = FORM_OPTIONAL_WORDS_RE.sub("", form)
+    for alternative in FORM_ALTERNATIVES_RE.split(form):
+        for variant in optional_letters_variants(alternative):
+            tokens = variant.strip(" !").split()
+            if not tokens:
+                continue
+            words.add(" ".join(tokens))
+            if len(tokens) > 1:
+                words.update(token for token in tokens if token not in FORM_STOPWORDS)
+    return words
+
+
+def optional_letters_variants(text):
+    """
+    Return the variants of the text with and without each group of optional
+    letters, e.g. ["wärst", "wärest"] for "wär(e)st"
+    """
+    parts = FORM_OPTIONAL_LETTERS_RE.split(text)
+    variants = [parts[0]]
+    for letters, rest in zip(parts[1::2], parts[2::2]):
+        variants = [
+            variant + optional + rest
+            for variant in variants
+            for optional in ("", letters)
+        ]
+    return variants
+
+
+def grammar_link_urlname(grammar_link):
+    """
+    Guess the url name of a word from its grammar page link, e.g. "laufen"
+    from "/konjugation/laufen"
+    """
+    return grammar_link.split("?")[0].rstrip("/").split("/")[-1]
+
+
+def deletes(word, max_distance):
+    """
+    Return set of strings obtained by deleting at most `max_distance`
+    characters from the word, including the word itself
+    """
+    result = {word}
+    layer = {word}
+    for _ in range(max_distance):
+        layer = {
+            variant[:position] + variant[position + 1 :]
+            for variant in layer
+            for position in range(len(variant))
+        }
+        result |= layer
+    return result
+
+
+def edit_distance(word1, word2, max_distance):
+    """
+    Return the optimal string alignment distance of the words (insertions,
+    deletions, substitutions and transpositions of adjacent characters), or
+    None if it exceeds `max_distance`
+    """
+    if abs(len(word1) - len(word2)) > max_distance:
+        return None
+    # the common prefix and suffix do not change the distance; names found
+    # by the same fuzzy variant usually share their prefix
+    common = 0
+    while common < min(len(word1), len(word2)) and word1[common] == word2[common]:
+        common += 1
+    word1, word2 = word1[common:], word2[common:]
+    while word1 and word2 and word1[-1] == word2[-1]:
+        word1, word2 = word1[:-1], word2[:-1]
+    # only the cells within `max_distance` of the diagonal can stay below it;
+    # comparisons instead of min() in the inner loop are twice as fast
+    # pylint: disable=consider-using-min-builtin
+    too_far = max_distance + 1
+    previous = [min(j, too_far) for j in range(len(word2) + 1)]
+    previous2 = previous
+    for i, char1 in enumerate(word1, 1):
+        current = [min(i, too_far)] + [too_far] * len(word2)
+        for j in range(max(1, i - max_distance), min(len(word2), i + max_distance) + 1):
+            char2 = word2[j - 1]
+            if char1 == char2:
+                distance = previous[j - 1]
+            else:
+                distance = previous[j - 1] + 1
+                if (
+                    i > 1
+                    and j > 1
+                    and char1 == word2[j - 2]
+                    and word1[i - 2] == char2
+                    and previous2[j - 2] + 1 < distance
+                ):
+                    distance = previous2[j - 2] + 1
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            current[j] = distance if distance < too_far else too_far
+        if min(current) > max_distance:
+            return None
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def fuzzy_variants(name, max_distance=FUZZY_MAX_DISTANCE):
+    """
+    Return the deletion variants of a name stored in the fuzzy index (SymSpell
+    algorithm)
+
+    These are the strings obtained by deleting up to `max_distance`
+    characters from the case folded prefix of the name. A name within the
+    edit distance of a word shares one of these variants with the word, so
+    only the few names found by the variants of the word are compared with it.
+    """
+    return deletes(name.casefold()[:FUZZY_PREFIX_LENGTH], max_distance)
+
+
+class LemmaIndex(SQLiteDatabase):
+    """
+    SQLite index of known words
+
+    * `lemmas`: url name, name, title, frequency and grammar link of every
+      parsed word
+    * `names`: word names and alternative spellings mapped to url names
+    * `queries`: results of exact searches, in the order of the search page,
+      with the fetch time of the search page
+    * `forms`: inflected forms from the grammar pages with the grammar page
+      link and grammatical categories; the `key` column is case folded
+    * `fuzzy_variants`: the `fuzzy_variants` of the names with the length
+      of the case folded name, used by `fuzzy`
+
+    Like `duden.cache.SQLiteCache`, this is a `duden.database.SQLiteDatabase`.
+    The index only speeds up lookups, so failing writes (e.g. on a read-only
+    file system) are ignored.
+    """
+
+    def __init__(self, path, fuzzy_max_distance=FUZZY_MAX_DISTANCE):
+        super().__init__(path)
+        self.fuzzy_max_distance = fuzzy_max_distance
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self.path)!r})"
+
+    def _create_schema(self, connection):
+        migrate_fuzzy = not connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'fuzzy_variants'"
+        ).fetchall()
+        connection.executescript(INDEX_SCHEMA)
+        for table, columns in INDEX_ADDED_COLUMNS.items():
+            add_missing_columns(connection, table, columns)
+        if migrate_fuzzy:
+            # index of an older version, without the fuzzy variants
+            names = [name for name, in connection.execute("SELECT name FROM names")]
+            if names:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(*self._fuzzy_variants_insert(names))
+                connection.execute("COMMIT")
+
+    @staticmethod
+    def _fuzzy_variants_insert(names):
+        """Return (sql, parameters) statement storing the fuzzy variants"""
+        return (
+            "INSERT OR IGNORE INTO fuzzy_variants (variant, name, length) "
+            "VALUES (?, ?, ?)",
+            [
+                (variant, name, len(name.casefold()))
+                for name in names
+                for variant in fuzzy_variants(name)
+            ],
+        )
+
+    def _write(self, statements):
+        """Execute (sql, parameters) statements in one transaction"""
+        try:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, parameters in statements:
+                    if isinstance(parameters, list):
+                        connection.executemany(sql, parameters)
+                    else:
+                        connection.execute(sql, parameters)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        except (sqlite3.Error, OSError):
+            return False
+        return True
+
+    def add_word(self, word):
+        """
+        Add parsed word (DudenWord or FrozenDudenWord) to the index
+
+        The index is not written if it holds the same data of the word
+        already, e.g. when the word is loaded from the cache again.
+        """
+        urlname = getattr(word, "urlname", None)
+        name = getattr(word, "name", None)
+        if not urlname or not name:
+            return False
+
+        lemma = (
+            urlname,
+            clear_text(name),
+            getattr(word, "title", None),
+            getattr(word, "frequency", None),
+            getattr(word, "grammar_link", None),
+        )
+        names = {clear_text(name)}
+        names.update(
+            clear_text(spelling)
+            for spelling in getattr(word, "alternative_spellings", None) or []
+        )
+        names.discard("")
+        written = self._is_indexed(lemma, names) or self._write(
+            [
+                (
+                    "INSERT OR REPLACE INTO lemmas "
+                    "(urlname, name, title, frequency, grammar_link) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    lemma,
+                ),
+                ("DELETE FROM names WHERE urlname = ?", (urlname,)),
+                (
+                    "INSERT OR IGNORE INTO names (name, urlname) VALUES (?, ?)",
+                    [(spelling, urlname) for spelling in sorted(names)],
+                ),
+                # variants of names removed from the word are kept, `fuzzy`
+                # only finds names of the names table
+                self._fuzzy_variants_insert(sorted(names)),
+            ]
+        )
+        return written
+
+    def _is_indexed(self, lemma, names):
+        """Whether the lemmas row and the names of the word are stored"""
+        if self._read(
+            "SELECT urlname, name, title, frequency, grammar_link FROM lemmas "
+            "WHERE urlname = ?",
+            (lemma[0],),
+        ) != [lemma]:
+            return False
+        rows = self._read("SELECT name FROM names WHERE urlname = ?", (lemma[0],))
+        return {name for name, in rows} == names
+
+    def add_search(self, query, urlnames, fetched_at=None):
+        """
+        Store the url names found by an exact search for `query`
+
+        Empty results are not stored, so that words missing in the index
+        are searched again.
+
+        Args:
+            fetched_at (float): unix time when the search page was fetched,
+                by default now
+        """
+        if not urlnames:
+            return False
+        if fetched_at is None:
+            fetched_at = time.time()
+        return self._write(
+            [
+                ("DELETE FROM queries WHERE query = ?", (query,)),
+                (
+                    "INSERT INTO queries (query, position, urlname, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (query, position, urlname, fetched_at)
+                        for position, urlname in enumerate(urlnames)
+                    ],
+                ),
+            ]
+        )
+
+    def has_inflection(self, grammar_link):
+        """Whether the forms of the grammar page are indexed"""
+        return bool(
+            self._read(
+                "SELECT 1 FROM forms WHERE grammar_link = ? LIMIT 1", (grammar_link,)
+            )
+        )
+
+    def add_inflection(self, grammar_link, inflector):
+        """
+        Add the inflected forms of a parsed grammar page to the index
+
+        Args:
+            grammar_link (str): grammar page url suffix, e.g. "/konjugation/laufen"
+            inflector (Inflector): the parsed grammar page
+        """
+        try:
+            forms = list(inflector.forms())
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False  # grammar page with unknown structure
+        rows = []
+        for position, (categories, form) in enumerate(forms):
+            if not isinstance(form, str):
+                continue
+            categories_json = json.dumps(categories, ensure_ascii=False)
+            rows.extend(
+                (word.casefold(), form, grammar_link, position, categories_json)
+                for word in form_words(form)
+            )
+        return self._write(
+            [
+                ("DELETE FROM forms WHERE grammar_link = ?", (grammar_link,)),
+                (
+                    "INSERT OR IGNORE INTO forms "
+                    "(key, form, grammar_link, position, categories) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                ),
+            ]
+        )
+
+    def lemmatize(self, form, ignore_case=False):
+        """
+        Return list of `Lemma` tuples of the words with the inflected form
+
+        The words are known from the grammar pages in the cache. If the
+        word page of a grammar page was not loaded yet, the url name is
+        guessed from the grammar page link.
+        """
+        return self.lemmatize_many([form], ignore_case=ignore_case)[form]
+
+    def lemmatize_many(self, forms, ignore_case=False):
+        """
+        Lemmatize many inflected forms at once, see `lemmatize`
+
+        Returns:
+            dict: every form mapped to the list of its `Lemma` tuples
+        """
+        result = {form: [] for form in forms}
+        by_key = {}
+        for form in result:
+            by_key.setdefault(form.casefold(), []).append(form)
+        for key, full_form, lemma in self._iter_lemmas(list(by_key)):
+            words = None if ignore_case else form_words(full_form)
+            for form in by_key[key]:
+                if words is None or form in words:
+                    result[form].append(lemma)
+        return result
+
+    def _iter_lemmas(self, keys):
+        """Yield (key, form, Lemma) for the forms table rows with given keys"""
+        for start in range(0, len(keys), SQLITE_MAX_PARAMETERS):
+            chunk = keys[start : start + SQLITE_MAX_PARAMETERS]
+            rows = self._read(
+                "SELECT forms.key, forms.form, forms.grammar_link, "
+                "forms.categories, lemmas.urlname FROM forms "
+                "LEFT JOIN lemmas ON lemmas.grammar_link = forms.grammar_link "
+                f"WHERE forms.key IN ({', '.join('?' * len(chunk))}) "
+                "ORDER BY forms.key, lemmas.urlname, forms.grammar_link, "
+                "forms.position",
+                chunk,
+            )
+            for key, form, grammar_link, categories, urlname in rows:
+                yield key, form, Lemma(
+                    urlname or grammar_link_urlname(grammar_link),
+                    tuple(json.loads(categories)),
+                    form,
+                )
+
+    def _read(self, sql, parameters=()):
+        try:
+            return self.connection.execute(sql, parameters).fetchall()
+        except (sqlite3.Error, OSError):
+            return []
+
+    def search(self, query, max_age=None):
+        """
+        Return url names found by an earlier exact search for `query`, in
+        the order of the search page, or None if it was not searched yet or
+        the search page was fetched more than `max_age` seconds ago
+        """
+        rows = self._read(
+            "SELECT urlname, fetched_at FROM queries WHERE query = ? "
+            "ORDER BY position",
+            (query,),
+        )
+        if max_age is not None and any(
+            time.time() - fetched_at > max_age for _, fetched_at in rows
+        ):
+            return None
+        return [urlname for urlname, _ in rows] or None
+
+    def find(self, name):
+        """
+        Return url names of the indexed words with the name or alternative
+        spelling `name`, the most frequent words first
+        """
+        rows = self._read(
+            "SELECT names.urlname FROM names "
+            "LEFT JOIN lemmas ON lemmas.urlname = names.urlname "
+            "WHERE names.name = ? "
+            "ORDER BY lemmas.frequency DESC, names.urlname",
+            (clear_text(name),),
+        )
+        return [urlname for urlname, in rows]
+
+    def fuzzy(self, word, max_distance=None):
+        """
+        Return url names of the indexed words whose name or alternative
+        spelling is within `max_distance` edits of the word (by default
+        `fuzzy_max_distance`, at most `FUZZY_MAX_DISTANCE`), the closest and
+        then most frequent words first
+
+        The candidate names are read from the `fuzzy_variants` table, which
+        `add_word` keeps up to date, so no process builds the variants of all
+        names.
+        """
+        if max_distance is None:
+            max_distance = self.fuzzy_max_distance
+        max_distance = min(max_distance, FUZZY_MAX_DISTANCE)
+        folded = word.casefold()
+        # at most 29 variants of the prefix, one query is enough
+        variants = list(fuzzy_variants(folded, max_distance))
+        rows = self._read(
+            "SELECT DISTINCT names.name, names.urlname, lemmas.frequency "
+            "FROM fuzzy_variants "
+            "JOIN names ON names.name = fuzzy_variants.name "
+            "LEFT JOIN lemmas ON lemmas.urlname = names.urlname "
+            f"WHERE fuzzy_variants.variant IN ({', '.join('?' * len(variants))}) "
+            "AND fuzzy_variants.length BETWEEN ? AND ?",
+            [*variants, len(folded) - max_distance, len(folded) + max_distance],
+        )
+        ranked = []
+        for name, urlname, frequency in rows:
+            distance = edit_distance(folded, name.casefold(), max_distance)
+            if distance is not None:
+                ranked.append((distance, -(frequency or 0), urlname))
+        ranked.sort()
+        return list(dict.fromkeys(urlname for _, _, urlname in ranked))
+
+    def names(self):
+        """
+        Return list of (name, urlname, frequency) tuples of all indexed names
+        """
+        return self._read(
+            "SELECT names.name, names.urlname, lemmas.frequency FROM names "
+            "LEFT JOIN lemmas ON lemmas.urlname = names.urlname"
+        )
+
+    def counts(self):
+        """Return dict with numbers of indexed words, names and queries"""
+        return {
+            table: self._read(f"SELECT COUNT(*) FROM {table}")[0][0]
+            for table in ("lemmas", "names", "queries", "forms")
+        }
+
+    def clear(self):
+        """Remove everything from the index"""
+        return self._write(
+            [
+                ("DELETE FROM lemmas", ()),
+                ("DELETE FROM names", ()),
+                ("DELETE FROM fuzzy_variants", ()),
+                ("DELETE FROM queries", ()),
+                ("DELETE FROM forms", ()),
+            ]
+        )
+
+    def rebuild(self, cache):
+        """
+        Rebuild the index from the word and grammar pages stored in the cache
+        backend
+
+        Search results are not cached in parsed form, so the search queries
+        are kept.
+
+        Returns:
+            int: number of indexed pages
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from .request import parse_grammar_page, parse_word_page
+
+        self._write(
+            [
+                ("DELETE FROM lemmas", ()),
+                ("DELETE FROM names", ()),
+                ("DELETE FROM fuzzy_variants", ()),
+                ("DELETE FROM forms", ()),
+            ],
+        )
+        indexed = 0
+        for entry in cache.entries():
+            if entry.prefix not in ("", "grammar-"):
+                continue
+            content = cache.get(entry.prefix, entry.key)
+            if not content:
+                continue
+            try:
+                if entry.prefix == "":
+                    indexed += self.add_word(parse_word_page(content, partial=True))
+                else:
+                    inflector = parse_grammar_page(content)
+                    indexed += self.add_inflection(entry.key, inflector)
+            except Exception:  # pylint: disable=broad-except
+                continue
+        return indexed
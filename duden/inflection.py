@@ -4,6 +4,7 @@ Module containing classes and functions related to word inflection.
 The most important are the grammatical category enums like Case, Gender,
 and the Inflector class.
 """
+
 from enum import Enum
 
 from .page.grammar import GrammarPage
@@ -127,10 +128,9 @@ class Enumdict:
             value = self.source[real_key]
         except KeyError:
             raise KeyChainError(real_key, self.key_prefix) from None
-        new_prefix = self.key_prefix + [real_key]
-        return (
-            Enumdict(value, key_prefix=new_prefix) if isinstance(value, dict) else value
-        )
+        if not isinstance(value, dict):
+            return value
+        return Enumdict(value, key_prefix=self.key_prefix + [real_key])
 
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self.source)})"
@@ -140,6 +140,12 @@ class Inflector:
     """
     Provides methods for word inflection
 
+    The sections of the grammar page (e.g. "Indikativ", "Imperativ") are
+    parsed and transformed on first access. Besides the nested `data` dict,
+    the forms are kept in flat `tables`, mapping each section name to a dict
+    of category tuples and forms, which the inflection methods look up
+    without walking the nested dicts.
+
     Example:
 
         > r = requests.get("https://www.duden.de/deklination/substantive/Hase")
@@ -157,17 +163,82 @@ class Inflector:
             soup (BeautifulSoup): parsed grammar page
         """
         self.page = GrammarPage(soup)
-        self.data = {
-            key: conditional_transform(key, value)
-            for key, value in self.page.table_data.items()
-        }
-        self.enumraw = Enumdict(self.data)
+        self.section_names = list(self.page.sections)
+        self._data = {}  # transformed sections, filled on first access
+        self._tables = {}
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Construct Inflector from raw inflection data, e.g. `Inflector.data`
+
+        The resulting Inflector has no grammar page (`page` is None).
+        """
+        inflector = cls.__new__(cls)
+        inflector.page = None
+        inflector.section_names = list(data)
+        inflector._data = dict(data)
+        inflector._tables = {}
+        return inflector
+
+    def section(self, name):
+        """
+        Return the inflection data of one section, e.g. "Deklination"
+
+        The section is parsed and transformed on first access. Returns None
+        if the page has no such section.
+        """
+        try:
+            return self._data[name]
+        except KeyError:
+            if name not in self.section_names:
+                return None
+        data = conditional_transform(name, self.page.section_data(name))
+        self._data[name] = data
+        return data
+
+    def table(self, name):
+        """
+        Return the flat lookup table of one section, mapping category tuples
+        to forms, or None if the page has no such section
+        """
+        try:
+            return self._tables[name]
+        except KeyError:
+            if name not in self.section_names:
+                return None
+        table = build_table(self.section(name))
+        self._tables[name] = table
+        return table
+
+    @property
+    def data(self):
+        """
+        Raw inflection data of all sections
+
+        The dict is built once all sections are transformed and shared by
+        later accesses, so it should not be modified.
+        """
+        if len(self._data) < len(self.section_names):
+            # keep the sections in the page order, not in the access order
+            self._data = {name: self.section(name) for name in self.section_names}
+        return self._data
+
+    @property
+    def tables(self):
+        """Flat lookup tables of all sections, see `table`"""
+        return {name: self.table(name) for name in self.section_names}
+
+    @property
+    def enumraw(self):
+        """The raw data wrapped in Enumdict"""
+        return Enumdict(self.data)
 
     def __repr__(self):
-        if not self.data:
+        if not self.section_names:
             example = "Empty"
         else:
-            example = self.data
+            example = self.section(self.section_names[0])
             while isinstance(example, dict):
                 example = list(example.values())[0]
             example = repr(example) + ", ..."
@@ -175,6 +246,21 @@ class Inflector:
 
     def inflect(self, *key_chain):
         """Fetch data from nested dict in self.enumraw by providing a list of keys to apply"""
+        # enums are looked up by their raw values (Enum._value_); building the
+        # tuple from a list is faster than from a generator
+        # pylint: disable-next=consider-using-generator
+        raw_chain = tuple([getattr(key, "_value_", key) for key in key_chain])
+        table = (
+            (self._tables.get(raw_chain[0]) or self.table(raw_chain[0]))
+            if raw_chain
+            else None
+        )
+        if table is not None:
+            form = table.get(raw_chain[1:])
+            if form is not None:
+                return form
+
+        # partial key chains (returning Enumdict) and missing data
         inner = self.enumraw
         try:
             for key in key_chain:
@@ -186,6 +272,18 @@ class Inflector:
             raise ValueError(err_msg.format(keys_str, other_choices)) from None
         return inner
 
+    def forms(self):
+        """
+        Iterate over all inflected forms
+
+        Yields:
+            tuple: category tuple and form, e.g.
+                (("Deklination", "Singular", "Nominativ"), "der Hase")
+        """
+        for name in self.section_names:
+            for categories, form in self.table(name).items():
+                yield (name,) + categories, form
+
     # nouns
     def noun_decline(self, number, case):
         """
@@ -225,6 +323,25 @@ class Inflector:
         return self.inflect(VERB_INFINITIVE_FORMS, form)
 
 
+def build_table(section):
+    """
+    Flatten the inflection data of a section into a lookup table
+
+    Returns:
+        dict: category tuples mapped to forms
+    """
+    return dict(flatten(section)) if isinstance(section, dict) else {(): section}
+
+
+def flatten(data, prefix=()):
+    """Yield (key tuple, value) pairs for the leaves of a nested dict"""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from flatten(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+
 def legend_left_transform(structure):
     """Transform data for tables where legend on the left"""
     return dict(zip(*structure[0]))
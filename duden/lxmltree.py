@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+lxml based html tree with the subset of the BeautifulSoup interface used by duden
+
+Requires the optional `lxml` dependency. Parsing a page with lxml is much
+faster than with BeautifulSoup and "html.parser". The lxml elements are
+wrapped in `LxmlNode` objects, which answer the `find`, `find_all`, `text`,
+`parents`, ... queries made by `DudenWord`, `GrammarPage` and the search page
+parser the same way BeautifulSoup tags do.
+
+Example:
+
+    > soup = duden.lxmltree.parse(html)
+    > soup.find("h1", class_="lemma__title").text
+    'Hase, der'
+"""
+
+import lxml.html
+
+# attributes holding a list of values, as in BeautifulSoup
+MULTI_VALUED_ATTRIBUTES = {"class", "rel", "rev", "accept-charset", "headers"}
+
+# tags whose text is not part of the text of their parent, as in BeautifulSoup
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def parse(html_content):
+    """
+    Parse html document and return its root node
+    """
+    return LxmlDocument(lxml.html.document_fromstring(html_content))
+
+
+def has_class(element, class_):
+    """Whether the lxml element has the class `class_`"""
+    value = element.get("class")
+    return value is not None and (class_ in value.split() or value == class_)
+
+
+def iter_strings(element, skipped=(), top=True):
+    """
+    Yield the text pieces of the lxml element subtree in document order
+
+    Comments, the contents of scripts and styles below the element and the
+    subtrees of the `skipped` elements are left out.
+    """
+    if element.text and (top or element.tag not in NON_TEXT_TAGS):
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child not in skipped:
+            yield from iter_strings(child, skipped, top=False)
+        if child.tail:
+            yield child.tail
+
+
+class LxmlNode:
+    """
+    Wrapper of an lxml element behaving like a BeautifulSoup tag
+
+    Every element is wrapped at most once per document, so the nodes can be
+    compared by identity just like BeautifulSoup tags.
+    """
+
+    __slots__ = ("element", "document", "_attrs")
+
+    def __init__(self, element, document):
+        self.element = element
+        self.document = document
+        self._attrs = None
+
+    def __repr__(self):
+        return lxml.html.tostring(self.element, encoding="unicode", with_tail=False)
+
+    __str__ = __repr__
+
+    def __bool__(self):
+        return True
+
+    def __getattr__(self, name):
+        # `node.div` is the first div below the node, as in BeautifulSoup
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.find(name)
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def __call__(self, *args, **kwargs):
+        return self.find_all(*args, **kwargs)
+
+    @property
+    def name(self):
+        """Tag name"""
+        return self.element.tag
+
+    @property
+    def attrs(self):
+        """Tag attributes; multi-valued attributes are lists"""
+        if self._attrs is None:
+            self._attrs = {
+                key: value.split() if key in MULTI_VALUED_ATTRIBUTES else value
+                for key, value in self.element.attrib.items()
+            }
+        return self._attrs
+
+    def get(self, key, default=None):
+        """Return the attribute value, or `default` if it is missing"""
+        return self.attrs.get(key, default)
+
+    @property
+    def parent(self):
+        """The parent node, or None for the document"""
+        parent = self.element.getparent()
+        return None if parent is None else self.document.wrap(parent)
+
+    @property
+    def parents(self):
+        """Iterate over the ancestor nodes, starting with the parent"""
+        for element in self.element.iterancestors():
+            yield self.document.wrap(element)
+
+    @property
+    def children(self):
+        """Iterate over the child nodes and strings"""
+        if self.element.text:
+            yield self.element.text
+        for child in self.element:
+            if isinstance(child.tag, str):
+                yield self.document.wrap(child)
+            if child.tail:
+                yield child.tail
+
+    @property
+    def descendants(self):
+        """Iterate over all nodes and strings below this node"""
+        for child in self.children:
+            yield child
+            if isinstance(child, LxmlNode):
+                yield from child.descendants
+
+    @property
+    def strings(self):
+        """Iterate over the text pieces below this node"""
+        return iter_strings(self.element)
+
+    @property
+    def text(self):
+        """All text below this node"""
+        return "".join(iter_strings(self.element))
+
+    def get_text(self):
+        """All text below this node"""
+        return self.text
+
+    def text_without(self, excluded):
+        """Like `text`, leaving out the text of the `excluded` descendant nodes"""
+        skipped = {node.element for node in excluded if node}
+        return "".join(iter_strings(self.element, skipped))
+
+    def _iter_elements(self, tag, recursive):
+        if recursive:
+            return self.element.iterdescendants(tag)
+        return self.element.iterchildren(tag)
+
+    def find_all(
+        self, name=None, class_=None, id=None, recursive=True, limit=None
+    ):  # pylint: disable=redefined-builtin,too-many-arguments
+        """
+        Return list of the nodes below this one with given name, class and id
+
+        `name` None or True matches any tag.
+        """
+        tag = None if name in (None, True) else name
+        found = []
+        for element in self._iter_elements(tag, recursive):
+            if not isinstance(element.tag, str):
+                continue  # comment or processing instruction
+            if id is not None and element.get("id") != id:
+                continue
+            if class_ is not None and not has_class(element, class_):
+                continue
+            found.append(self.document.wrap(element))
+            if limit and len(found) >= limit:
+                break
+        return found
+
+    def find(self, name=None, **kwargs):
+        """Return the first node found by `find_all`, or None"""
+        found = self.find_all(name, limit=1, **kwargs)
+        return found[0] if found else None
+
+
+class LxmlDocument(LxmlNode):
+    """
+    Root node of a parsed document, wrapping the <html> element
+
+    Searches include the <html> element itself, as searches in a
+    BeautifulSoup object do.
+    """
+
+    __slots__ = ("_wrappers",)
+
+    def __init__(self, root):
+        super().__init__(root, self)
+        self._wrappers = {root: self}
+
+    def wrap(self, element):
+        """Return the node of the lxml element"""
+        node = self._wrappers.get(element)
+        if node is None:
+            node = self._wrappers[element] = LxmlNode(element, self)
+        return node
+
+    def _iter_elements(self, tag, recursive):
+        if recursive:
+            return self.element.iter(tag)
+        return iter([self.element] if tag in (None, self.element.tag) else [])
@@ -2,6 +2,8 @@
 Module containing the base class for duden pages
 """
 
+from functools import cached_property
+
 
 class DudenPage:
     """
@@ -12,10 +14,19 @@ class DudenPage:
     def __init__(self, soup):
         self.soup = soup
 
-    def division(self, title):
-        """Find general page division by its title"""
+    @cached_property
+    def divisions(self):
+        """General page divisions by their title, located once"""
+        divisions = {}
         for division in self.soup.find_all("div", class_="division"):
             div_title = division.find("h2", class_="division__title")
-            if div_title and div_title.text == title:
-                return division
-        raise KeyError(title)
+            if div_title:
+                divisions.setdefault(div_title.text, division)
+        return divisions
+
+    def division(self, title):
+        """Find general page division by its title"""
+        try:
+            return self.divisions[title]
+        except KeyError:
+            raise KeyError(title) from None
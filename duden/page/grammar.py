@@ -7,8 +7,10 @@ The main class is GrammarPage representing the above pages.
 
 Other module-level functions are helper functions to assist the class.
 """
-import copy
 
+from functools import cached_property
+
+from ..common import text_without
 from .base import DudenPage
 
 
@@ -22,10 +24,22 @@ class GrammarPage(DudenPage):
     and do a rough parsing of the accordion style HTML elements
     """
 
+    @cached_property
+    def sections(self):
+        """Inflection groups (div.con-dec__wrapper) by their title"""
+        return {
+            igrp.h3.text: igrp
+            for igrp in self.division("Grammatik").div(class_="con-dec__wrapper")
+        }
+
+    def section_data(self, title):
+        """Parse grammar data of one section of grammar page"""
+        return parse_igroup(self.sections[title])
+
     @property
     def table_data(self):
         """Parse grammar data for grammar page"""
-        return parse_grammar(self.division("Grammatik"))
+        return {title: parse_igroup(igrp) for title, igrp in self.sections.items()}
 
 
 def parse_grammar(division):
@@ -52,10 +66,5 @@ def parse_ul(tag_ul):
 
 
 def parse_li(tag_li):
-    """Parse li tag contents"""
-    tag_li = copy.copy(tag_li)
-    try:
-        tag_li.sup.extract()
-    except AttributeError:
-        pass
-    return tag_li.text
+    """Parse li tag contents, leaving out the superscript"""
+    return text_without(tag_li, [tag_li.sup])
@@ -3,69 +3,266 @@
 Network requests-related functions
 """
 
-import gzip
-import string
-from pathlib import Path
+import html
+import os
+import re
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import bs4
-import requests
-from xdg.BaseDirectory import xdg_cache_home
 
+from .cache import (  # pylint: disable=unused-import
+    get_cache,
+    parsed_cache,
+    sanitize_word,
+)
 from .common import clear_text
 from .inflection import Inflector
-from .word import DudenWord
+from .word import DudenWord, WordPageStrainer
 
 URL_FORM = "https://www.duden.de/rechtschreibung/{word}"
 SEARCH_URL_FORM = "https://www.duden.de/suchen/dudenonline/{word}"
 GRAMMAR_BASE = "https://www.duden.de/{urlpart}"
+HOME_URL = "https://www.duden.de"
 DEFAULT_TIMEOUT = 10
 
+# connection pool settings of the shared http session
+POOL_CONNECTIONS = 4  # number of per-host connection pools to keep
+POOL_MAXSIZE = 16  # maximal number of connections kept alive per host
+MAX_RETRIES = 2
 
-def sanitize_word(word):
+# number of parallel workers used by bulk lookups
+DEFAULT_MAX_WORKERS = 8
+
+# html parser: "bs4" (BeautifulSoup with html.parser, default) or "lxml"
+# (requires the optional lxml package), see `set_parser`
+PARSER_ENV_VARIABLE = "DUDEN_PARSER"
+PARSERS = ["bs4", "lxml"]
+
+# grammar page link in the word page html, see `find_grammar_link`
+GRAMMAR_LINK_RE = re.compile(r"""<a\s[^>]*\bid=["']grammatik["'][^>]*>""")
+HREF_RE = re.compile(r"""\bhref=["']([^"']*)["']""")
+
+_session = None  # pylint: disable=invalid-name
+_parser = None  # pylint: disable=invalid-name
+_executor = None  # pylint: disable=invalid-name
+
+
+def create_session(
+    pool_connections=POOL_CONNECTIONS,
+    pool_maxsize=POOL_MAXSIZE,
+    max_retries=MAX_RETRIES,
+):
+    """
+    Create a requests session with keep-alive connection pooling
+
+    Args:
+        pool_connections (int): number of per-host connection pools to cache
+        pool_maxsize (int): maximal number of connections kept alive per host
+        max_retries (int): number of retries of failed connection attempts
+
+    Returns:
+        requests.Session: session usable by `set_session`
+    """
+    # the http library is imported only when a page is requested
+    import requests  # pylint: disable=import-outside-toplevel
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the shared http session used by all duden fetchers
+
+    The session is created on first use.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session):
+    """
+    Replace the shared http session used by all duden fetchers
+
+    Any object with the `requests.Session.get` interface can be injected, e.g.
+    a session with custom pool sizes created by `create_session`, or a mock.
+    Passing None resets the session, a new default one is created on next use.
+    """
+    global _session  # pylint: disable=global-statement
+    _session = session
+
+
+def fetch(url, headers=None):
+    """
+    Perform GET request to `url` using the shared session
+
+    Returns:
+        requests.Response: the server response
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    try:
+        return get_session().get(url, timeout=DEFAULT_TIMEOUT, headers=headers)
+    except requests.exceptions.ConnectionError as exc:
+        raise RuntimeError(
+            _("Connection could not be established. Check your internet connection.")
+        ) from exc
+
+
+def get_executor():
+    """
+    Return the thread pool used for background requests, like the grammar
+    page prefetch of `get(word, with_inflection=True)`
+    """
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="duden"
+        )
+    return _executor
+
+
+def get_parser():
     """
-    Sanitize unicode word for use as filename
+    Return the name of the html parser used for duden pages
 
-    Ascii letters and underscore are kept unchanged.
-    Other characters are replaced with "-u{charccode}-" string.
+    On first use, the parser is chosen by the `DUDEN_PARSER` environment
+    variable (`bs4` or `lxml`); `bs4` is used by default.
     """
-    allowed_chars = string.ascii_letters + "_"
+    if _parser is None:
+        set_parser(os.environ.get(PARSER_ENV_VARIABLE, "bs4"))
+    return _parser
 
-    def sanitize_char(char):
-        if char in allowed_chars:
-            return char
-        return "-u" + str(ord(char)) + "-"
 
-    return "".join(sanitize_char(char) for char in word)
+def set_parser(name):
+    """
+    Select the html parser used for duden pages
+
+    Args:
+        name (str): "bs4" for BeautifulSoup with "html.parser", or "lxml" for
+            the faster `duden.lxmltree` (requires the lxml package)
+    """
+    global _parser  # pylint: disable=global-statement
+    if name not in PARSERS:
+        raise ValueError(
+            _("Unknown html parser: {}. Choose one of: {}").format(
+                name, ", ".join(PARSERS)
+            )
+        )
+    _parser = name
+
+
+def make_soup(html_content, parse_only=None):
+    """
+    Parse html with the selected parser and return the document node
+
+    The `parse_only` strainer restricts parsing with BeautifulSoup, lxml
+    always parses the whole document.
+    """
+    if get_parser() == "lxml":
+        from . import lxmltree  # pylint: disable=import-outside-toplevel
+
+        return lxmltree.parse(html_content)
+    return bs4.BeautifulSoup(html_content, "html.parser", parse_only=parse_only)
+
+
+def read_cache(prefix, cache_key):
+    """
+    Return cached response text, or None if it is not cached
+    """
+    return get_cache().get(prefix, cache_key)
+
+
+def write_cache(prefix, cache_key, content, headers=None):
+    """
+    Store response text in cache, together with validators from the response
+    `headers`
+    """
+    get_cache().set(prefix, cache_key, content, **response_validators(headers or {}))
+
+
+def conditional_headers(entry):
+    """
+    Return request headers revalidating the cache entry
+    """
+    headers = {}
+    if entry is not None and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry is not None and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def response_validators(headers):
+    """
+    Return cache validators and max age found in response headers
+    """
+    default_max_age = get_cache().max_age
+    max_age = None
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() != "max-age" or not value.isdigit():
+            continue
+        # the server can only extend the configured max age
+        if default_max_age is not None and int(value) > default_max_age:
+            max_age = int(value)
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "max_age": max_age,
+    }
 
 
 def cached_response(prefix=""):
     """
     Add `cache=True` keyword argument to a function to allow result caching based on single string
-    argument.
+    argument, and `refresh=False` to revalidate the cached result.
+
+    The decorated function is called with the cache key and `headers` keyword
+    argument with conditional request headers, and returns `requests.Response`,
+    or None if the page does not exist. The wrapper returns the response text.
+
+    Expired cache entries are revalidated; if the server responds with
+    "304 Not Modified", the cached text is used. If the revalidation fails,
+    the stale cached text is returned.
     """
 
     def decorator_itself(func):
-        def function_wrapper(cache_key, cache=True, **kwargs):
-            cachedir = Path(xdg_cache_home) / "duden"
-            filename = prefix + sanitize_word(cache_key) + ".gz"
-            full_path = str(cachedir / filename)
+        def function_wrapper(cache_key, cache=True, refresh=False):
+            backend = get_cache()
+            entry = backend.get_entry(prefix, cache_key) if cache else None
+            if entry is not None and not (refresh or backend.is_expired(entry)):
+                return entry.content
+
+            import requests  # pylint: disable=import-outside-toplevel
+
+            try:
+                response = func(cache_key, headers=conditional_headers(entry))
+            except (RuntimeError, requests.exceptions.RequestException):
+                if entry is not None:
+                    return entry.content
+                raise
+
+            if response is None:
+                return None
+            if entry is not None and response.status_code == 304:
+                backend.mark_fresh(prefix, cache_key)
+                return entry.content
 
             if cache:
-                # try to read from cache
-                cachedir.mkdir(parents=True, exist_ok=True)
-                try:
-                    with gzip.open(full_path, "rt", encoding="utf8") as file:
-                        return file.read()
-                except (FileNotFoundError, IOError, EOFError):
-                    pass
-
-            result = func(cache_key, **kwargs)
-
-            if cache and result is not None:
-                with gzip.open(full_path, "wt", encoding="utf8") as file:
-                    file.write(result)
-
-            return result
+                write_cache(prefix, cache_key, response.text, response.headers)
+            return response.text
 
         return function_wrapper
 
@@ -73,48 +270,286 @@ def cached_response(prefix=""):
 
 
 @cached_response(prefix="")
-def request_word(word):
+def request_word(word, headers=None):
     """
     Request word page from duden
     """
     url = URL_FORM.format(word=word)
-    try:
-        response = requests.get(url, timeout=DEFAULT_TIMEOUT)
-    except requests.exceptions.ConnectionError as exc:
-        raise RuntimeError(
-            _("Connection could not be established. Check your internet connection.")
-        ) from exc
+    response = fetch(url, headers=headers)
 
     if response.status_code == 404:
         return None
     response.raise_for_status()
 
-    return response.text
+    return response
 
 
-def get(word, cache=True):
+def get(  # pylint: disable=too-many-arguments
+    word,
+    cache=True,
+    partial=False,
+    detached=False,
+    with_inflection=False,
+    refresh=False,
+):
     """
     Load the word 'word' and return the DudenWord instance
+
+    If the in-memory `duden.cache.parsed_cache` is enabled, already parsed
+    words are returned from it. With `partial`, only the page regions the
+    word attributes are read from are parsed (see `parse_word_page`).
+
+    With `with_inflection`, the word inflection is loaded too. The grammar
+    page is fetched in the background while the word page is being parsed,
+    instead of afterwards on the first access of `word.inflection`.
+
+    With `detached`, an immutable `FrozenDudenWord` record without the parsed
+    page and with the inflection is returned instead (see `DudenWord.freeze`).
+
+    With `refresh`, the cached pages are revalidated, like all pages are when
+    the `revalidate` flag of the cache backend is set (see `--refresh`).
     """
+    parsed = _get_parsed(
+        word,
+        cache=cache,
+        partial=partial,
+        with_inflection=with_inflection or detached,
+        refresh=refresh,
+    )
+    if detached and parsed is not None:
+        return parsed.freeze()
+    return parsed
+
+
+def _get_parsed(word, cache=True, partial=False, with_inflection=False, refresh=False):
+    """Load and parse the word 'word', using the in-memory cache"""
+    if cache:
+        parsed = memory_cached("", word, refresh=refresh)
+        if parsed is not None:
+            if with_inflection:
+                parsed.inflection  # pylint: disable=pointless-statement
+            return parsed
+
     html_content = request_word(
-        word, cache=cache
+        word, cache=cache, refresh=refresh
     )  # pylint: disable=unexpected-keyword-arg
     if html_content is None:
         return None
 
-    soup = bs4.BeautifulSoup(html_content, "html.parser")
+    # start loading the grammar page before parsing the word page
+    grammar_link = find_grammar_link(html_content) if with_inflection else None
+    prefetch = grammar_link and get_executor().submit(
+        grammar, grammar_link, cache, refresh
+    )
+
+    parsed = word_from_page(word, html_content, cache=cache, partial=partial)
+
+    if prefetch:
+        if parsed.grammar_link == grammar_link:
+            # pylint: disable=protected-access
+            parsed._inflection = prefetch.result()
+        else:
+            prefetch.cancel()
+    if with_inflection:
+        parsed.inflection  # pylint: disable=pointless-statement
+    return parsed
+
+
+def memory_cached(prefix, key, refresh=False):
+    """
+    Return the parsed object from the in-memory `parsed_cache`, or None
+
+    The objects are not used while the pages are being revalidated (with
+    `refresh` or the `--refresh` option), and they expire after the max age of
+    the cache backend, like the cached pages.
+    """
+    backend = get_cache()
+    if refresh or backend.revalidate:
+        return None
+    return parsed_cache.get((prefix, key), max_age=backend.max_age)
+
+
+def word_from_page(word, html_content, cache=True, partial=False):
+    """
+    Parse the page of the word 'word' and store the DudenWord in the
+    in-memory cache and the lemma index
+    """
+    parsed = parse_word_page(html_content, partial=partial)
+    if cache:
+        parsed_cache.set(("", word), parsed)
+        get_cache().index.add_word(parsed)
+    return parsed
+
+
+def find_grammar_link(html_content):
+    """
+    Find the grammar page link in the word page html without parsing it
+
+    Returns:
+        str: the same value as `DudenWord.grammar_link`, or None if the page
+            has no grammar link
+    """
+    tag = GRAMMAR_LINK_RE.search(html_content)
+    href = tag and HREF_RE.search(tag.group(0))
+    return html.unescape(href.group(1)) if href else None
+
+
+def parse_word_page(html_content, partial=False):
+    """
+    Parse word page html and return the DudenWord instance
+
+    Args:
+        html_content: html of the word page
+        partial: parse only the page regions listed in
+            `duden.word.WORD_PAGE_PARTS`; the resulting word attributes are
+            the same, but parsing is faster and uses less memory (only used
+            by the "bs4" parser)
+    """
+    soup = make_soup(html_content, parse_only=WordPageStrainer() if partial else None)
     return DudenWord(soup)
 
 
+LookupResult = namedtuple("LookupResult", ["word", "result", "error"])
+LookupResult.__doc__ = """
+Outcome of a single lookup performed by `get_many`
+
+Attributes:
+    word: the looked up word (url name)
+    result: DudenWord instance, or None when the word does not exist or failed
+    error: exception raised during the lookup, or None on success
+"""
+
+
+def map_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS, ordered=True):
+    """
+    Apply `func` to every item using a pool of threads and yield the results
+
+    At most `2 * max_workers` items are being processed or waiting for
+    consumption at the same time, so arbitrarily long iterables can be
+    processed with bounded memory.
+
+    Args:
+        func: function of single argument; should not raise
+        items: iterable of function arguments
+        max_workers (int): number of worker threads
+        ordered (bool): yield results in the input order (True) or as soon as
+            they are ready (False)
+    """
+    window = 2 * max_workers
+    pending = deque()
+
+    def collect():
+        """Wait for the next finished task(s) and yield results"""
+        if ordered:
+            yield pending.popleft().result()
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield from collect()
+        while pending:
+            yield from collect()
+    finally:
+        # when the consumer stops early, do not start the remaining tasks
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_many(  # pylint: disable=too-many-arguments
+    words,
+    max_workers=DEFAULT_MAX_WORKERS,
+    cache=True,
+    ordered=True,
+    partial=False,
+    detached=False,
+):
+    """
+    Load multiple words concurrently and yield `LookupResult` for each of them
+
+    Duplicate words are looked up only once. Errors are reported in the
+    `error` field of the result instead of aborting the whole batch.
+
+    Args:
+        words: iterable of word url names
+        max_workers (int): maximal number of parallel requests
+        cache (bool): whether to use the response cache
+        ordered (bool): keep the input order (True), or yield results in the
+            order they finish (False)
+        partial (bool): parse only the page regions read by the word
+            attributes, see `parse_word_page`
+        detached (bool): return `FrozenDudenWord` records, see `get`
+    """
+
+    def lookup(word):
+        try:
+            result = get(word, cache=cache, partial=partial, detached=detached)
+            return LookupResult(word, result, None)
+        except Exception as exc:  # pylint: disable=broad-except
+            return LookupResult(word, None, exc)
+
+    return map_concurrently(lookup, _unique(words), max_workers, ordered=ordered)
+
+
+def get_many(
+    words, max_workers=DEFAULT_MAX_WORKERS, cache=True, partial=False, detached=False
+):
+    """
+    Load multiple words concurrently
+
+    Example:
+
+        > results = duden.get_many(["Hase", "laufen", "Hase", "Unbekannt"])
+        > [(r.word, r.result) for r in results]
+        [('Hase', Hase, der (Substantiv, maskulin)),
+         ('laufen', laufen (starkes Verb)),
+         ('Unbekannt', None)]
+
+    Returns:
+        list of LookupResult: one result per unique word, in the input order
+    """
+    return list(
+        iter_many(
+            words,
+            max_workers=max_workers,
+            cache=cache,
+            partial=partial,
+            detached=detached,
+        )
+    )
+
+
+def _unique(items):
+    """Yield items of the iterable skipping the already seen ones"""
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
 def get_word_of_the_day():
     """
     Scrapes the word of the day and returns DudenWord instance of it.
     """
-    html_content = requests.get("https://www.duden.de", timeout=DEFAULT_TIMEOUT).content
-    soup = bs4.BeautifulSoup(html_content, "html.parser")
+    html_content = fetch(HOME_URL).content
+    return get(parse_word_of_the_day(html_content))
+
+
+def parse_word_of_the_day(html_content):
+    """
+    Return url name of the word of the day found in the main page html
+    """
+    soup = make_soup(html_content)
     link = soup.find("a", class_="scene__title-link").get("href")
-    word = link.split("/")[-1]  # get word from "/rechtschreibung/word"
-    return get(word)
+    return link.split("/")[-1]  # get word from "/rechtschreibung/word"
 
 
 def get_search_link_variants(link_text):
@@ -127,22 +562,147 @@ def get_search_link_variants(link_text):
 
 
 @cached_response(prefix="search-")
-def request_search(word):
+def request_search(word, headers=None):
     """
     Request search page from duden
     """
     url = SEARCH_URL_FORM.format(word=word)
-    return requests.get(url, timeout=DEFAULT_TIMEOUT).text
+    return fetch(url, headers=headers)
+
+
+def search(
+    word,
+    exact=True,
+    return_words=True,
+    cache=True,
+    max_workers=DEFAULT_MAX_WORKERS,
+    offline_first=False,
+    refresh=False,
+):  # pylint: disable=too-many-arguments
+    """
+    Search for a word 'word' in duden
+
+    The result pages are fetched concurrently, using at most `max_workers`
+    parallel requests. See `search_urlnames` for the meaning of
+    `offline_first` and `refresh`.
+    """
+    urlnames = search_urlnames(
+        word, exact=exact, cache=cache, offline_first=offline_first, refresh=refresh
+    )
 
+    def lookup(urlname):
+        return get(urlname, cache=cache, refresh=refresh)
 
-def search(word, exact=True, return_words=True, cache=True):
+    if not return_words:
+        return urlnames
+    if len(urlnames) < 2:
+        return [lookup(urlname) for urlname in urlnames]
+    return list(map_concurrently(lookup, urlnames, max_workers))
+
+
+def search_iter(  # pylint: disable=too-many-arguments
+    word,
+    exact=True,
+    cache=True,
+    max_workers=DEFAULT_MAX_WORKERS,
+    offline_first=False,
+    refresh=False,
+):
     """
-    Search for a word 'word' in duden
+    Search for a word 'word' in duden and yield DudenWord of every result
+
+    Unlike `search`, the words are yielded as soon as each of them is loaded,
+    so the order of the results is not preserved. Results which could not be
+    found are skipped.
+    """
+    urlnames = search_urlnames(
+        word, exact=exact, cache=cache, offline_first=offline_first, refresh=refresh
+    )
+
+    results = map_concurrently(
+        lambda name: get(name, cache=cache, refresh=refresh),
+        urlnames,
+        max_workers,
+        ordered=False,
+    )
+    for result in results:
+        if result is not None:
+            yield result
+
+
+def search_urlnames(word, exact=True, cache=True, offline_first=False, refresh=False):
+    """
+    Return url names of the words found by searching for 'word'
+
+    With the cache enabled, exact searches are answered from the local lemma
+    index (see `duden.index`) when the same word was searched before, without
+    reading the search page. With `offline_first`, words the index knows by
+    name or alternative spelling are returned as well, so that words loaded
+    before by `get` are found with no network request at all. Non-exact
+    searches with `offline_first` return the indexed words within a few typos
+    of 'word' (see `duden.index.LemmaIndex.fuzzy`). The search page is only
+    requested when the index finds no word.
+
+    With `refresh`, the index is not used and the cached search page is
+    revalidated.
     """
+    urlnames = search_index(
+        word, exact=exact, cache=cache, offline_first=offline_first, refresh=refresh
+    )
+    if urlnames is not None:
+        return urlnames
+
     response_text = request_search(
-        word, cache=cache
+        word, cache=cache, refresh=refresh
     )  # pylint: disable=unexpected-keyword-arg
-    soup = bs4.BeautifulSoup(response_text, "html.parser")
+    return search_results(word, response_text, exact=exact, cache=cache)
+
+
+def search_index(word, exact=True, cache=True, offline_first=False, refresh=False):
+    """
+    Return url names of the words found by searching for 'word' in the local
+    lemma index, or None if the search page has to be requested
+
+    See `search_urlnames` for the meaning of the arguments.
+    """
+    backend = get_cache()
+    if not cache or refresh or backend.revalidate:
+        return None
+    # the stored search results expire together with the search page
+    urlnames = backend.index.search(word, max_age=backend.max_age) if exact else None
+    if urlnames is None and offline_first:
+        index_lookup = backend.index.find if exact else backend.index.fuzzy
+        urlnames = index_lookup(word) or None
+    return urlnames
+
+
+def search_results(word, html_content, exact=True, cache=True):
+    """
+    Return url names of the words listed on the search page for 'word', and
+    add the exact results to the lemma index
+
+    A missing search page (`html_content` is None) lists no words.
+    """
+    if html_content is None:
+        return []
+    urlnames = parse_search_page(html_content, word, exact=exact)
+    if cache and exact and urlnames:
+        backend = get_cache()
+        fetched_at = backend.fetched_at("search-", word)
+        backend.index.add_search(word, urlnames, fetched_at=fetched_at)
+    return urlnames
+
+
+def parse_search_page(html_content, word, exact=True):
+    """
+    Return url names of the words listed on the search page
+
+    Args:
+        html_content (str): html of the search page
+        word (str): the searched word
+        exact (bool): return only results matching the searched word exactly
+    """
+    soup = make_soup(html_content)
     definitions = soup.find_all("h2", class_="vignette__title")
 
     if definitions is None:
@@ -153,14 +713,11 @@ def search(word, exact=True, return_words=True, cache=True):
         definition_title = definition.text
         if (not exact) or word in get_search_link_variants(definition_title):
             urlnames.append(definition.find("a")["href"].split("/")[-1])
-
-    if not return_words:
-        return urlnames
-    return [get(urlname, cache=cache) for urlname in urlnames]
+    return urlnames
 
 
 @cached_response(prefix="grammar-")
-def request_grammar(urlpart):
+def request_grammar(urlpart, headers=None):
     """
     Fetch inflection-related page and cache the result
 
@@ -174,10 +731,10 @@ def request_grammar(urlpart):
         str: HTML content of the page
     """
     url = GRAMMAR_BASE.format(urlpart=urlpart)
-    return requests.get(url, timeout=DEFAULT_TIMEOUT).text
+    return fetch(url, headers=headers)
 
 
-def grammar(urlpart):
+def grammar(urlpart, cache=True, refresh=False):
     """
     Return word inflections when given url suffix for word's grammar page
 
@@ -186,10 +743,85 @@ def grammar(urlpart):
             '/deklination/substantive/{word}'
             '/deklination/adjektive/{word}'
             '/konjugation/{word}'
+        cache (bool): whether to use the response and parsed object caches
+        refresh (bool): revalidate the cached page
 
     Returns:
         Inflector: object providing word inflections
     """
-    response_text = request_grammar(urlpart)
-    soup = bs4.BeautifulSoup(response_text, "html.parser")
+    if cache:
+        parsed = memory_cached("grammar-", urlpart, refresh=refresh)
+        if parsed is not None:
+            return parsed
+
+    response_text = request_grammar(
+        urlpart, cache=cache, refresh=refresh
+    )  # pylint: disable=unexpected-keyword-arg
+    return grammar_from_page(urlpart, response_text, cache=cache)
+
+
+def grammar_from_page(urlpart, html_content, cache=True):
+    """
+    Parse the grammar page with the url suffix 'urlpart' and store the
+    Inflector in the in-memory cache and the lemma index
+    """
+    parsed = parse_grammar_page(html_content)
+    if cache:
+        parsed_cache.set(("grammar-", urlpart), parsed)
+        index_inflection(urlpart, parsed)
+    return parsed
+
+
+def index_inflection(urlpart, inflector):
+    """
+    Add the forms of a grammar page to the local lemma index, unless they
+    are indexed already
+    """
+    index = get_cache().index
+    if not index.has_inflection(urlpart):
+        index.add_inflection(urlpart, inflector)
+
+
+def lemmatize(form, ignore_case=False):
+    """
+    Return the words an inflected form belongs to
+
+    The forms are looked up in the local index of the cached grammar pages
+    (see `duden.index`), without any network request, so only words whose
+    inflection was loaded before are found.
+
+    Example:
+
+        > duden.get("laufen").inflection
+        > duden.lemmatize("lief")
+        [Lemma(urlname='laufen', categories=('Indikativ', 'Präteritum', 'ich'),
+               form='lief'), ...]
+
+    Args:
+        form (str): inflected form, e.g. "lief", "Hasen" or "bin gelaufen"
+        ignore_case (bool): find the form regardless of its case, e.g. at the
+            beginning of a sentence
+
+    Returns:
+        list: `duden.index.Lemma` tuples with url name of the word,
+        grammatical categories and the full inflected form
+    """
+    return get_cache().index.lemmatize(form, ignore_case=ignore_case)
+
+
+def lemmatize_many(forms, ignore_case=False):
+    """
+    Lemmatize many inflected forms at once, see `lemmatize`
+
+    Returns:
+        dict: every form mapped to the list of its `duden.index.Lemma` tuples
+    """
+    return get_cache().index.lemmatize_many(forms, ignore_case=ignore_case)
+
+
+def parse_grammar_page(html_content):
+    """
+    Parse grammar page html and return the Inflector instance
+    """
+    soup = make_soup(html_content)
     return Inflector(soup)
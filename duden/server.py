@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Resident duden server answering requests over a Unix socket
+
+Started by `duden serve`. The server keeps the parsed words and inflections
+in the in-memory `duden.cache.parsed_cache`, the cache index in memory and
+the HTTP connections open, so repeated lookups are answered without starting
+Python, importing the parsers or reading the cache files again. While it is
+running, `duden` CLI calls are forwarded to it (see `duden.client`).
+
+Operations (see `duden.client` for the protocol):
+
+* `ping`: server version
+* `get` (word): word attributes, as exported by `DudenWord.export`, without
+  the inflection
+* `export` (word): word attributes with the inflection
+* `inflect` (word): inflection data (`Inflector.data`)
+* `search` (word, exact, offline_first): url names of the found words
+* `lemmatize` (form, ignore_case): lemmas of the inflected form
+* `cli` (argv, color, env): output and exit code of the duden CLI, or None
+  if the environment `env` of the client differs and the CLI has to be run
+  by the client
+"""
+
+import contextlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import traceback
+
+from . import client, request
+from .__version__ import __version__
+from .cache import get_cache, parsed_cache
+from .word import EXPORT_ATTRIBUTES
+
+# capacity of the in-memory cache of parsed words, unless configured
+SERVER_MEMORY_CACHE_SIZE = 1000
+
+_streams_lock = threading.Lock()
+
+
+class ThreadLocalStream:
+    """
+    Proxy of sys.stdout or sys.stderr writing to the stream redirected to in
+    the current thread (see `redirect`), or to the original stream
+
+    Unlike `contextlib.redirect_stdout`, this captures the output of CLI
+    calls running in several threads at once.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(getattr(self._local, "stream", None) or self.stream, name)
+
+    @contextlib.contextmanager
+    def redirect(self, stream):
+        """Redirect the output of the current thread to the stream"""
+        self._local.stream = stream
+        try:
+            yield stream
+        finally:
+            self._local.stream = None
+
+
+def thread_local_streams():
+    """Replace sys.stdout and sys.stderr with ThreadLocalStream proxies"""
+    with _streams_lock:
+        if not isinstance(sys.stdout, ThreadLocalStream):
+            sys.stdout = ThreadLocalStream(sys.stdout)
+        if not isinstance(sys.stderr, ThreadLocalStream):
+            sys.stderr = ThreadLocalStream(sys.stderr)
+        return sys.stdout, sys.stderr
+
+
+class CapturedOutput(io.StringIO):
+    """Captured output stream, pretending to be a terminal if the client's is"""
+
+    def __init__(self, isatty=False):
+        super().__init__()
+        self._isatty = isatty
+
+    def isatty(self):
+        return self._isatty
+
+
+def op_ping():
+    """Return the server version"""
+    return {"version": __version__}
+
+
+def op_get(word, cache=True):
+    """Return attributes of the word, or None if it does not exist"""
+    parsed = request.get(word, cache=cache)
+    if parsed is None:
+        return None
+    return {attribute: getattr(parsed, attribute) for attribute in EXPORT_ATTRIBUTES}
+
+
+def op_export(word, cache=True):
+    """Return attributes of the word with its inflection"""
+    parsed = request.get(word, cache=cache, with_inflection=True)
+    return parsed and parsed.export()
+
+
+def op_inflect(word, cache=True):
+    """Return inflection data of the word"""
+    parsed = request.get(word, cache=cache, with_inflection=True)
+    return parsed and parsed.inflection and parsed.inflection.data
+
+
+def op_search(word, exact=True, cache=True, offline_first=False):
+    """Return url names of the words found by searching for the word"""
+    return request.search(
+        word,
+        exact=exact,
+        return_words=False,
+        cache=cache,
+        offline_first=offline_first,
+    )
+
+
+def op_lemmatize(form, ignore_case=False):
+    """Return lemmas of the inflected form as dicts"""
+    # pylint: disable=protected-access
+    return [
+        lemma._asdict() for lemma in request.lemmatize(form, ignore_case=ignore_case)
+    ]
+
+
+def op_cli(argv, color=False, env=None):
+    """
+    Run the duden CLI and return its output and exit code, or None if the
+    environment `env` of the client, including the duden version, differs
+    from the server's (see `duden.client.cli_environment`)
+    """
+    # pylint: disable=import-outside-toplevel,cyclic-import
+    from .cli import run
+
+    if env is not None and env != client.cli_environment():
+        return None
+
+    stdout, stderr = CapturedOutput(color), CapturedOutput(color)
+    stdout_proxy, stderr_proxy = thread_local_streams()
+    try:
+        with stdout_proxy.redirect(stdout), stderr_proxy.redirect(stderr):
+            run(argv)
+        exit_code = 0
+    except SystemExit as exit_:
+        if exit_.code is None or isinstance(exit_.code, int):
+            exit_code = exit_.code or 0
+        else:
+            print(exit_.code, file=stderr)
+            exit_code = 1
+    except Exception:  # pylint: disable=broad-except
+        # the traceback a local call would print
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+OPERATIONS = {
+    "ping": op_ping,
+    "get": op_get,
+    "export": op_export,
+    "inflect": op_inflect,
+    "search": op_search,
+    "lemmatize": op_lemmatize,
+    "cli": op_cli,
+}
+
+
+def dispatch(message):
+    """Perform the operation requested by the message and return its result"""
+    params = dict(message)
+    name = params.pop("op", None)
+    try:
+        operation = OPERATIONS[name]
+    except KeyError:
+        raise ValueError(
+            _("Unknown operation: {}. Choose one of: {}").format(
+                name, ", ".join(OPERATIONS)
+            )
+        ) from None
+    return operation(**params)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answer the JSON requests of one connection"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = {"result": dispatch(json.loads(line))}
+            except Exception as exception:  # pylint: disable=broad-except
+                response = {"error": str(exception) or repr(exception)}
+            self.wfile.write(
+                json.dumps(response, ensure_ascii=False).encode("utf8") + b"\n"
+            )
+            self.wfile.flush()
+
+
+class DudenServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threading Unix socket server performing the duden operations
+
+    A stale socket file left by a killed server is replaced; if another
+    server is listening on the socket, RuntimeError is raised. The socket is
+    accessible only by the current user and removed when the server is
+    closed.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path=None):
+        path = path or client.socket_path()
+        if not path:
+            raise ValueError(_("The duden server socket is disabled"))
+        if os.path.exists(path):
+            if client.is_running(path):
+                raise RuntimeError(
+                    _("The duden server is already running: {}").format(path)
+                )
+            os.unlink(path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        super().__init__(path, RequestHandler)
+
+    def server_bind(self):
+        # the socket file is created by bind(), with permissions restricted
+        # by the umask from the start
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def serve(path=None, memory_cache_size=None):
+    """
+    Run the server until interrupted
+
+    Args:
+        path (str): socket path, by default `duden.client.socket_path()`
+        memory_cache_size (int): capacity of the parsed objects cache; by
+            default the configured capacity, at least `SERVER_MEMORY_CACHE_SIZE`
+    """
+    if memory_cache_size is None:
+        memory_cache_size = max(parsed_cache.capacity, SERVER_MEMORY_CACHE_SIZE)
+    parsed_cache.resize(memory_cache_size)
+
+    server = DudenServer(path)
+    print(_("Listening on {}").format(server.server_address), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        get_cache().flush_stats()
@@ -4,12 +4,19 @@
 Contains the DudenWord class: a parser of duden.de response.
 """
 
-import copy
-import gettext
-import os
+from functools import cached_property
 
-from . import request  # pylint: disable=cyclic-import
-from .common import clear_text, recursively_extract
+import bs4
+
+from .common import (
+    NodeIndex,
+    clear_text,
+    find_all_outside,
+    find_outside,
+    recursively_extract,
+    text_without,
+)
+from .inflection import Inflector
 
 EXPORT_ATTRIBUTES = [
     "name",
@@ -32,13 +39,70 @@ EXPORT_ATTRIBUTES = [
     "examples",
 ]
 
-gettext.install("duden", os.path.join(os.path.dirname(__file__), "locale"))
+# attributes kept by FrozenDudenWord besides EXPORT_ATTRIBUTES and inflection
+FROZEN_EXTRA_ATTRIBUTES = [
+    "revision_url",
+    "pronunciation_audio_url",
+    "grammar_link",
+]
+
+# attributes which can be selected with the CLI --fields argument
+FIELD_ATTRIBUTES = EXPORT_ATTRIBUTES + ["inflection"] + FROZEN_EXTRA_ATTRIBUTES
+
+# page regions read by DudenWord: tag name -> required id (None for any)
+WORD_PAGE_PARTS = {
+    "head": None,
+    "h1": None,
+    "article": None,
+    "div": "block-numero-beforeafterblock-2",
+    "input": "cite-field",
+}
+
+
+class WordPageStrainer(bs4.SoupStrainer):
+    """
+    Restrict parsing of a word page to the regions DudenWord reads
+
+    Tags outside of `WORD_PAGE_PARTS` (navigation, scripts, footer, ...) are
+    not built at all, which saves parse time and memory.
+
+    Usage:
+
+        > soup = bs4.BeautifulSoup(html, "html.parser", parse_only=WordPageStrainer())
+    """
+
+    def __init__(self):
+        super().__init__(name=list(WORD_PAGE_PARTS))
+
+    @staticmethod
+    def keeps(name, attrs):
+        """Return True if the tag `name` with `attrs` starts a kept region"""
+        if name not in WORD_PAGE_PARTS:
+            return False
+        required_id = WORD_PAGE_PARTS[name]
+        return required_id is None or (attrs or {}).get("id") == required_id
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        """Tag filter used by beautifulsoup4 4.13 and newer"""
+        return self.keeps(name, attrs)
+
+    def search_tag(
+        self, markup_name=None, markup_attrs=None
+    ):  # pylint: disable=arguments-renamed
+        """Tag filter used by beautifulsoup4 older than 4.13"""
+        if isinstance(markup_name, str):
+            return markup_name if self.keeps(markup_name, markup_attrs) else None
+        return super().search_tag(markup_name, markup_attrs or {})
 
 
 class DudenWord:
     """
     Represents parsed word. Takes a BeautifulSoup object as a constructor argument.
 
+    The word attributes are computed from the soup on first access and then
+    remembered, so the soup must not be modified afterwards. The page nodes
+    the attributes are read from are located in a single pass over the soup.
+
     Example:
 
         > r = requests.get('https://www.duden.de/rechtschreibung/Hase')
@@ -58,21 +122,28 @@ class DudenWord:
     def __repr__(self):
         return "{} ({})".format(self.title, self.part_of_speech)
 
-    @property
+    @cached_property
+    def nodes(self):
+        """
+        Index of the page tags, used instead of searching the whole soup
+        """
+        return NodeIndex(self.soup)
+
+    @cached_property
     def title(self):
         """
         The word string with article
         """
-        return self.soup.h1.get_text().replace("\xad", "").strip()
+        return self.nodes.find("h1").get_text().replace("\xad", "").strip()
 
-    @property
+    @cached_property
     def name(self):
         """
         Word without article
         """
 
         # Find span with class "lemma__main"
-        title_element = self.soup.find("span", {"class": "lemma__main"})
+        title_element = self.nodes.find("span", class_="lemma__main")
         if title_element is not None:
             # remove soft hyphens "\xad" and return
             return clear_text(title_element.get_text())
@@ -86,35 +157,40 @@ class DudenWord:
         name, _ = self.title.split(", ", 1)
         return name
 
-    @property
+    @cached_property
     def urlname(self):
         """
         Return unique representation of the word used in duden.de urls
         """
-        return self.soup.head.find("link", rel="canonical").attrs["href"].split("/")[-1]
+        head = self.nodes.find("head")
+        for link in self.nodes.find_all("link"):
+            in_head = any(parent is head for parent in link.parents)
+            if in_head and "canonical" in link.get("rel", ()):
+                return link.attrs["href"].split("/")[-1]
+        raise AttributeError("canonical link not found")
 
-    @property
+    @cached_property
     def revision_url(self):
         """Returns url to this specific word revision"""
-        return self.soup.find("input", id="cite-field").attrs["value"]
+        return self.nodes.find("input", id="cite-field").attrs["value"]
 
-    @property
+    @cached_property
     def node_no(self):
         """Returns word node number"""
         return self.revision_url.split("/")[-3]
 
-    @property
+    @cached_property
     def revision_no(self):
         """Returns word revision number"""
         return self.revision_url.split("/")[-1]
 
-    @property
+    @cached_property
     def article(self):
         """
         Word article
         """
         # Find span with class "lemma__determiner"
-        article_element = self.soup.find("span", {"class": "lemma__determiner"})
+        article_element = self.nodes.find("span", class_="lemma__determiner")
         if article_element is not None:
             # remove soft hyphens "\xad" and return
             return clear_text(article_element.get_text())
@@ -134,7 +210,7 @@ class DudenWord:
         provided by the `key` argument
         """
         if element is None:
-            element = self.soup.article
+            element = self.nodes.find("article")
 
         dls = element.find_all("dl", class_="tuple", recursive=False)
         for dl_node in dls:
@@ -144,7 +220,7 @@ class DudenWord:
 
         return None
 
-    @property
+    @cached_property
     def part_of_speech(self):
         """
         Return the part of speech
@@ -155,7 +231,7 @@ class DudenWord:
         except AttributeError:
             return None
 
-    @property
+    @cached_property
     def frequency(self):
         """
         Return word frequency:
@@ -164,12 +240,12 @@ class DudenWord:
         5 - most frequent
         """
         try:
-            freq_bar = self.soup.find("span", class_="shaft__full")
+            freq_bar = self.nodes.find("span", class_="shaft__full")
             return len(freq_bar.text)
         except AttributeError:
             return None
 
-    @property
+    @cached_property
     def usage(self):
         """
         Return usage context
@@ -180,24 +256,24 @@ class DudenWord:
         except AttributeError:
             return None
 
-    @property
+    @cached_property
     def word_separation(self):
         """
         Return the word separated in a form of a list
         """
-        containing_div = self.soup.find("div", id="rechtschreibung")
+        containing_div = self.nodes.find("div", id="rechtschreibung")
         sep_element = self._find_tuple_dl("Worttrennung", containing_div)
         if not sep_element:
             return None
 
         return sep_element.text.split("|")
 
-    @property
+    @cached_property
     def pronunciation_audio_url(self):
         """
         Return the a url of a audio file for the word pronunciation.
         """
-        audio_link = self.soup.select("a.pronunciation-guide__sound")
+        audio_link = self.nodes.find_all("a", class_="pronunciation-guide__sound")
         if not audio_link:
             return None
 
@@ -205,89 +281,77 @@ class DudenWord:
 
         return audio_link_href
 
-    @property
+    @cached_property
     def meaning_overview(self):
         """
         Return the meaning structure, which can be string, list or a dict
         """
-        section = self.soup.find("div", id="bedeutung") or self.soup.find(
+        section = self.nodes.find("div", id="bedeutung") or self.nodes.find(
             "div", id="bedeutungen"
         )
         if section is None:
             return None
-        section = copy.copy(section)
-        section.header.extract()
+        excluded = [section.header]
 
-        # 1. remove examples
-        for dl_node in section.find_all("dl", class_="note"):
-            # pylint: disable=condition-evals-to-constant
-            if True or dl_node.dt.text == "Beispiele":
-                dl_node.extract()
+        # 1. skip examples
+        excluded.extend(find_all_outside(section, excluded, "dl", class_="note"))
 
-        # 2. remove grammar parts
-        for dl_node in section.find_all("dl", class_="tuple"):
+        # 2. skip grammar parts
+        for dl_node in find_all_outside(section, excluded, "dl", class_="tuple"):
             if dl_node.dt.text in ["Grammatik", "Gebrauch"]:
-                dl_node.extract()
+                excluded.append(dl_node)
 
-        # 3. remove pictures
-        for node in section.find_all("figure"):
-            node.extract()
+        # 3. skip pictures
+        excluded.extend(find_all_outside(section, excluded, "figure"))
 
-        return recursively_extract(section, maxdepth=2, exfun=lambda x: x.text.strip())
+        return recursively_extract(
+            section,
+            maxdepth=2,
+            exfun=lambda x: text_without(x, excluded).strip(),
+            excluded=excluded,
+        )
 
-    @property
+    @cached_property
     def synonyms(self):
         """
         Return the structure with word synonyms
         """
-        section = self.soup.find("div", id="synonyme")
+        section = self.nodes.find("div", id="synonyme")
         if section is None:
             return None
-        section = copy.copy(section)
-        if section.header:
-            section.header.extract()
-        more_nav = section.find("nav", class_="more")
-        if more_nav:
-            more_nav.extract()
+        more_nav = find_outside(section, [section.header], "nav", class_="more")
 
-        return split_synonyms(section.text.strip())
+        return split_synonyms(text_without(section, [section.header, more_nav]).strip())
 
-    @property
+    @cached_property
     def origin(self):
         """
         Return the word origin
         """
-        section = self.soup.find("div", id="herkunft")
+        section = self.nodes.find("div", id="herkunft")
         if section is None:
             return None
 
-        section = copy.copy(section)
-        if section.header:
-            section.header.extract()
-        return section.text.strip()
+        return text_without(section, [section.header]).strip()
 
-    @property
+    @cached_property
     def grammar_overview(self):
         """
         Return short grammar overview
         """
-        section = self.soup.find("div", id="grammatik")
+        section = self.nodes.find("div", id="grammatik")
         if section is None:
             return None
 
-        section = copy.copy(section)
-        if section.header:
-            section.header.extract()
-        if section.nav:
-            section.nav.extract()
-        return section.text.strip() or None
+        nav = find_outside(section, [section.header], "nav")
+        return text_without(section, [section.header, nav]).strip() or None
 
-    @property
+    @cached_property
     def compounds(self):
         """
         Return the typical word compounds
         """
-        section = self.soup.find("div", id="kontext")
+        section = self.nodes.find("div", id="kontext")
         if not section:
             return None
 
@@ -334,18 +398,22 @@ class DudenWord:
         takes a few seconds to return the result.
         """
         if self._inflection is None:
+            # duden.request imports this module
+            # pylint: disable=import-outside-toplevel,cyclic-import
+            from . import request
+
             self._inflection = (
                 request.grammar(self.grammar_link) if self.grammar_link else None
             )
 
         return self._inflection
 
-    @property
+    @cached_property
     def grammar_link(self):
         """
         Relative url for grammar table page, e.g. "/deklination/substantive/Petersilie"
         """
-        section = self.soup.find("div", id="grammatik")
+        section = self.nodes.find("div", id="grammatik")
         if not section:
             return None
 
@@ -365,25 +433,20 @@ class DudenWord:
         """Whether word provides conjugation data"""
         return self.grammar_link.startswith("/konjugation")
 
-    @property
+    @cached_property
     def examples(self):
         """Returns usage examples."""
         # load html with meaning section
-        section = self.soup.find("div", id="bedeutung") or self.soup.find(
+        section = self.nodes.find("div", id="bedeutung") or self.nodes.find(
             "div", id="bedeutungen"
         )
         if section is None:
             return None
-        section = copy.copy(section)
-        section.header.extract()
 
         # find example section
-        dl_nodes = []
+        dl_nodes = find_all_outside(section, [section.header], "dl", class_="note")
         dl_nodes_text = []
 
-        for dl_node in section.find_all("dl", class_="note"):
-            dl_nodes.append(dl_node)
-
         def remove_beispiele_header(text: str):
             """Remove 'Beispiel(e)' from the text.'"""
             text = text.strip()
@@ -415,7 +478,28 @@ class DudenWord:
         worddict["inflection"] = self.inflection and self.inflection.data
         return worddict
 
-    @property
+    def freeze(self, inflection=True):
+        """
+        Return an immutable FrozenDudenWord holding the word's attributes
+
+        The record does not reference the parsed page, so it takes much less
+        memory than the DudenWord and can be pickled.
+
+        Args:
+            inflection (bool): load the inflection (which may perform a network
+                request); if False, the inflection is kept only if it was
+                already loaded
+        """
+        attributes = {
+            attribute: getattr(self, attribute, None)
+            for attribute in EXPORT_ATTRIBUTES + FROZEN_EXTRA_ATTRIBUTES
+        }
+        inflector = self.inflection if inflection else self._inflection
+        # a copy of the inflection tables, without the parsed grammar page
+        attributes["inflection"] = inflector and Inflector.from_data(inflector.data)
+        return FrozenDudenWord(**attributes)
+
+    @cached_property
     def before_after_structure(self):
         """
         Parsed "Blätter section"
@@ -437,7 +521,7 @@ class DudenWord:
               ('Lauferei', 'Lauferei')]}
         """
         result = {}
-        section = self.soup.find("div", id="block-numero-beforeafterblock-2")
+        section = self.nodes.find("div", id="block-numero-beforeafterblock-2")
         for group in section.find_all("nav", class_="hookup__group"):
             h3title = group.h3.text
             result[h3title] = []
@@ -446,35 +530,35 @@ class DudenWord:
                 result[h3title].append((clear_text(item.text), link))
         return result
 
-    @property
+    @cached_property
     def words_before(self):
         """Returns 5 words before this one in duden database"""
         return [name for name, _ in self.before_after_structure["Im Alphabet davor"]]
 
-    @property
+    @cached_property
     def words_after(self):
         """Returns 5 words after this one in duden database"""
         return [name for name, _ in self.before_after_structure["Im Alphabet danach"]]
 
-    @property
+    @cached_property
     def phonetic(self):
         """
         Returns pronunciation of the word in phonetic notation.
         See: https://en.wikipedia.org/wiki/International_Phonetic_Alphabet
         """
-        ipa = self.soup.find("span", {"class": "ipa"})
+        ipa = self.nodes.find("span", class_="ipa")
         if ipa is not None:
             return ipa.get_text()
 
         return None
 
-    @property
+    @cached_property
     def alternative_spellings(self):
         """
         Returns alternate spellings
         """
-        alternative_spellings = self.soup.find_all(
-            "span", {"class": "lemma__alt-spelling"}
+        alternative_spellings = self.nodes.find_all(
+            "span", class_="lemma__alt-spelling"
         )
         if alternative_spellings is None:
             return None
@@ -482,6 +566,129 @@ class DudenWord:
         return [spelling.get_text() for spelling in alternative_spellings]
 
 
+class FrozenDudenWord:
+    """
+    Immutable, detached record of a parsed word
+
+    Holds the already extracted word attributes (`EXPORT_ATTRIBUTES`,
+    `FROZEN_EXTRA_ATTRIBUTES` and the inflection) instead of the parsed page.
+    Created by `DudenWord.freeze`, `duden.get(word, detached=True)` or from
+    an exported dictionary:
+
+        > word = duden.get("Hase", detached=True)
+        > FrozenDudenWord.from_export(word.export())
+        Hase, der (Substantiv, maskulin)
+    """
+
+    __slots__ = tuple(EXPORT_ATTRIBUTES + FROZEN_EXTRA_ATTRIBUTES) + ("inflection",)
+
+    # the slot attributes, declared for static analysis
+    name: str
+    urlname: str
+    title: str
+    article: str
+    part_of_speech: str
+    usage: str
+    frequency: int
+    word_separation: list
+    meaning_overview: object
+    origin: str
+    grammar_overview: str
+    compounds: dict
+    synonyms: object
+    words_before: list
+    words_after: list
+    phonetic: str
+    alternative_spellings: list
+    examples: str
+    revision_url: str
+    pronunciation_audio_url: str
+    grammar_link: str
+    inflection: Inflector
+
+    def __init__(self, **attributes):
+        """
+        Args:
+            attributes: values of the record attributes, missing ones are None;
+                inflection is an Inflector instance
+        """
+        unknown = set(attributes) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"Unknown word attributes: {', '.join(sorted(unknown))}")
+        for attribute in self.__slots__:
+            object.__setattr__(self, attribute, attributes.get(attribute))
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, attribute):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        return "{} ({})".format(self.title, self.part_of_speech)
+
+    def __reduce__(self):
+        # pickle plain values only, the inflection as its raw data
+        values = [getattr(self, attribute) for attribute in self.__slots__[:-1]]
+        values.append(self.inflection and self.inflection.data)
+        return (self.__class__._from_values, (tuple(values),))
+
+    @classmethod
+    def _from_values(cls, values):
+        """Construct the record from attribute values in __slots__ order"""
+        attributes = dict(zip(cls.__slots__, values))
+        attributes["inflection"] = attributes["inflection"] and Inflector.from_data(
+            attributes["inflection"]
+        )
+        return cls(**attributes)
+
+    @classmethod
+    def from_export(cls, worddict):
+        """
+        Construct the record from a `DudenWord.export()` dictionary
+
+        Attributes not present in the dictionary are set to None.
+        """
+        attributes = {
+            attribute: worddict.get(attribute)
+            for attribute in cls.__slots__
+            if attribute != "inflection"
+        }
+        if worddict.get("inflection"):
+            attributes["inflection"] = Inflector.from_data(worddict["inflection"])
+        return cls(**attributes)
+
+    @property
+    def node_no(self):
+        """Returns word node number"""
+        return self.revision_url.split("/")[-3]
+
+    @property
+    def revision_no(self):
+        """Returns word revision number"""
+        return self.revision_url.split("/")[-1]
+
+    @property
+    def can_decline(self):
+        """Whether word provides declination data"""
+        return self.grammar_link.startswith("/deklination")
+
+    @property
+    def can_conjugate(self):
+        """Whether word provides conjugation data"""
+        return self.grammar_link.startswith("/konjugation")
+
+    def export(self):
+        """
+        Export word's attributes as a dictionary, same as `DudenWord.export`
+        """
+        worddict = {
+            attribute: getattr(self, attribute) for attribute in EXPORT_ATTRIBUTES
+        }
+        worddict["inflection"] = self.inflection and self.inflection.data
+        return worddict
+
+
 def split_synonyms(text):
     """
     Properly split strings like
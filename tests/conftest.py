@@ -0,0 +1,51 @@
+"""Fixtures shared by the tests: a temporary cache and a fake session"""
+
+import pytest
+from test_request import FakeSession, read_test_page
+
+from duden import cache, request
+
+SEARCH_RESULT = '<h2 class="vignette__title"><a href="/rechtschreibung/{}">{}</a></h2>'
+
+# (url name, title) of the results of the search for "Hase"
+HASE_SEARCH_RESULTS = [
+    ("Hase", "Ha&shy;se, der"),
+    ("Hase_Tier", "Hase"),
+    ("Hasenbraten", "Hasenbraten"),
+]
+
+
+def search_page(results):
+    """Return html of a search page listing the (url name, title) results"""
+    links = "\n".join(SEARCH_RESULT.format(*result) for result in results)
+    return f"<!DOCTYPE html><html><body>\n{links}\n</body></html>"
+
+
+@pytest.fixture(name="tmp_cache")
+def fixture_tmp_cache(monkeypatch, tmp_path):
+    """Use a file cache in a temp dir"""
+    backend = cache.FileCache(tmp_path / "cache")
+    monkeypatch.setattr(cache, "_cache", backend)
+    return backend
+
+
+@pytest.fixture(name="session")
+def fixture_session(tmp_cache):  # pylint: disable=unused-argument
+    """
+    Fake session serving the Hase word and grammar pages and a search page
+    listing only the first Hase, with the cache in a temp dir
+    """
+    session = FakeSession(
+        {
+            request.URL_FORM.format(word="Hase"): read_test_page("Hase.html"),
+            request.SEARCH_URL_FORM.format(word="Hase"): search_page(
+                HASE_SEARCH_RESULTS[:1]
+            ),
+            request.GRAMMAR_BASE.format(
+                urlpart="/deklination/substantive/Hase"
+            ): read_test_page("grammar/Hase.html"),
+        }
+    )
+    request.set_session(session)
+    yield session
+    request.set_session(None)
@@ -0,0 +1,235 @@
+"""Test the asyncio client"""
+
+import asyncio
+import threading
+
+import pytest
+from test_request import read_test_page
+
+from duden import request
+
+aio = pytest.importorskip("duden.aio")
+
+
+class FakeAsyncResponse:
+    """Minimal stand-in for aiohttp.ClientResponse"""
+
+    def __init__(self, text, session):
+        self._text = text
+        self._session = session
+        self.status = 404 if text is None else 200
+        self.headers = {}
+
+    async def __aenter__(self):
+        self._session.active += 1
+        self._session.max_active = max(self._session.max_active, self._session.active)
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._session.active -= 1
+
+    def raise_for_status(self):
+        """No error statuses are simulated"""
+
+    async def text(self):
+        """Return the response text"""
+        return self._text
+
+
+class FakeAsyncSession:  # pylint: disable=too-few-public-methods
+    """
+    Session which serves pages from a dict, records requested urls and the
+    maximal number of concurrent requests
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url, headers=None):  # pylint: disable=unused-argument
+        """Return the stored page or 404"""
+        self.urls.append(url)
+        return FakeAsyncResponse(self.pages.get(url), self)
+
+
+def run_client(pages, coroutine_function, max_concurrency=2):
+    """Run the coroutine function with a client serving the pages"""
+    session = FakeAsyncSession(pages)
+
+    async def run():
+        async with aio.AsyncClient(session, max_concurrency=max_concurrency) as client:
+            return await coroutine_function(client)
+
+    return asyncio.run(run()), session
+
+
+def test_async_get_and_search():
+    """The async client parses pages with the shared parsers"""
+    search_page = (
+        '<h2 class="vignette__title"><a href="/rechtschreibung/Hase">Hase</a></h2>'
+        '<h2 class="vignette__title"><a href="/rechtschreibung/Hasen">Hasen</a></h2>'
+    )
+    pages = {
+        request.SEARCH_URL_FORM.format(word="Hase"): search_page,
+        request.URL_FORM.format(word="Hase"): "<html><h1>Hase, der</h1></html>",
+    }
+    client = aio.AsyncClient(session=FakeAsyncSession(pages), max_concurrency=2)
+
+    async def run():
+        words = await client.search("Hase", cache=False)
+        missing = await client.get("Unbekannt", cache=False)
+        await client.close()
+        return words, missing
+
+    words, missing = asyncio.run(run())
+    assert [word.title for word in words] == ["Hase, der"]
+    assert missing is None
+
+
+def test_concurrency_limit():
+    """No more than max_concurrency requests are running at once"""
+    pages = {
+        request.URL_FORM.format(word=f"Wort{i}"): f"<html><h1>Wort{i}</h1></html>"
+        for i in range(6)
+    }
+
+    async def get_all(client):
+        return await asyncio.gather(
+            *(client.get(f"Wort{i}", cache=False) for i in range(6))
+        )
+
+    words, session = run_client(pages, get_all, max_concurrency=2)
+    assert [word.title for word in words] == [f"Wort{i}" for i in range(6)]
+    assert session.max_active == 2
+
+
+def test_cache_hits(tmp_cache):  # pylint: disable=unused-argument
+    """Cached pages and searches are loaded without requests"""
+    pages = {
+        request.URL_FORM.format(word="Hase"): read_test_page("Hase.html"),
+        request.SEARCH_URL_FORM.format(
+            word="Hase"
+        ): '<h2 class="vignette__title"><a href="/rechtschreibung/Hase">Hase</a></h2>',
+    }
+
+    async def search(client):
+        return await client.search("Hase")
+
+    words, session = run_client(pages, search)
+    assert [word.title for word in words] == ["Hase, der"]
+    assert len(session.urls) == 2
+
+    words, session = run_client(pages, search)
+    assert [word.title for word in words] == ["Hase, der"]
+    assert not session.urls
+
+
+def test_offline_first(tmp_cache):  # pylint: disable=unused-argument
+    """Words loaded before are found in the lemma index"""
+    pages = {request.URL_FORM.format(word="Hase"): read_test_page("Hase.html")}
+
+    async def get_and_search(client):
+        await client.get("Hase")
+        return await client.search("Hase", return_words=False, offline_first=True)
+
+    urlnames, session = run_client(pages, get_and_search)
+    assert urlnames == ["Hase"]
+    assert session.urls == [request.URL_FORM.format(word="Hase")]
+
+
+def test_missing_pages(tmp_cache):  # pylint: disable=unused-argument
+    """Missing search and grammar pages are no errors"""
+
+    async def search_and_grammar(client):
+        return (
+            await client.search("Unbekannt"),
+            await client.grammar("/konjugation/unbekannt"),
+        )
+
+    (words, inflector), _ = run_client({}, search_and_grammar)
+    assert words == []
+    assert inflector is None
+
+
+def test_blocking_work_in_threads(
+    tmp_cache, monkeypatch
+):  # pylint: disable=unused-argument
+    """Parsing runs outside of the event loop thread"""
+    pages = {request.URL_FORM.format(word="Hase"): read_test_page("Hase.html")}
+    threads = []
+    parse_word_page = request.parse_word_page
+
+    def recording_parse(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return parse_word_page(*args, **kwargs)
+
+    monkeypatch.setattr(request, "parse_word_page", recording_parse)
+
+    async def get(client):
+        return threading.current_thread(), await client.get("Hase")
+
+    (loop_thread, word), _ = run_client(pages, get)
+    assert word.title == "Hase, der"
+    assert threads and loop_thread not in threads
+
+
+def test_inflection_without_grammar_page(
+    tmp_cache, monkeypatch
+):  # pylint: disable=unused-argument
+    """A missing grammar page gives no inflection, without blocking requests"""
+    pages = {request.URL_FORM.format(word="Hase"): read_test_page("Hase.html")}
+
+    def blocking_grammar(*args, **kwargs):
+        raise AssertionError("blocking request in async code")
+
+    monkeypatch.setattr(request, "grammar", blocking_grammar)
+
+    async def inflection(client):
+        word = await client.get("Hase")
+        return word, await client.inflection(word)
+
+    (word, inflector), session = run_client(pages, inflection)
+    assert word.grammar_link
+    assert inflector is None
+    assert session.urls[-1] == request.GRAMMAR_BASE.format(urlpart=word.grammar_link)
+
+
+def test_client_created_outside_loop():
+    """The semaphore is created in the loop running the requests"""
+    pages = {
+        request.URL_FORM.format(word=f"Wort{i}"): f"<html><h1>Wort{i}</h1></html>"
+        for i in range(3)
+    }
+    session = FakeAsyncSession(pages)
+    client = aio.AsyncClient(session=session, max_concurrency=1)
+
+    async def get_all():
+        return await asyncio.gather(
+            *(client.get(f"Wort{i}", cache=False) for i in range(3))
+        )
+
+    asyncio.run(get_all())
+    assert session.max_active == 1
+
+
+def test_module_functions_share_limit(monkeypatch):
+    """Concurrent calls of the module-level functions share the limit"""
+    pages = {
+        request.URL_FORM.format(word=f"Wort{i}"): f"<html><h1>Wort{i}</h1></html>"
+        for i in range(6)
+    }
+    session = FakeAsyncSession(pages)
+    monkeypatch.setattr(aio.AsyncClient, "session", property(lambda self: session))
+    monkeypatch.setattr(request, "DEFAULT_MAX_WORKERS", 2)
+
+    async def get_all():
+        return await asyncio.gather(
+            *(aio.get(f"Wort{i}", cache=False) for i in range(6))
+        )
+
+    words = asyncio.run(get_all())
+    assert [word.title for word in words] == [f"Wort{i}" for i in range(6)]
+    assert session.max_active == 2
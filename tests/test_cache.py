@@ -0,0 +1,154 @@
+"""Test cache backends"""
+
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from duden import cache, request
+
+
+@pytest.fixture(name="backend", params=["file", "sqlite"])
+def fixture_backend(request, tmp_path):  # pylint: disable=redefined-outer-name
+    """Create every cache backend in a temporary directory"""
+    if request.param == "file":
+        return cache.FileCache(tmp_path)
+    return cache.SQLiteCache(tmp_path / "cache.sqlite")
+
+
+def test_roundtrip(backend):
+    """Stored text is returned unchanged"""
+    assert backend.get("search-", "Hase") is None
+    backend.set("search-", "Hase", "<html>Häschen</html>")
+    backend.set("", "Hase", "<html>Hase</html>")
+    assert backend.get("search-", "Hase") == "<html>Häschen</html>"
+    assert backend.get("", "Hase") == "<html>Hase</html>"
+
+    backend.set("", "Hase", "<html>neu</html>")
+    assert backend.get("", "Hase") == "<html>neu</html>"
+
+
+def test_concurrent_writers(backend):
+    """Many threads can read and write at the same time"""
+
+    def write_and_read(number):
+        key = "Wort{}".format(number % 10)
+        backend.set("", key, key)
+        return backend.get("", key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(write_and_read, range(100)))
+    assert results == ["Wort{}".format(number % 10) for number in range(100)]
+
+
+def test_request_uses_selected_backend(backend):
+    """The decorated request functions read from the configured backend"""
+    backend.set("", "Hase", "<html>cached</html>")
+    cache.set_cache(backend)
+    try:
+        assert request.request_word("Hase") == "<html>cached</html>"
+    finally:
+        cache.set_cache(None)
+
+
+def test_prune_lru(backend):
+    """Least recently used entries are evicted first"""
+    for number in range(5):
+        backend.set("", "Wort{}".format(number), "x" * 100)
+    backend.get("", "Wort0")
+    backend.flush_stats()
+
+    assert backend.prune(max_entries=3, eviction="lru") == 2
+    assert sorted(entry.key for entry in backend.entries()) == [
+        "Wort0",
+        "Wort3",
+        "Wort4",
+    ]
+
+
+@pytest.mark.parametrize("backend_class", [cache.FileCache, cache.SQLiteCache])
+def test_limits_on_first_write(backend_class, tmp_path):
+    """The limits are enforced by the first write of a new process"""
+    path = tmp_path / "cache.sqlite" if backend_class is cache.SQLiteCache else tmp_path
+    backend = backend_class(path)
+    for number in range(5):
+        backend.set("", "Wort{}".format(number), "x")
+
+    # a short CLI run with a limited cache
+    backend = backend_class(path, max_entries=3)
+    backend.set("", "Neu", "x")
+    assert len(backend.entries()) == 3
+    assert backend.get("", "Neu") == "x"
+
+
+def test_stats_and_clear(backend):
+    """Statistics count entries and hits per prefix"""
+    backend.set("", "Hase", "Hase")
+    backend.set("grammar-", "/deklination/substantive/Hase", "Hasen")
+    backend.get("", "Hase")
+    backend.get("search-", "Hase")
+
+    stats = backend.stats()
+    assert stats["entries"] == {"": 1, "grammar-": 1}
+    assert stats["hits"][""] == 1
+    assert stats["misses"]["search-"] == 1
+
+    backend.clear()
+    assert not backend.entries()
+    assert not backend.stats()["hits"]
+
+
+def test_verify(tmp_path):
+    """Broken files are reported and optionally removed"""
+    backend = cache.FileCache(tmp_path)
+    backend.set("", "Hase", "Hase")
+    (tmp_path / "Kaputt.gz").write_bytes(b"not gzip")
+
+    assert backend.verify() == [("", "Kaputt")]
+    assert backend.verify(fix=True) == [("", "Kaputt")]
+    assert not backend.verify()
+
+
+def test_validators_roundtrip(backend):
+    """Validators are stored alongside the content"""
+    backend.set("", "Hase", "Hase", etag='"abc"', last_modified="Mon, 01 Jan 2024")
+    entry = backend.get_entry("", "Hase")
+    assert entry.content == "Hase"
+    assert (entry.etag, entry.last_modified, entry.max_age) == (
+        '"abc"',
+        "Mon, 01 Jan 2024",
+        None,
+    )
+    assert not backend.is_expired(entry)
+    backend.revalidate = True
+    assert backend.is_expired(entry)
+
+
+def test_file_without_validators(tmp_path):
+    """Cache files written by older versions are still readable"""
+    with gzip.open(str(tmp_path / "Hase.gz"), "wt", encoding="utf8") as file:
+        file.write("<html>Hase</html>")
+    entry = cache.FileCache(tmp_path).get_entry("", "Hase")
+    assert entry.content == "<html>Hase</html>"
+    assert entry.etag is None
+
+
+def test_lru_cache():
+    """LRU cache evicts the least recently used items and counts hits"""
+    lru = cache.LRUCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert (lru.get("a"), lru.get("c")) == (1, 3)
+    assert (lru.hits, lru.misses) == (3, 1)
+
+    assert lru.get("a", max_age=-1) is None
+    assert len(lru) == 1
+
+    lru.resize(1)
+    assert len(lru) == 1
+    lru.resize(0)
+    lru.set("d", 4)
+    assert lru.get("d") is None
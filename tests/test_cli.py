@@ -0,0 +1,169 @@
+"""Test the CLI output of several word attributes"""
+
+import glob
+import io
+import json
+
+import pytest
+import yaml
+
+from duden import cli, request
+from duden.display import dump_yaml, serialize, tsv_value
+
+
+def test_fields_json(session, capsys):
+    """All fields are printed from one page download"""
+    cli.run(
+        [
+            "Hase",
+            "--offline-first",
+            "--fields",
+            "title,article,frequency,word-separation",
+        ]
+    )
+    assert json.loads(capsys.readouterr().out) == {
+        "title": "Hase, der",
+        "article": "der",
+        "frequency": 3,
+        "word_separation": ["Ha", "se"],
+    }
+    assert session.urls.count(request.URL_FORM.format(word="Hase")) == 1
+
+
+def test_fields_jsonl_and_tsv(session, capsys):  # pylint: disable=unused-argument
+    """The jsonl output takes one line, tsv one value per field"""
+    cli.run(["Hase", "--fields", "name,usage,word_separation", "--format", "jsonl"])
+    output = capsys.readouterr().out
+    assert output.count("\n") == 1
+    assert json.loads(output)["name"] == "Hase"
+
+    cli.run(["Hase", "--fields", "name,article,word_separation", "--format", "tsv"])
+    assert capsys.readouterr().out == 'Hase\tder\t["Ha", "se"]\n'
+
+
+def test_format_without_fields(session, capsys):  # pylint: disable=unused-argument
+    """Without --fields, the exported attributes are printed"""
+    cli.run(["Hase", "--format", "json"])
+    record = json.loads(capsys.readouterr().out)
+    assert "inflection" not in record
+    assert record["urlname"] == "Hase"
+
+
+def test_unknown_field(capsys):
+    """Unknown fields are reported before looking the word up"""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["Hase", "--fields", "title,colour"])
+    assert "Unknown field: colour" in capsys.readouterr().err
+
+
+def test_tsv_escaping():
+    """Values never break the tab separated line"""
+    assert tsv_value(None) == ""
+    assert tsv_value(3) == "3"
+    assert tsv_value("a\tb\nc\\") == "a\\tb\\nc\\\\"
+    assert serialize({"a": "x", "b": None, "c": {"k": 1}}, "tsv") == 'x\t\t{"k": 1}'
+    with pytest.raises(ValueError):
+        serialize({}, "xml")
+
+
+def test_batch(session, capsys, tmp_path):  # pylint: disable=unused-argument
+    """Every word of the batch is printed as one json line, failures too"""
+    batch = tmp_path / "words.txt"
+    batch.write_text("Hase\n\nUnbekannt\n", encoding="utf8")
+
+    with pytest.raises(SystemExit) as exit_:
+        cli.run(["--batch", str(batch), "--fields", "name,article"])
+    assert exit_.value.code == 1
+
+    output = capsys.readouterr()
+    records = sorted(map(json.loads, output.out.splitlines()), key=str)
+    assert records == [
+        {"query": "Hase", "name": "Hase", "article": "der"},
+        {"query": "Unbekannt", "error": "Word 'Unbekannt' not found"},
+    ]
+    assert output.err == "2 words, 1 failed\n"
+
+
+def test_batch_stdin(session, capsys, monkeypatch):  # pylint: disable=unused-argument
+    """Words are read from the standard input, exported with the inflection"""
+    monkeypatch.setattr("sys.stdin", io.StringIO("Hase\n"))
+
+    with pytest.raises(SystemExit) as exit_:
+        cli.run(["--batch", "-"])
+    assert exit_.value.code == 0
+
+    record = json.loads(capsys.readouterr().out)
+    assert record["query"] == "Hase"
+    assert record["title"] == "Hase, der"
+    assert record["inflection"]["Deklination"]["Singular"]["Nominativ"] == "der Hase"
+
+
+def test_batch_arguments(capsys):
+    """The batch replaces the word and prints only json lines"""
+    for argv in [[], ["Hase", "--batch", "-"], ["--batch", "-", "--format", "yaml"]]:
+        with pytest.raises(SystemExit):
+            cli.parse_args(argv)
+    capsys.readouterr()
+
+
+def test_forwarding():
+    """Batches are not forwarded to the server, even when abbreviated"""
+    assert cli.is_forwarded(["Hase", "--title"])
+    assert cli.is_forwarded(["Hase", "--export", "--format", "json"])
+    assert cli.is_forwarded(["cache", "stats"])
+    for argv in [
+        ["--batch", "-"],
+        ["--batch=words.txt"],
+        ["--bat", "-"],
+    ]:
+        assert not cli.is_forwarded(argv), argv
+
+
+def test_msgpack_not_forwarded():
+    """The binary msgpack output is printed locally"""
+    pytest.importorskip("msgpack")
+    assert not cli.is_forwarded(["Hase", "--export", "--format", "msgpack"])
+    assert not cli.is_forwarded(["Hase", "--export", "--form=msgpack"])
+
+
+@pytest.mark.parametrize(
+    "path",
+    glob.glob("tests/test_data/*.yaml") + glob.glob("tests/test_data/html/**/*.yaml"),
+)
+def test_yaml_roundtrip(path):
+    """The yaml dumper reproduces the test data files byte for byte"""
+    with open(path, encoding="utf8") as file:
+        data = file.read()
+    assert dump_yaml(yaml.safe_load(data)) == data
+
+
+def test_yaml_dumpers(session):  # pylint: disable=unused-argument
+    """The LibYAML dumper writes the same output as the pure-Python one"""
+    export = request.get("Hase", with_inflection=True).export()
+    expected = yaml.dump(export, sort_keys=False, allow_unicode=True)
+    assert dump_yaml(export) == expected
+    assert dump_yaml(export["inflection"]) == yaml.dump(
+        export["inflection"], sort_keys=False, allow_unicode=True
+    )
+
+
+def test_export_formats(session, capsys):  # pylint: disable=unused-argument
+    """The export and the inflection can be printed as json"""
+    cli.run(["Hase", "--export"])
+    exported = yaml.safe_load(capsys.readouterr().out)
+
+    cli.run(["Hase", "--export", "--format", "json"])
+    assert json.loads(capsys.readouterr().out) == exported
+
+    cli.run(["Hase", "--inflect", "--format", "jsonl"])
+    output = capsys.readouterr().out
+    assert output.count("\n") == 1
+    assert json.loads(output) == exported["inflection"]
+
+
+def test_msgpack(session, capsysbinary):  # pylint: disable=unused-argument
+    """The msgpack output decodes to the exported attributes"""
+    msgpack = pytest.importorskip("msgpack")
+    cli.run(["Hase", "--export", "--format", "msgpack"])
+    exported = msgpack.unpackb(capsysbinary.readouterr().out)
+    assert exported["title"] == "Hase, der"
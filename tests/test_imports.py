@@ -0,0 +1,107 @@
+"""Test that importing duden and starting the CLI stay fast"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# dependencies which must not be imported before a word is looked up
+HEAVY_MODULES = {
+    "bs4",
+    "requests",
+    "urllib3",
+    "yaml",
+    "crayons",
+    "lxml",
+    "xdg",
+    "sqlite3",
+}
+
+
+def imported_packages(code, *args):
+    """
+    Run python code and return set of top level package names of the modules
+    imported at its end (or when it exits)
+    """
+    report = (
+        "import atexit, json, sys; "
+        "atexit.register(lambda: print(json.dumps(sorted(sys.modules)), "
+        "file=sys.stderr))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", report + code, *args],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, DUDEN_SOCKET=""),
+        check=False,
+    )
+    modules = json.loads(result.stderr.splitlines()[-1])
+    return {name.split(".")[0] for name in modules}
+
+
+def test_import_duden():
+    """Importing duden and the CLI module does not import the heavy dependencies"""
+    packages = imported_packages("import duden.cli")
+    assert "duden" in packages
+    assert not packages & HEAVY_MODULES
+
+
+def import_time(code, module):
+    """
+    Run python code with `-X importtime` and return the cumulative import
+    time of the module in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, DUDEN_SOCKET=""),
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = line[len("import time:") :].split("|")
+        if line.startswith("import time:") and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_import_time():
+    """Importing the CLI module takes less time than the heavy dependencies"""
+    # the heavy imports are measured in the same environment, so that the
+    # check does not depend on the speed of the machine
+    heavy_time = import_time("import bs4", "bs4") + import_time(
+        "import requests", "requests"
+    )
+    assert import_time("import duden.cli", "duden.cli") < heavy_time / 2
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["--version"], ["--unknown-option"]])
+def test_cli_startup(argv):
+    """The CLI handles these arguments before importing the heavy dependencies"""
+    packages = imported_packages("from duden.cli import main; main()", *argv)
+    assert "duden" in packages
+    assert not packages & HEAVY_MODULES
+
+
+@pytest.mark.parametrize("module", ["word", "request", "index", "cli"])
+def test_import_submodule(module):
+    """Every submodule can be imported first"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import duden.{module}"], check=False
+    )
+    assert result.returncode == 0
+
+
+def test_lazy_attributes():
+    """Functions, enums and submodules are available after `import duden`"""
+    code = (
+        "import duden; "
+        "assert duden.get is duden.request.get; "
+        "assert duden.Case.DATIVE.value == 'Dativ'; "
+        "assert duden.cache.get_cache; "
+        "assert 'lemmatize' in dir(duden)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], check=False)
+    assert result.returncode == 0
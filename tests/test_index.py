@@ -0,0 +1,322 @@
+"""Test the local index of known words"""
+
+import os
+import sqlite3
+import time
+
+import pytest
+import yaml
+from conftest import HASE_SEARCH_RESULTS, search_page
+from test_request import read_test_page
+
+from duden import cache, cli, request
+from duden.index import Lemma, LemmaIndex, edit_distance, form_words
+from duden.inflection import Inflector
+from duden.word import FrozenDudenWord
+
+
+@pytest.fixture(name="session")
+def fixture_session(session):
+    """The shared fake session, with all Hase results on the search page"""
+    session.pages[request.SEARCH_URL_FORM.format(word="Hase")] = search_page(
+        HASE_SEARCH_RESULTS
+    )
+    return session
+
+
+def test_add_and_find(tmp_path):
+    """Words are found by name and alternative spelling, frequent ones first"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    word = request.parse_word_page(read_test_page("Hase.html"))
+    assert index.add_word(word)
+    assert index.add_word(word.freeze(inflection=False))
+    assert index.find("Hase") == ["Hase"]
+    assert index.find("Haas") == ["Hase"]
+    assert index.find("Unbekannt") == []
+
+    index.add_word(
+        type("Word", (), {"urlname": "Hase_Tier", "name": "Hase", "frequency": 1})()
+    )
+    assert index.find("Hase") == ["Hase", "Hase_Tier"]
+    assert index.counts() == {"lemmas": 2, "names": 3, "queries": 0, "forms": 0}
+
+
+def test_add_search(tmp_path):
+    """Search results are stored in order, empty results are not stored"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    assert index.search("Hase") is None
+    assert not index.add_search("Hase", [])
+    assert index.search("Hase") is None
+
+    index.add_search("Hase", ["Hase_Tier", "Hase"])
+    assert index.search("Hase") == ["Hase_Tier", "Hase"]
+    index.add_search("Hase", ["Hase"])
+    assert index.search("Hase") == ["Hase"]
+
+    index.clear()
+    assert index.search("Hase") is None
+
+
+def test_repeated_search_uses_index(session):
+    """Searching again for a word does not read the search page"""
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    cache.get_cache().clear()
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    assert len(session.urls) == 1
+
+    # not used without cache, for non-exact searches and when revalidating
+    request.search("Hase", return_words=False, cache=False)
+    request.search("Hase", return_words=False, exact=False)
+    assert len(session.urls) == 3
+
+
+def test_search_expires(session):
+    """Stored search results expire together with the search page"""
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    assert len(session.urls) == 1
+
+    # the search page and the search results become older than the max age
+    backend = cache.get_cache()
+    fetched_at = time.time() - backend.max_age - 1
+    os.utime(backend.path("search-", "Hase"), (fetched_at, fetched_at))
+    backend.index.connection.execute("UPDATE queries SET fetched_at = ?", (fetched_at,))
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    assert len(session.urls) == 2
+    assert request.search("Hase", return_words=False) == ["Hase", "Hase_Tier"]
+    assert len(session.urls) == 2
+
+
+def test_old_index_searches_expire(tmp_path):
+    """Searches stored by an index without fetch times are expired"""
+    connection = sqlite3.connect(str(tmp_path / "index.sqlite"))
+    connection.executescript(
+        "CREATE TABLE queries (query TEXT NOT NULL, position INTEGER NOT NULL, "
+        "urlname TEXT NOT NULL, PRIMARY KEY (query, position)) WITHOUT ROWID;"
+        "INSERT INTO queries VALUES ('Hase', 0, 'Hase');"
+    )
+    connection.commit()
+    connection.close()
+
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    assert index.search("Hase") == ["Hase"]
+    assert index.search("Hase", max_age=3600) is None
+
+
+def test_unchanged_word_not_written(tmp_path, monkeypatch):
+    """Adding an indexed word again does not write the database"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    word = request.parse_word_page(read_test_page("Hase.html"))
+    assert index.add_word(word)
+
+    writes = []
+    write = index._write  # pylint: disable=protected-access
+    monkeypatch.setattr(
+        index, "_write", lambda statements: writes.append(1) or write(statements)
+    )
+    assert index.add_word(word.freeze(inflection=False))
+    assert not writes
+
+    frozen = word.freeze(inflection=False).export()
+    frozen["frequency"] = 5
+    assert index.add_word(FrozenDudenWord.from_export(frozen))
+    assert writes == [1]
+
+
+def test_offline_first(session):
+    """Words loaded before are found by name without any request"""
+    request.get("Hase")
+    assert request.search("Hase", return_words=False, offline_first=True) == ["Hase"]
+    assert request.search("Hase", offline_first=True)[0].title == "Hase, der"
+    assert session.urls == [request.URL_FORM.format(word="Hase")]
+
+
+def test_rebuild(session, capsys):
+    """The index is rebuilt from the cached word pages"""
+    request.get("Hase")
+    backend = cache.get_cache()
+    backend.index.clear()
+    assert backend.index.find("Hase") == []
+
+    assert cli.cache_main(["index"]) == 0
+    assert "Indexed 1 words" in capsys.readouterr().out
+    assert backend.index.find("Hase") == ["Hase"]
+    assert len(session.urls) == 1
+
+
+def test_form_words():
+    """Articles and auxiliary verbs are dropped from multi-word forms"""
+    assert form_words("lief") == {"lief"}
+    assert form_words("den Hasen") == {"den Hasen", "Hasen"}
+    assert form_words("bin gelaufen") == {"bin gelaufen", "gelaufen"}
+    assert form_words("lauf, laufe!") == {"lauf", "laufe"}
+    assert form_words("lauf (dich/dir), laufe (dich/dir)!") == {"lauf", "laufe"}
+    assert form_words("wär(e)st gelaufen / hättest (dich/dir) gelaufen") == {
+        "wärst gelaufen",
+        "wärest gelaufen",
+        "hättest gelaufen",
+        "gelaufen",
+    }
+    assert form_words("(sich)") == set()
+
+
+def test_lemmatize_exported_forms(tmp_path):
+    """The forms of the real exported conjugation table are found"""
+    with open("tests/test_data/laufen.yaml", encoding="utf8") as file:
+        inflector = Inflector.from_data(yaml.safe_load(file)["inflection"])
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    assert index.add_inflection("/konjugation/laufen", inflector)
+
+    for form in [
+        "laufe",
+        "lauf",
+        "wärst gelaufen",
+        "wärest gelaufen",
+        "seist gelaufen",
+    ]:
+        assert {lemma.urlname for lemma in index.lemmatize(form)} == {"laufen"}, form
+    for form in ["(sich)", "mir)", "sich", "wärst", "hättest", "würden", "sein"]:
+        assert index.lemmatize(form) == [], form
+
+
+def test_lemmatize(tmp_path):
+    """Inflected forms are mapped to their words and categories"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    for urlpart, page in [
+        ("/konjugation/laufen", "grammar/laufen.html"),
+        ("/deklination/substantive/Hase", "grammar/Hase.html"),
+    ]:
+        assert index.add_inflection(
+            urlpart, request.parse_grammar_page(read_test_page(page))
+        )
+    index.add_word(request.parse_word_page(read_test_page("Hase.html")))
+
+    assert index.lemmatize("lief") == [
+        Lemma("laufen", ("Indikativ", "Präteritum", "ich"), "lief"),
+        Lemma("laufen", ("Indikativ", "Präteritum", "er/sie/es"), "lief"),
+    ]
+    assert index.lemmatize("Hasen")[0] == Lemma(
+        "Hase", ("Deklination", "Singular", "Akkusativ"), "den Hasen"
+    )
+    assert index.lemmatize("gelaufen")[0].form == "bin gelaufen"
+    assert index.lemmatize("laufe!") == []
+    assert index.lemmatize("hasen") == []
+    assert index.lemmatize("Lief") == []
+    assert len(index.lemmatize("Lief", ignore_case=True)) == 2
+
+    lemmas = index.lemmatize_many(["lief", "Hasen", "lief", "Unbekannt"])
+    assert list(lemmas) == ["lief", "Hasen", "Unbekannt"]
+    assert {lemma.urlname for lemma in lemmas["Hasen"]} == {"Hase"}
+    assert lemmas["Unbekannt"] == []
+
+
+def test_grammar_updates_lemma_index(session):
+    """Grammar pages are indexed when they are loaded"""
+    grammar_url = request.GRAMMAR_BASE.format(urlpart="/konjugation/laufen")
+    session.pages[grammar_url] = read_test_page("grammar/laufen.html")
+    assert request.lemmatize("liefen") == []
+
+    request.grammar("/konjugation/laufen")
+    assert {lemma.urlname for lemma in request.lemmatize("liefen")} == {"laufen"}
+    assert request.lemmatize_many(["lief", "lauft"])["lauft"][0].categories == (
+        "Indikativ",
+        "Präsens",
+        "ihr",
+    )
+
+    cache.get_cache().index.clear()
+    cli.cache_main(["index"])
+    assert request.lemmatize("liefen")
+
+
+def test_fuzzy(tmp_path):
+    """Names within the edit distance are found, closest and most frequent first"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    for urlname, names, frequency in [
+        ("Hase", ["Hase", "Haas"], 3),
+        ("Hase_Tier", ["Hase"], None),
+        ("Hose", ["Hose"], 4),
+        ("Vase", ["Vase"], 2),
+        ("laufen", ["laufen"], 5),
+    ]:
+        index.add_word(
+            type(
+                "Word",
+                (),
+                {
+                    "urlname": urlname,
+                    "name": names[0],
+                    "alternative_spellings": names[1:],
+                    "frequency": frequency,
+                },
+            )()
+        )
+
+    assert index.fuzzy("Hase") == ["Hase", "Hase_Tier", "Hose", "Vase"]
+    assert index.fuzzy("hsae", max_distance=1) == ["Hase", "Hase_Tier"]
+    assert index.fuzzy("Haase", max_distance=1) == ["Hase", "Hase_Tier"]
+    assert index.fuzzy("lufen") == ["laufen"]
+    assert index.fuzzy("Hase", max_distance=5) == index.fuzzy("Hase")
+    assert not index.fuzzy("Hasenbraten")
+    assert edit_distance("Hase", "Hsae", 2) == 1
+    assert edit_distance("Hase", "Hasenbraten", 2) is None
+
+
+def test_fuzzy_long_names(tmp_path):
+    """Only name prefixes are stored, but all close long names are found"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    names = [
+        "Donaudampfschiff",
+        "Donaudampfschifffahrt",
+        "Dampfschiff",
+        "Donaudampfer",
+        "Odnaudampfschiff",
+        "Donau",
+    ]
+    for name in names:
+        index.add_word(type("Word", (), {"urlname": name, "name": name})())
+    for word in ["Donaudampfschiff", "Donuadampfschif", "XDonaudampfschiff", "Dnau"]:
+        expected = {
+            name
+            for name in names
+            if edit_distance(word.casefold(), name.casefold(), 2) is not None
+        }
+        assert set(index.fuzzy(word)) == expected, word
+
+
+def test_fuzzy_variants_persisted(tmp_path):
+    """The fuzzy variants are stored, and added to indexes of older versions"""
+    index = LemmaIndex(tmp_path / "index.sqlite")
+    index.add_word(type("Word", (), {"urlname": "Hase", "name": "Hase"})())
+    assert LemmaIndex(tmp_path / "index.sqlite").fuzzy("Hsae") == ["Hase"]
+
+    index.connection.execute("DROP TABLE fuzzy_variants")
+    index.close()
+    assert LemmaIndex(tmp_path / "index.sqlite").fuzzy("Hsae") == ["Hase"]
+
+    index.clear()
+    assert not index.fuzzy("Hsae")
+
+
+def test_offline_fuzzy_search(session):
+    """Non-exact offline first searches use the index, falling back to duden.de"""
+    request.get("Hase")
+    index = cache.get_cache().index
+    assert index.fuzzy("Hsae") == ["Hase"]
+    index.add_word(
+        type("Word", (), {"urlname": "Vase", "name": "Vase", "frequency": 2})()
+    )
+    assert index.fuzzy("Hsae") == ["Hase", "Vase"]
+    assert index.fuzzy("Hsae", max_distance=1) == ["Hase"]
+    assert index.fuzzy("Haase", max_distance=0) == []
+    assert session.urls == [request.URL_FORM.format(word="Hase")]
+
+    found = request.search("Hsae", exact=False, return_words=False, offline_first=True)
+    assert found == ["Hase", "Vase"]
+    assert len(session.urls) == 1
+
+    found = request.search("Hase", exact=False, return_words=False)
+    assert found == ["Hase", "Hase_Tier", "Hasenbraten"]
+    found = request.search("Xyz", exact=False, return_words=False, offline_first=True)
+    assert found == []
+    assert len(session.urls) == 3
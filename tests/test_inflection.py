@@ -0,0 +1,139 @@
+"""Test inflection parsing"""
+
+import os
+
+import pytest
+import yaml
+
+from duden import (
+    Case,
+    ImperativePerson,
+    InfinitiveForm,
+    Mood,
+    Number,
+    Person,
+    Tense,
+    inflection,
+    request,
+)
+
+GRAMMAR_DATA_DIR = "tests/test_data/html/grammar"
+
+
+def synthetic_grammar_pages():
+    """List names of synthetic grammar pages with expected data"""
+    return sorted(
+        filename[: -len(".html")]
+        for filename in os.listdir(GRAMMAR_DATA_DIR)
+        if filename.endswith(".html")
+    )
+
+
+def load_synthetic_grammar_page(name):
+    """Return html of synthetic grammar page and its expected Inflector data"""
+    with open(os.path.join(GRAMMAR_DATA_DIR, name + ".html"), encoding="utf8") as file:
+        html = file.read()
+    with open(os.path.join(GRAMMAR_DATA_DIR, name + ".yaml"), encoding="utf8") as file:
+        expected = yaml.load(file, Loader=yaml.SafeLoader)
+    return html, expected
+
+
+@pytest.mark.parametrize("name", synthetic_grammar_pages())
+def test_synthetic_grammar_page(name):
+    """Inflector data of synthetic grammar page matches the expected data"""
+    html, expected = load_synthetic_grammar_page(name)
+    assert request.parse_grammar_page(html).data == expected
+
+
+def test_noun_decline():
+    """Noun declension looks up the parsed table"""
+    html, _ = load_synthetic_grammar_page("Hase")
+    inflector = request.parse_grammar_page(html)
+    assert inflector.noun_decline(Number.SINGULAR, Case.GENITIVE) == "des Hasen"
+    assert inflector.noun_decline(Number.PLURAL, Case.DATIVE) == "den Hasen"
+    with pytest.raises(ValueError):
+        inflector.adjective_compare("Positiv")
+
+
+def test_verb_conjugate():
+    """Verb conjugation looks up the parsed tables"""
+    html, _ = load_synthetic_grammar_page("laufen")
+    inflector = request.parse_grammar_page(html)
+    assert (
+        inflector.verb_conjugate(Mood.INDICATIVE, Tense.PAST, Person.SECOND_SINGULAR)
+        == "liefst"
+    )
+    assert inflector.verb_conjugate("Konjunktiv I", "Präsens", "ihr") == "laufet"
+    assert inflector.verb_imperative(ImperativePerson.PERSON_2_PLURAL) == "lauft!"
+    assert inflector.verb_infinitive_forms(InfinitiveForm.PARTICIPLE_II) == "gelaufen"
+
+
+def test_inflect_partial_key_chain():
+    """Incomplete key chains return the nested table"""
+    html, expected = load_synthetic_grammar_page("laufen")
+    inflector = request.parse_grammar_page(html)
+    table = inflector.inflect(Mood.INDICATIVE, Tense.PRESENT)
+    assert table.source == expected["Indikativ"]["Präsens"]
+    assert table[Person.FIRST_SINGULAR] == "laufe"
+
+    with pytest.raises(ValueError, match="Präteritum"):
+        inflector.verb_conjugate(Mood.SUBJUNCTIVE_I, Tense.PAST, Person.FIRST_SINGULAR)
+
+
+@pytest.mark.parametrize("name", synthetic_grammar_pages())
+def test_forms(name):
+    """All forms are listed with their categories"""
+    html, expected = load_synthetic_grammar_page(name)
+    inflector = request.parse_grammar_page(html)
+    forms = list(inflector.forms())
+    assert len(forms) == len(set(forms))
+    for categories, form in forms:
+        value = expected
+        for key in categories:
+            value = value[key]
+        assert value == form
+
+
+def test_forms_order():
+    """Forms are listed in the table order"""
+    html, _ = load_synthetic_grammar_page("Hase")
+    forms = list(request.parse_grammar_page(html).forms())
+    assert forms[0] == (("Deklination", "Singular", "Nominativ"), "der Hase")
+    assert len(forms) == 8
+
+
+def test_sections_transformed_on_demand(monkeypatch):
+    """Only the sections which are used are transformed"""
+    transformed = []
+
+    def conditional_transform(key, structure):
+        transformed.append(key)
+        return original_transform(key, structure)
+
+    original_transform = inflection.conditional_transform
+    monkeypatch.setattr(inflection, "conditional_transform", conditional_transform)
+
+    html, expected = load_synthetic_grammar_page("laufen")
+    inflector = request.parse_grammar_page(html)
+    assert inflector.section_names == list(expected)
+    assert not transformed
+
+    inflector.verb_imperative(ImperativePerson.PERSON_2_SINGULAR)
+    inflector.verb_imperative(ImperativePerson.PERSON_2_PLURAL)
+    assert transformed == ["Imperativ"]
+
+    assert inflector.data == expected
+    assert sorted(transformed) == sorted(expected)
+    assert inflector.section("Konjunktiv II") is None
+
+
+def test_data_built_once():
+    """The nested data is built once, in the page order of the sections"""
+    html, expected = load_synthetic_grammar_page("laufen")
+    inflector = request.parse_grammar_page(html)
+    inflector.verb_imperative(ImperativePerson.PERSON_2_SINGULAR)
+
+    data = inflector.data
+    assert list(data) == list(expected)
+    assert inflector.data is data
+    assert inflector.enumraw.source is data
@@ -0,0 +1,64 @@
+"""
+Test parity of the lxml parser with BeautifulSoup on the synthetic test pages;
+parity on real duden.de pages is checked by `test_online_attributes.py`.
+"""
+
+import pytest
+from conftest import HASE_SEARCH_RESULTS, search_page
+from test_inflection import load_synthetic_grammar_page, synthetic_grammar_pages
+from test_word import load_synthetic_page, synthetic_pages
+
+from duden import request
+from duden.word import EXPORT_ATTRIBUTES, FROZEN_EXTRA_ATTRIBUTES
+
+pytest.importorskip("lxml")
+
+SEARCH_PAGE = search_page(HASE_SEARCH_RESULTS)
+
+
+@pytest.fixture(name="parse_with")
+def fixture_parse_with(monkeypatch):
+    """Return function parsing the page with each parser"""
+    monkeypatch.setattr(request, "grammar", lambda urlpart: None)
+
+    def parse_with(parser_name, parse, *args, **kwargs):
+        monkeypatch.setattr(request, "_parser", parser_name)
+        return parse(*args, **kwargs)
+
+    return parse_with
+
+
+@pytest.mark.parametrize("name", synthetic_pages())
+@pytest.mark.parametrize("attribute", EXPORT_ATTRIBUTES + FROZEN_EXTRA_ATTRIBUTES)
+def test_word_parity(name, attribute, parse_with):
+    """Word attributes parsed with lxml equal the BeautifulSoup ones"""
+    html, _ = load_synthetic_page(name)
+    expected = parse_with("bs4", request.parse_word_page, html)
+    word = parse_with("lxml", request.parse_word_page, html)
+    assert getattr(word, attribute, None) == getattr(expected, attribute, None)
+
+
+@pytest.mark.parametrize("name", synthetic_grammar_pages())
+def test_grammar_parity(name, parse_with):
+    """Inflector data parsed with lxml equal the BeautifulSoup ones"""
+    html, expected = load_synthetic_grammar_page(name)
+    assert parse_with("bs4", request.parse_grammar_page, html).data == expected
+    assert parse_with("lxml", request.parse_grammar_page, html).data == expected
+
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_search_parity(exact, parse_with):
+    """Search results parsed with lxml equal the BeautifulSoup ones"""
+    expected = parse_with("bs4", request.parse_search_page, SEARCH_PAGE, "Hase", exact)
+    assert parse_with(
+        "lxml", request.parse_search_page, SEARCH_PAGE, "Hase", exact
+    ) == (expected)
+
+
+def test_set_parser(monkeypatch):
+    """Unknown parser names are refused"""
+    monkeypatch.setattr(request, "_parser", None)
+    monkeypatch.setenv(request.PARSER_ENV_VARIABLE, "lxml")
+    assert request.get_parser() == "lxml"
+    with pytest.raises(ValueError):
+        request.set_parser("html5lib")
@@ -2,13 +2,15 @@
 """
 Test if words currently available online parse as expected
 """
+
 import os
 from collections import namedtuple
 
 import pytest
 import yaml
 
-from duden import get
+from duden import get, request
+from duden.word import EXPORT_ATTRIBUTES
 
 TEST_DATA_DIR = "tests/test_data"
 
@@ -103,3 +105,28 @@ def test_word_inflection(parsed_word, expected_dict):
     """The the raw inflection tables data"""
     raw_parsed_inf_data = parsed_word.inflection and parsed_word.inflection.data
     assert raw_parsed_inf_data == expected_dict["inflection"]
+
+
+@word_param
+def test_partial_parse(parsed_word, expected_dict):
+    """Partial parsing of the word page gives the same attributes"""
+    html_content = request.request_word(expected_dict["urlname"])
+    partial_word = request.parse_word_page(html_content, partial=True)
+    for attribute in EXPORT_ATTRIBUTES:
+        assert getattr(partial_word, attribute) == getattr(parsed_word, attribute)
+
+
+@word_param
+def test_lxml_parity(parsed_word, expected_dict, monkeypatch):
+    """Parsing the word and grammar pages with lxml gives the same attributes"""
+    pytest.importorskip("lxml")
+    monkeypatch.setattr(request, "_parser", "lxml")
+    html_content = request.request_word(expected_dict["urlname"])
+    lxml_word = request.parse_word_page(html_content)
+    for attribute in EXPORT_ATTRIBUTES:
+        assert getattr(lxml_word, attribute) == getattr(parsed_word, attribute)
+
+    if parsed_word.grammar_link:
+        grammar_page = request.request_grammar(parsed_word.grammar_link)
+        lxml_inflection = request.parse_grammar_page(grammar_page)
+        assert lxml_inflection.data == parsed_word.inflection.data
@@ -0,0 +1,259 @@
+"""Test network request functions"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from duden import cache, request
+
+
+class FakeResponse:  # pylint: disable=too-few-public-methods
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text.encode("utf8")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        """Raise on error status codes like requests does"""
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:  # pylint: disable=too-few-public-methods
+    """Session which serves pages from a dict and records requested urls"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    def get(self, url, timeout=None, headers=None):  # pylint: disable=unused-argument
+        """Return the stored page or 404"""
+        self.urls.append(url)
+        if url not in self.pages:
+            return FakeResponse("", status_code=404)
+        return FakeResponse(self.pages[url])
+
+
+@pytest.fixture(name="session")
+def fixture_session():
+    """Inject a fake session for the duration of a test"""
+    session = FakeSession({})
+    request.set_session(session)
+    yield session
+    request.set_session(None)
+
+
+def test_fetchers_use_shared_session(session):
+    """All fetchers go through the injected session"""
+    session.pages[request.URL_FORM.format(word="Hase")] = "<html>word</html>"
+    session.pages[request.SEARCH_URL_FORM.format(word="Hase")] = "<html>search</html>"
+
+    assert request.request_word("Hase", cache=False) == "<html>word</html>"
+    assert request.request_search("Hase", cache=False) == "<html>search</html>"
+    assert request.request_word("Unbekannt", cache=False) is None
+    assert len(session.urls) == 3
+
+
+def test_default_session_is_reused():
+    """The default session is created once and then shared"""
+    request.set_session(None)
+    assert request.get_session() is request.get_session()
+    request.set_session(None)
+
+
+def word_page(title, urlname):
+    """Return minimal html of a word page"""
+    return (
+        '<html><head><link rel="canonical" href="/rechtschreibung/{urlname}"></head>'
+        "<body><h1>{title}</h1></body></html>"
+    ).format(title=title, urlname=urlname)
+
+
+def test_get_many(session):
+    """Bulk lookup keeps order, drops duplicates and collects errors"""
+    session.pages[request.URL_FORM.format(word="Hase")] = word_page("Hase", "Hase")
+    session.pages[request.URL_FORM.format(word="laufen")] = word_page(
+        "laufen", "laufen"
+    )
+    session.pages[request.URL_FORM.format(word="kaputt")] = None  # fails to load
+
+    results = request.get_many(
+        ["laufen", "Hase", "laufen", "Unbekannt", "kaputt"], max_workers=2, cache=False
+    )
+
+    assert [result.word for result in results] == [
+        "laufen",
+        "Hase",
+        "Unbekannt",
+        "kaputt",
+    ]
+    assert results[0].result.urlname == "laufen"
+    assert results[1].result.title == "Hase"
+    assert results[2] == ("Unbekannt", None, None)
+    assert results[3].result is None
+    assert isinstance(results[3].error, Exception)
+
+
+def test_map_concurrently_unordered():
+    """Unordered mapping yields every result exactly once"""
+    results = request.map_concurrently(
+        lambda x: x * 2, range(50), max_workers=3, ordered=False
+    )
+    assert sorted(results) == [x * 2 for x in range(50)]
+
+
+def test_search_fetches_all_results(session):
+    """Search results are fetched concurrently but returned in order"""
+    names = ["Bank_Geldinstitut", "Bank_Sitzgelegenheit", "Bankett", "Bankier"]
+    session.pages[request.SEARCH_URL_FORM.format(word="Bank")] = "".join(
+        '<h2 class="vignette__title"><a href="/rechtschreibung/{0}">{0}</a></h2>'.format(
+            name
+        )
+        for name in names
+    )
+    for name in names:
+        session.pages[request.URL_FORM.format(word=name)] = word_page(name, name)
+
+    words = request.search("Bank", exact=False, cache=False, max_workers=3)
+    assert [word.urlname for word in words] == names
+
+    streamed = request.search_iter("Bank", exact=False, cache=False)
+    assert sorted(word.urlname for word in streamed) == sorted(names)
+
+
+class RevalidatingSession(FakeSession):  # pylint: disable=too-few-public-methods
+    """Session answering conditional requests with 304 Not Modified"""
+
+    def get(self, url, timeout=None, headers=None):
+        self.urls.append(url)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse("", status_code=304)
+        return FakeResponse(self.pages[url], headers={"ETag": '"v1"'})
+
+
+def test_revalidation(tmp_path):
+    """Expired entries are revalidated with conditional requests"""
+    backend = cache.FileCache(tmp_path, max_age=3600)
+    cache.set_cache(backend)
+    session = RevalidatingSession({request.URL_FORM.format(word="Hase"): "Hase"})
+    request.set_session(session)
+    try:
+        assert request.request_word("Hase") == "Hase"
+        assert backend.get_entry("", "Hase").etag == '"v1"'
+
+        # fresh entry is served from cache
+        assert request.request_word("Hase") == "Hase"
+        assert len(session.urls) == 1
+
+        # expired entry is revalidated, the server responds 304
+        backend.revalidate = True
+        session.pages.clear()
+        assert request.request_word("Hase") == "Hase"
+        assert len(session.urls) == 2
+    finally:
+        cache.set_cache(None)
+        request.set_session(None)
+
+
+def test_stale_entry_used_on_connection_error(tmp_path):
+    """Expired entries are used when the server cannot be reached"""
+    backend = cache.FileCache(tmp_path, max_age=0)
+    backend.set("", "Hase", "alter Hase")
+    cache.set_cache(backend)
+    request.set_session(None)
+
+    def broken_get(*args, **kwargs):
+        raise RuntimeError("offline")
+
+    session = FakeSession({})
+    session.get = broken_get
+    request.set_session(session)
+    try:
+        assert request.request_word("Hase") == "alter Hase"
+    finally:
+        cache.set_cache(None)
+        request.set_session(None)
+
+
+def test_parsed_cache(session, monkeypatch, tmp_path):
+    """Parsed words are reused from the in-memory cache"""
+    monkeypatch.setattr(request, "parsed_cache", cache.LRUCache(10))
+    monkeypatch.setattr(cache, "_cache", cache.FileCache(tmp_path))
+    session.pages[request.URL_FORM.format(word="Hase")] = word_page("Hase", "Hase")
+
+    assert request.get("Hase") is request.get("Hase")
+    assert request.parsed_cache.hits == 1
+    assert request.get("Hase", cache=False) is not request.get("Hase")
+
+
+def test_parsed_cache_refresh(session, monkeypatch, tmp_path):
+    """Revalidated and expired words are not taken from the in-memory cache"""
+    monkeypatch.setattr(request, "parsed_cache", cache.LRUCache(10))
+    backend = cache.FileCache(tmp_path, max_age=3600)
+    monkeypatch.setattr(cache, "_cache", backend)
+    url = request.URL_FORM.format(word="Hase")
+    session.pages[url] = word_page("Hase alt", "Hase")
+    assert request.get("Hase").title == "Hase alt"
+
+    session.pages[url] = word_page("Hase neu", "Hase")
+    backend.revalidate = True
+    assert request.get("Hase").title == "Hase neu"
+    backend.revalidate = False
+    assert request.get("Hase").title == "Hase neu"
+
+    # the cached page and the parsed word expire together
+    session.pages[url] = word_page("Hase neuer", "Hase")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 7200)
+    assert request.get("Hase").title == "Hase neuer"
+
+
+def read_test_page(path):
+    """Return html of a test page"""
+    with open(os.path.join("tests/test_data/html", path), encoding="utf8") as file:
+        return file.read()
+
+
+def test_get_with_inflection(session, monkeypatch, tmp_path):
+    """The grammar page is fetched while the word page is being parsed"""
+    monkeypatch.setattr(cache, "_cache", cache.FileCache(tmp_path))
+    grammar_url = request.GRAMMAR_BASE.format(urlpart="/deklination/substantive/Hase")
+    session.pages[request.URL_FORM.format(word="Hase")] = read_test_page("Hase.html")
+    session.pages[grammar_url] = read_test_page("grammar/Hase.html")
+
+    grammar_requested = threading.Event()
+    session_get = session.get
+
+    def get(url, **kwargs):
+        if url == grammar_url:
+            grammar_requested.set()
+        return session_get(url, **kwargs)
+
+    parse_word_page = request.parse_word_page
+
+    def slow_parse_word_page(html_content, **kwargs):
+        assert grammar_requested.wait(timeout=5)
+        return parse_word_page(html_content, **kwargs)
+
+    monkeypatch.setattr(session, "get", get)
+    monkeypatch.setattr(request, "parse_word_page", slow_parse_word_page)
+
+    word = request.get("Hase", with_inflection=True)
+    assert word.inflection.noun_decline("Plural", "Dativ") == "den Hasen"
+    assert session.urls.count(grammar_url) == 1
+
+
+def test_find_grammar_link():
+    """Grammar link is found in the raw html"""
+    assert request.find_grammar_link(read_test_page("Hase.html")) == (
+        "/deklination/substantive/Hase"
+    )
+    assert request.find_grammar_link(
+        "<a class='x' href='/konjugation/laufen?a=1&amp;b=2' id='grammatik'>"
+    ) == ("/konjugation/laufen?a=1&b=2")
+    assert request.find_grammar_link('<div id="grammatik"></div>') is None
@@ -0,0 +1,174 @@
+"""Test the resident server and its client"""
+
+import os
+import socket
+import stat
+import threading
+
+import pytest
+from test_request import FakeSession, word_page
+
+from duden import cache, client, request, server
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path(session, tmp_path):  # pylint: disable=unused-argument
+    """Run the server in a thread, with the fake session and a temp cache"""
+    path = str(tmp_path / "duden.sock")
+    duden_server = server.DudenServer(path)
+    thread = threading.Thread(target=duden_server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    duden_server.shutdown()
+    duden_server.server_close()
+    thread.join()
+
+
+def test_operations(socket_path):
+    """Operations are performed by the server"""
+    assert client.call("ping", path=socket_path)["version"]
+    assert client.call("get", path=socket_path, word="Hase")["title"] == "Hase, der"
+    assert client.call("get", path=socket_path, word="Unbekannt") is None
+    with pytest.raises(client.ServerError, match="Unknown operation"):
+        client.call("unknown", path=socket_path)
+    with pytest.raises(client.ServerError):
+        client.call("get", path=socket_path, unknown_argument=1)
+
+
+def test_cli(socket_path, capsys):
+    """CLI calls are run by the server with captured output"""
+    assert client.run_cli(["Unbekannt"], path=socket_path) == 1
+    assert "not found" in capsys.readouterr().out
+
+    result = client.call("cli", path=socket_path, argv=["Hase", "--title"])
+    assert result == {"stdout": "Hase, der\n", "stderr": "", "exit_code": 0}
+    assert client.run_cli(["Hase", "--unknown-option"], path=socket_path) == 2
+    assert "unrecognized arguments" in capsys.readouterr().err
+
+
+class SlowSession(FakeSession):  # pylint: disable=too-few-public-methods
+    """Fake session blocking the requests of one url until released"""
+
+    def __init__(self, pages, slow_url):
+        super().__init__(pages)
+        self.slow_url = slow_url
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def get(self, url, timeout=None, headers=None):
+        if url == self.slow_url:
+            self.started.set()
+            self.released.wait(5)
+        return super().get(url, timeout=timeout, headers=headers)
+
+
+def test_cli_concurrent_calls(socket_path):
+    """A slow CLI call does not block the others, the outputs are kept apart"""
+    session = SlowSession(
+        request.get_session().pages,
+        request.SEARCH_URL_FORM.format(word="Langsam"),
+    )
+    request.set_session(session)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            client.call("cli", path=socket_path, argv=["Langsam"])
+        )
+    )
+    thread.start()
+    assert session.started.wait(5)
+
+    result = client.call("cli", path=socket_path, argv=["Hase", "--title"])
+    assert result == {"stdout": "Hase, der\n", "stderr": "", "exit_code": 0}
+    assert thread.is_alive()
+    session.released.set()
+    thread.join()
+    assert results[0]["exit_code"] == 1
+    assert "not found" in results[0]["stdout"]
+    assert "Hase" not in results[0]["stdout"]
+
+
+def test_cli_refresh(socket_path):
+    """--refresh revalidates the pages of the call only"""
+    session = request.get_session()
+    client.call("cli", path=socket_path, argv=["Hase", "--title"])
+    requested = len(session.urls)
+    client.call("cli", path=socket_path, argv=["Hase", "--title"])
+    assert len(session.urls) == requested
+
+    result = client.call("cli", path=socket_path, argv=["Hase", "--title", "--refresh"])
+    assert result["stdout"] == "Hase, der\n"
+    assert len(session.urls) == 2 * requested
+    assert not cache.get_cache().revalidate
+
+
+def test_cli_environment(socket_path, monkeypatch):
+    """CLI calls from a different environment are left to the client"""
+    monkeypatch.setenv("DUDEN_PARSER", "html.parser")
+    monkeypatch.setenv("DUDEN_SOCKET", socket_path)
+    env = client.cli_environment()
+    assert env["DUDEN_PARSER"] == "html.parser"
+    assert "DUDEN_SOCKET" not in env
+    result = client.call("cli", path=socket_path, argv=["Hase", "--title"], env=env)
+    assert result["stdout"] == "Hase, der\n"
+
+    env["DUDEN_PARSER"] = "lxml"
+    assert client.call("cli", path=socket_path, argv=["Hase"], env=env) is None
+
+    # a server started before an upgrade of duden
+    env = dict(client.cli_environment(), __version__="0.0.1")
+    assert client.call("cli", path=socket_path, argv=["Hase"], env=env) is None
+
+
+def test_cli_cache_clear(socket_path):
+    """Clearing the cache on the server also drops the parsed words"""
+    cache.parsed_cache.resize(10)
+    try:
+        result = client.call("cli", path=socket_path, argv=["Hase", "--title"])
+        assert result["stdout"] == "Hase, der\n"
+        assert len(cache.parsed_cache)
+
+        url = request.URL_FORM.format(word="Hase")
+        request.get_session().pages[url] = word_page("Hase neuer", "Hase")
+        result = client.call("cli", path=socket_path, argv=["cache", "clear"])
+        assert result["exit_code"] == 0
+        result = client.call("cli", path=socket_path, argv=["Hase", "--title"])
+        assert result["stdout"] == "Hase neuer\n"
+    finally:
+        cache.parsed_cache.resize(0)
+
+
+def test_server_not_running(tmp_path):
+    """Clients fall back when no server is listening, stale sockets are replaced"""
+    path = str(tmp_path / "duden.sock")
+    assert not client.is_running(path)
+    assert client.run_cli(["Hase"], path=path) is None
+    with pytest.raises(ConnectionError):
+        client.call("ping", path=path)
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    assert not client.is_running(path)
+    duden_server = server.DudenServer(path)
+    assert client.is_running(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    with pytest.raises(RuntimeError, match="already running"):
+        server.DudenServer(path)
+    duden_server.server_close()
+    assert not client.is_running(path)
+
+
+def test_socket_path(monkeypatch):
+    """Socket path is configured by environment variables"""
+    monkeypatch.setenv("DUDEN_SOCKET", "/tmp/test.sock")
+    assert client.socket_path() == "/tmp/test.sock"
+    monkeypatch.setenv("DUDEN_SOCKET", "")
+    assert client.socket_path() is None
+    monkeypatch.delenv("DUDEN_SOCKET")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert client.socket_path() == "/run/user/1000/duden.sock"
@@ -1,6 +1,17 @@
 """Test word functions"""
 
-from duden.word import split_synonyms
+import gc
+import os
+import pickle
+
+import bs4
+import pytest
+import yaml
+
+from duden import Case, Number, request
+from duden.word import DudenWord, FrozenDudenWord, split_synonyms
+
+HTML_DATA_DIR = "tests/test_data/html"
 
 
 def test_split_synonyms():
@@ -10,3 +21,100 @@ def test_split_synonyms():
 
     expected = ["a", "b (b, c)", "d (d, e, f) g", "h"]
     assert split_synonyms("a, b (b, c); d (d; e, f) g, h") == expected
+
+
+def synthetic_pages():
+    """List names of synthetic word pages with expected export"""
+    return sorted(
+        filename[: -len(".html")]
+        for filename in os.listdir(HTML_DATA_DIR)
+        if filename.endswith(".html")
+        and os.path.exists(os.path.join(HTML_DATA_DIR, filename[:-5] + ".yaml"))
+    )
+
+
+def load_synthetic_page(name):
+    """Return html of synthetic word page and its expected export"""
+    with open(os.path.join(HTML_DATA_DIR, name + ".html"), encoding="utf8") as file:
+        html = file.read()
+    with open(os.path.join(HTML_DATA_DIR, name + ".yaml"), encoding="utf8") as file:
+        expected = yaml.load(file, Loader=yaml.SafeLoader)
+    return html, expected
+
+
+@pytest.mark.parametrize("name", synthetic_pages())
+def test_synthetic_page_export(name, monkeypatch):
+    """Export of synthetic page matches the expected data"""
+    monkeypatch.setattr(request, "grammar", lambda urlpart: None)
+    html, expected = load_synthetic_page(name)
+    word = DudenWord(bs4.BeautifulSoup(html, "html.parser"))
+    assert word.export() == expected
+
+
+@pytest.mark.parametrize("name", synthetic_pages())
+def test_synthetic_page_partial_parse(name, monkeypatch):
+    """Partial parsing gives the same export as parsing the whole page"""
+    monkeypatch.setattr(request, "grammar", lambda urlpart: None)
+    html, expected = load_synthetic_page(name)
+    word = request.parse_word_page(html, partial=True)
+    assert word.export() == expected
+    assert word.soup.find("footer") is None
+    assert word.soup.find("nav", class_="main-nav") is None
+
+
+@pytest.mark.parametrize("name", synthetic_pages())
+def test_frozen_word(name, monkeypatch):
+    """Frozen word keeps the exported attributes, but not the page"""
+    monkeypatch.setattr(request, "grammar", lambda urlpart: None)
+    html, expected = load_synthetic_page(name)
+    word = request.parse_word_page(html).freeze()
+
+    assert isinstance(word, FrozenDudenWord)
+    assert word.export() == expected
+    assert not hasattr(word, "soup")
+    assert not hasattr(word, "__dict__")
+    with pytest.raises(AttributeError):
+        word.title = "changed"
+
+    assert pickle.loads(pickle.dumps(word)).export() == expected
+    assert FrozenDudenWord.from_export(expected).export() == expected
+
+
+def test_frozen_word_declares_slots():
+    """Every slot of the frozen word is declared for static analysis"""
+    assert set(FrozenDudenWord.__annotations__) == set(FrozenDudenWord.__slots__)
+
+
+def test_frozen_word_inflection():
+    """Frozen word restores and pickles its inflection"""
+    data = {"Deklination": {"Singular": {"Nominativ": "der Hase"}}}
+    word = FrozenDudenWord.from_export({"title": "Hase, der", "inflection": data})
+    assert word.inflection.noun_decline(Number.SINGULAR, Case.NOMINATIVE) == "der Hase"
+
+    restored = pickle.loads(pickle.dumps(word))
+    assert restored.inflection.data == data
+    assert restored.urlname is None
+
+
+def reachable_objects(root):
+    """Yield all objects reachable from root"""
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        yield obj
+        stack.extend(gc.get_referents(obj))
+
+
+def test_frozen_word_detached_from_page(session):  # pylint: disable=unused-argument
+    """Frozen word with inflection does not reference any parse tree"""
+    word = request.get("Hase", detached=True)
+
+    assert word.inflection.page is None
+    assert word.inflection.noun_decline(Number.SINGULAR, Case.NOMINATIVE)
+    assert not any(
+        type(obj).__module__.startswith("bs4") for obj in reachable_objects(word)
+    )